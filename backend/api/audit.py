@@ -2,11 +2,13 @@
 
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from backend.db.audit_queries import AuditQueries
+from backend.db.audit_queries import AuditQueries, decode_audit_cursor, get_audit_queries
+from backend.db.audit_writer import audit_writer
+from backend.executors import db_executor
 from backend.middleware.auth import get_current_user, require_admin_role
 from backend.models.user import User
 from backend.schemas.audit import (
@@ -19,13 +21,46 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix='/api/audit-logs', tags=['audit'])
 
-audit_queries = AuditQueries()
+# Seconds a read waits for queued audit entries to be written
+FLUSH_TIMEOUT = 5.0
+
+TotalMode = Literal['exact', 'estimated', 'none']
+
+
+async def _flush_audit_writer() -> None:
+	"""Write queued audit entries so that reads include them"""
+	if not await db_executor.run(audit_writer.flush, FLUSH_TIMEOUT):
+		logger.warning('Audit entries still queued after flush timeout')
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+	"""Decode a keyset cursor query parameter, rejecting malformed ones with 400"""
+	if cursor is None:
+		return None
+	try:
+		return decode_audit_cursor(cursor)
+	except ValueError:
+		raise HTTPException(
+			status_code=status.HTTP_400_BAD_REQUEST,
+			detail='Invalid cursor'
+		)
+
+
+def _to_list_response(result: dict) -> AuditLogListResponse:
+	return AuditLogListResponse(
+		total=result['total'],
+		total_exact=result['total_exact'],
+		skip=result['skip'],
+		limit=result['limit'],
+		next_cursor=result['next_cursor'],
+		items=[AuditLogResponse(**entry) for entry in result['items']],
+	)
 
 
 @router.post('', response_model=AuditLogResponse, status_code=status.HTTP_201_CREATED)
 async def create_audit_log_event(
 	payload: AuditLogRequest,
-	current_user: User = Depends(get_current_user)
+	current_user: User = Depends(get_current_user),
 ) -> AuditLogResponse:
 	"""Create an audit log event for the authenticated user"""
 	try:
@@ -35,10 +70,7 @@ async def create_audit_log_event(
 				detail='You can only create audit logs for your own user_id'
 			)
 
-		entry = audit_queries.create_event(
-			user_id=payload.user_id,
-			event=payload.event
-		)
+		entry = await audit_writer.record(user_id=payload.user_id, event=payload.event)
 		if entry is None:
 			raise HTTPException(
 				status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -63,7 +95,10 @@ async def list_audit_logs(
 	resource_type: Optional[str] = Query(None, description='Filter by resource type'),
 	start_date: Optional[str] = Query(None, description='Filter entries after this date (ISO 8601 format)'),
 	end_date: Optional[str] = Query(None, description='Filter entries before this date (ISO 8601 format)'),
-	current_user: User = Depends(require_admin_role)
+	cursor: Optional[str] = Query(None, description='Keyset cursor: next_cursor of the previous page'),
+	total: Optional[TotalMode] = Query(None, description='How to count matching entries: exact, estimated or none (default: exact without filters, estimated otherwise)'),
+	current_user: User = Depends(require_admin_role),
+	audit_queries: AuditQueries = Depends(get_audit_queries),
 ) -> AuditLogListResponse:
 	"""List audit logs (admin only)
 	
@@ -74,14 +109,19 @@ async def list_audit_logs(
 	- skip: Number of records to skip (default: 0)
 	- limit: Maximum records to return (default: 100, max: 1000)
 	- user_id: Optional - filter by user ID
-	- resource_type: Optional - filter by resource type (glider, user, weighing, etc.)
+	- resource_type: Optional - filter by resource type (glider, user or fleet)
 	- start_date: Optional - ISO 8601 formatted date (filter entries after this date)
 	- end_date: Optional - ISO 8601 formatted date (filter entries before this date)
+	- cursor: Optional - next_cursor of the previous page; pages deep into the
+	  log cost the same as the first one, unlike skip
+	- total: exact (full COUNT), estimated (bounded cost) or none; defaults to
+	  exact for the unfiltered listing and to estimated with any filter
 	
 	Returns:
-	- AuditLogListResponse with total count and list of audit entries
+	- AuditLogListResponse with total count, next page cursor and list of audit entries
 	"""
 	try:
+		after = _decode_cursor(cursor)
 		start_dt = None
 		end_dt = None
 		
@@ -105,26 +145,22 @@ async def list_audit_logs(
 					detail=f'Invalid end_date format. Use ISO 8601 format (YYYY-MM-DDTHH:MM:SS)'
 				)
 		
-		result = audit_queries.get_audit_logs(
+		if total is None:
+			total = 'estimated' if user_id or resource_type or start_dt or end_dt else 'exact'
+		
+		await _flush_audit_writer()
+		result = await db_executor.run(audit_queries.get_audit_logs,
 			skip=skip,
 			limit=limit,
 			user_id=user_id,
 			resource_type=resource_type,
 			start_date=start_dt,
-			end_date=end_dt
+			end_date=end_dt,
+			after=after,
+			total_mode=total,
 		)
 		
-		items = [
-			AuditLogResponse(**entry)
-			for entry in result['items']
-		]
-		
-		return AuditLogListResponse(
-			total=result['total'],
-			skip=skip,
-			limit=limit,
-			items=items
-		)
+		return _to_list_response(result)
 	except HTTPException:
 		raise
 	except Exception as e:
@@ -135,8 +171,42 @@ async def list_audit_logs(
 		)
 
 
+@router.post('/archive', status_code=status.HTTP_200_OK)
+async def archive_audit_logs(
+	older_than_days: int = Query(..., ge=1, description='Archive entries older than this many days'),
+	current_user: User = Depends(require_admin_role),
+	audit_queries: AuditQueries = Depends(get_audit_queries),
+) -> dict:
+	"""Move old audit logs to the Parquet archive (admin only)
+
+	Entries older than the given number of days are moved out of the
+	audit log table into date-partitioned Parquet files next to the
+	database. They remain listed by GET /api/audit-logs when start_date
+	reaches back to them.
+
+	Returns:
+	- Dict with number of archived entries
+	"""
+	try:
+		archived_count = await db_executor.run(audit_queries.archive_audit_logs_older_than, older_than_days)
+		logger.info(f'Admin user {current_user.username} archived {archived_count} audit logs older than {older_than_days} days')
+		return {
+			'message': 'Audit logs archived successfully',
+			'archived_count': archived_count,
+		}
+	except Exception as e:
+		logger.error(f'Error archiving audit logs: {e}')
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail='Error archiving audit logs'
+		)
+
+
 @router.delete('', status_code=status.HTTP_200_OK)
-async def delete_all_audit_logs(current_user: User = Depends(require_admin_role)) -> dict:
+async def delete_all_audit_logs(
+	current_user: User = Depends(require_admin_role),
+	audit_queries: AuditQueries = Depends(get_audit_queries),
+) -> dict:
 	"""Delete all audit logs (admin only)
 	
 	Deletes all entries from audit logs table.
@@ -146,7 +216,8 @@ async def delete_all_audit_logs(current_user: User = Depends(require_admin_role)
 	- Dict with number of deleted entries
 	"""
 	try:
-		deleted_count = audit_queries.delete_all_audit_logs()
+		await _flush_audit_writer()
+		deleted_count = await db_executor.run(audit_queries.delete_all_audit_logs)
 		logger.info(f'Admin user {current_user.username} deleted all audit logs ({deleted_count})')
 		return {
 			'message': 'Audit logs deleted successfully',
@@ -164,7 +235,8 @@ async def delete_all_audit_logs(current_user: User = Depends(require_admin_role)
 async def get_resource_history(
 	resource_type: str,
 	resource_id: str,
-	current_user: User = Depends(get_current_user)
+	current_user: User = Depends(get_current_user),
+	audit_queries: AuditQueries = Depends(get_audit_queries),
 ) -> list[AuditLogResponse]:
 	"""Get complete history of changes for a specific resource
 	
@@ -172,7 +244,7 @@ async def get_resource_history(
 	Requires authenticated user.
 	
 	Path Parameters:
-	- resource_type: Type of resource (glider, user, weighing, etc.)
+	- resource_type: Type of resource (glider or user)
 	- resource_id: ID of the resource
 	
 	Returns:
@@ -185,7 +257,8 @@ async def get_resource_history(
 				detail='resource_type and resource_id are required'
 			)
 		
-		entries = audit_queries.get_audit_logs_by_resource(
+		await _flush_audit_writer()
+		entries = await db_executor.run(audit_queries.get_audit_logs_by_resource,
 			resource_type=resource_type,
 			resource_id=resource_id
 		)
@@ -213,7 +286,10 @@ async def get_user_actions(
 	user_id: str,
 	skip: int = Query(0, ge=0, description='Number of records to skip'),
 	limit: int = Query(100, ge=1, le=1000, description='Maximum number of records to return'),
-	current_user: User = Depends(get_current_user)
+	cursor: Optional[str] = Query(None, description='Keyset cursor: next_cursor of the previous page'),
+	total: TotalMode = Query('estimated', description='How to count matching entries: exact, estimated or none'),
+	current_user: User = Depends(get_current_user),
+	audit_queries: AuditQueries = Depends(get_audit_queries),
 ) -> AuditLogListResponse:
 	"""Get all actions performed by a specific user
 	
@@ -226,13 +302,17 @@ async def get_user_actions(
 	Query Parameters:
 	- skip: Number of records to skip (default: 0)
 	- limit: Maximum records to return (default: 100, max: 1000)
+	- cursor: Optional - next_cursor of the previous page
+	- total: exact, estimated (default) or none
 	
 	Returns:
-	- AuditLogListResponse with total count and list of audit entries
+	- AuditLogListResponse with total count, next page cursor and list of audit entries
 	"""
 	try:
 		from backend.models.user import RoleChecker
 		
+		after = _decode_cursor(cursor)
+		
 		if not user_id:
 			raise HTTPException(
 				status_code=status.HTTP_400_BAD_REQUEST,
@@ -251,23 +331,16 @@ async def get_user_actions(
 				detail='You do not have permission to view this user\'s action history'
 			)
 		
-		result = audit_queries.get_user_actions(
+		await _flush_audit_writer()
+		result = await db_executor.run(audit_queries.get_user_actions,
 			user_id=user_id,
 			skip=skip,
-			limit=limit
-		)
-		
-		items = [
-			AuditLogResponse(**entry)
-			for entry in result['items']
-		]
-		
-		return AuditLogListResponse(
-			total=result['total'],
-			skip=skip,
 			limit=limit,
-			items=items
+			after=after,
+			total_mode=total,
 		)
+		
+		return _to_list_response(result)
 	except HTTPException:
 		raise
 	except Exception as e:
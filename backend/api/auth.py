@@ -6,9 +6,10 @@ from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from backend.config import get_settings
-from backend.db.user_queries import UserQueries
+from backend.db.user_queries import UserQueries, get_user_queries
+from backend.executors import auth_executor, db_executor
 from backend.middleware.auth import get_current_user, verify_token
-from backend.models.user import TokenManager
+from backend.models.user import PasswordHasher, TokenManager
 from backend.schemas.user import (
 	LoginRequest,
 	TokenRequest,
@@ -23,7 +24,10 @@ router = APIRouter(prefix='/api/auth', tags=['auth'])
 
 
 @router.post('/login', response_model=TokenResponse)
-async def login(request: LoginRequest) -> TokenResponse:
+async def login(
+	request: LoginRequest,
+	user_queries: UserQueries = Depends(get_user_queries),
+) -> TokenResponse:
 	"""
 	User login endpoint.
 	
@@ -31,6 +35,7 @@ async def login(request: LoginRequest) -> TokenResponse:
 	
 	Args:
 		request: LoginRequest with username and password
+		user_queries: Shared user queries (dependency injection)
 		
 	Returns:
 		TokenResponse with access_token, token_type, and expires_in
@@ -43,8 +48,9 @@ async def login(request: LoginRequest) -> TokenResponse:
 		- Generic error message for failed login (doesn't reveal if user exists)
 		- Future: Rate limiting should be implemented
 	"""
-	user_queries = UserQueries()
-	user = user_queries.authenticate_user(request.username, request.password)
+	user = await db_executor.run(user_queries.get_user_by_username, request.username)
+	if user and not await auth_executor.run(PasswordHasher.verify_password, request.password, user.password):
+		user = None
 	
 	if not user:
 		logger.warning(f'Failed login attempt for username: {request.username}')
@@ -97,6 +103,7 @@ async def logout(current_user = Depends(get_current_user)) -> dict:
 async def refresh_token(
 	_request: TokenRequest,
 	token_payload = Depends(verify_token),
+	user_queries: UserQueries = Depends(get_user_queries),
 ) -> TokenResponse:
 	"""
 	Refresh access token endpoint.
@@ -106,6 +113,7 @@ async def refresh_token(
 	Args:
 		request: TokenRequest with refresh_token
 		token_payload: Verified token payload (dependency injection)
+		user_queries: Shared user queries (dependency injection)
 		
 	Returns:
 		TokenResponse with new access_token
@@ -120,8 +128,7 @@ async def refresh_token(
 	"""
 	username = token_payload.username
 	
-	user_queries = UserQueries()
-	user = user_queries.get_user_by_username(username)
+	user = await db_executor.run(user_queries.get_user_by_username, username)
 	
 	if not user:
 		logger.warning(f'Attempted token refresh for non-existent user: {username}')
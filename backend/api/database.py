@@ -1,103 +1,324 @@
 """FastAPI routes for database export and import operations"""
 
-import io
+import asyncio
 import logging
 import os
 import shutil
 import tempfile
 import zipfile
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 
 import duckdb
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, UploadFile, File, status
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 
 from backend.config import get_settings
-from backend.middleware.auth import require_admin_role
+from backend.db.audit_archive import archive_lock, get_audit_archive
+from backend.db.audit_writer import audit_writer
+from backend.db.connection import get_connection_pool
+from backend.db.glider_queries import glider_cache, refresh_glider_summaries
+from backend.executors import db_executor
+from backend.init_db import run_migrations, seed_default_admin
+from backend.middleware.auth import principal_cache, require_admin_role
+from backend.services.db_archive import (
+	AUDIT_ARCHIVE_DIR,
+	CHUNK_SIZE,
+	EXPORTABLE_TABLES,
+	ArchiveValidationError,
+	apply_partial,
+	build_manifest,
+	check_tables,
+	export_tables,
+	extract_archive,
+	iter_zip,
+	read_manifest,
+)
+from backend.services.jobs import job_registry
+from backend.services.pdf_cache import weighing_pdf_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix='/api/database', tags=['database'])
 
+IMPORT_JOB = 'database_import'
+UPLOAD_NAME = 'upload.zip'
 
-@router.get('/export')
-async def export_database(admin_user=Depends(require_admin_role)):
-	"""Export the full database as a zip archive (Parquet format). Admin only."""
-	settings = get_settings()
-	export_dir = tempfile.mkdtemp()
+
+def _export_database(export_dir: str, tables: Optional[List[str]] = None, since: Optional[datetime] = None) -> dict:
+	"""Export the database as Parquet into export_dir and return its manifest
+
+	Without tables or since the whole database is exported with EXPORT
+	DATABASE, along with the audit archive partitions; otherwise the
+	selected tables (all by default) are written from a single read-only
+	snapshot, limited to changes after since.
+	"""
+	audit_writer.flush()
+	if tables is None and since is None:
+		with archive_lock:
+			with get_connection_pool().cursor() as con:
+				con.execute(f"EXPORT DATABASE '{export_dir}' (FORMAT PARQUET);")
+			get_audit_archive().copy_to(os.path.join(export_dir, AUDIT_ARCHIVE_DIR))
+		return build_manifest(export_dir)
+	with get_connection_pool().cursor(read_only=True) as con:
+		partial = export_tables(con, export_dir, tables or list(EXPORTABLE_TABLES), since)
+	return build_manifest(export_dir, partial)
+
+
+def _parse_export_params(tables: Optional[str], since: Optional[str]) -> Tuple[Optional[List[str]], Optional[datetime]]:
+	"""Validate the export query parameters, rejecting bad ones with 400"""
+	selected = None
+	if tables:
+		selected = [table.strip().upper() for table in tables.split(',') if table.strip()]
+		unknown = [table for table in selected if table not in EXPORTABLE_TABLES]
+		if unknown or not selected:
+			raise HTTPException(
+				status_code=status.HTTP_400_BAD_REQUEST,
+				detail=f'Unknown tables {", ".join(unknown)}. Choose among {", ".join(EXPORTABLE_TABLES)}',
+			)
+		selected = [table for table in EXPORTABLE_TABLES if table in selected]
+
+	since_dt = None
+	if since:
+		try:
+			since_dt = datetime.fromisoformat(since.replace('Z', '+00:00'))
+		except ValueError:
+			raise HTTPException(
+				status_code=status.HTTP_400_BAD_REQUEST,
+				detail='Invalid since format. Use ISO 8601 format (YYYY-MM-DDTHH:MM:SS)',
+			)
+		if since_dt.tzinfo is not None:
+			since_dt = since_dt.astimezone(timezone.utc).replace(tzinfo=None)
+	return selected, since_dt
+
+
+def _apply_partial_import(job_id: str, import_dir: str, manifest: dict, db_name: str) -> None:
+	"""Upsert an extracted partial export into the live database"""
+	job_registry.update(job_id, 'applying', 0.5)
+	audit_writer.flush()
+	with get_connection_pool(db_name).cursor() as con:
+		apply_partial(con, import_dir, manifest)
+
+
+def _import_database(job_id: str, work_dir: str, manifest: Optional[dict], db_name: str) -> None:
+	"""Import a spooled archive into db_name
+
+	The archive is extracted with its checksums verified. A partial export
+	is upserted into the live database. A full one is imported into a new
+	database file in work_dir, which is migrated and checked before the
+	connection pool is quiesced and the file atomically replaces db_name;
+	work_dir must be on the same file system as db_name. The audit archive
+	of db_name is replaced in the same swap by the exported one, or emptied
+	if the export has none, so it never holds another database's history.
+	"""
+	archive_path = os.path.join(work_dir, UPLOAD_NAME)
+	import_dir = os.path.join(work_dir, 'export')
+	temp_db_path = os.path.join(work_dir, 'imported.duckdb')
+
+	def report(done: int, total: int) -> None:
+		job_registry.update(job_id, 'extracting', 0.5 * done / total)
+
+	job_registry.update(job_id, 'extracting', 0.0)
+	extract_archive(archive_path, manifest, import_dir, progress=report)
+
+	if manifest is not None and manifest['kind'] == 'partial':
+		_apply_partial_import(job_id, import_dir, manifest, db_name)
+		glider_cache.clear()
+		weighing_pdf_cache.clear()
+		principal_cache.clear()
+		refresh_glider_summaries()
+		return
+
+	job_registry.update(job_id, 'importing', 0.5)
+	con = duckdb.connect(temp_db_path)
 	try:
-		logger.info(f'Admin user {admin_user.username} exporting database')
-		con = duckdb.connect(settings.DB_NAME)
-		con.execute(f"EXPORT DATABASE '{export_dir}' (FORMAT PARQUET);")
+		con.execute(f"IMPORT DATABASE '{import_dir}';")
+		job_registry.update(job_id, 'migrating', 0.8)
+		run_migrations(con)
+		seed_default_admin(con)
+		check_tables(con)
+	finally:
 		con.close()
 
-		zip_buffer = io.BytesIO()
-		with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-			for root, dirs, files in os.walk(export_dir):
-				for file in files:
-					file_path = os.path.join(root, file)
-					arcname = os.path.relpath(file_path, export_dir)
-					zipf.write(file_path, arcname)
-		zip_buffer.seek(0)
-
-		return StreamingResponse(
-			zip_buffer,
-			media_type='application/zip',
-			headers={'Content-Disposition': 'attachment; filename="exported_db.zip"'},
-		)
+	job_registry.update(job_id, 'swapping', 0.9)
+	audit_archive = get_audit_archive(db_name)
+	staged_archive = audit_archive.stage_replacement(os.path.join(import_dir, AUDIT_ARCHIVE_DIR))
+	retired_archive = None
+	try:
+		audit_writer.flush()
+		with archive_lock, get_connection_pool(db_name).quiesce():
+			# A clean close leaves no WAL; one left over belongs to the old file
+			if os.path.exists(f'{db_name}.wal'):
+				os.remove(f'{db_name}.wal')
+			os.replace(temp_db_path, db_name)
+			retired_archive = audit_archive.replace(staged_archive)
+	finally:
+		shutil.rmtree(staged_archive, ignore_errors=True)
+		if retired_archive:
+			shutil.rmtree(retired_archive, ignore_errors=True)
+	glider_cache.clear()
+	weighing_pdf_cache.clear()
+	principal_cache.clear()
+	refresh_glider_summaries()
+
+
+async def _run_import_job(job_id: str, work_dir: str, manifest: Optional[dict], db_name: str, username: str) -> None:
+	"""Run an import job on a database worker and record its outcome"""
+	try:
+		await db_executor.run(_import_database, job_id, work_dir, manifest, db_name)
+		job_registry.succeed(job_id, {'message': 'Database imported successfully'})
+		logger.info(f'Database imported successfully by {username}')
+	except ArchiveValidationError as e:
+		logger.error(f'Invalid database archive: {e}')
+		job_registry.fail(job_id, f'Invalid database archive: {e}')
+	except duckdb.Error as e:
+		logger.error(f'Invalid database import content: {e}', exc_info=True)
+		job_registry.fail(job_id, f'Invalid database export format: {e}')
 	except Exception as e:
+		logger.error(f'Error importing database: {e}', exc_info=True)
+		job_registry.fail(job_id, 'Failed to import database')
+	finally:
+		shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _release_import(job_id: str, work_dir: Optional[str], error: str) -> None:
+	"""Fail a reserved import job whose upload was rejected and remove its files"""
+	job_registry.fail(job_id, error)
+	if work_dir:
+		shutil.rmtree(work_dir, ignore_errors=True)
+
+
+async def _spool_upload(file: UploadFile, path: str) -> int:
+	"""Copy an upload to disk in chunks and return its size"""
+	size = 0
+	with open(path, 'wb') as target:
+		while True:
+			chunk = await file.read(CHUNK_SIZE)
+			if not chunk:
+				return size
+			await run_in_threadpool(target.write, chunk)
+			size += len(chunk)
+
+
+@router.get('/export')
+async def export_database(
+	tables: Optional[str] = Query(None, description=f'Comma-separated tables to export among {", ".join(EXPORTABLE_TABLES)}'),
+	since: Optional[str] = Query(None, description='Only export changes after this watermark (ISO 8601, UTC unless an offset is given)'),
+	admin_user=Depends(require_admin_role),
+):
+	"""Export the database as a zip archive (Parquet format). Admin only.
+
+	The zip is streamed while it is built: manifest.json (sizes and SHA-256
+	checksums of every file) comes first, then each exported file read in
+	chunks. The export directory is removed once the response ends, even if
+	the client disconnects.
+
+	With tables or since the export is partial: one Parquet file per
+	selected table, limited to the gliders changed and audit entries added
+	after since. The X-Export-Until header (also in the manifest) is the
+	watermark to pass as since to the next incremental export.
+	"""
+	selected, since_dt = _parse_export_params(tables, since)
+	export_dir = tempfile.mkdtemp()
+	try:
+		logger.info(f'Admin user {admin_user.username} exporting database (tables: {selected or "all"}, since: {since_dt})')
+		manifest = await db_executor.run(_export_database, export_dir, selected, since_dt)
+	except Exception as e:
+		shutil.rmtree(export_dir, ignore_errors=True)
 		logger.error(f'Error exporting database: {e}', exc_info=True)
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail='Failed to export database',
 		)
-	finally:
-		shutil.rmtree(export_dir, ignore_errors=True)
+
+	headers = {'Content-Disposition': 'attachment; filename="exported_db.zip"'}
+	if manifest['kind'] == 'partial':
+		headers = {
+			'Content-Disposition': 'attachment; filename="exported_db_partial.zip"',
+			'X-Export-Until': manifest['until'],
+		}
+	return StreamingResponse(
+		iter_zip(export_dir, manifest),
+		media_type='application/zip',
+		headers=headers,
+		background=BackgroundTask(shutil.rmtree, export_dir, ignore_errors=True),
+	)
 
 
-@router.post('/import', status_code=status.HTTP_200_OK)
+@router.post('/import', status_code=status.HTTP_202_ACCEPTED)
 async def import_database(
+	background_tasks: BackgroundTasks,
 	file: UploadFile = File(...),
 	admin_user=Depends(require_admin_role),
 ):
-	"""Import database from an uploaded zip archive (Parquet format). Admin only."""
+	"""Import database from an uploaded zip archive (Parquet format). Admin only.
+
+	The upload is spooled to disk and its manifest checked before the
+	request returns; extraction, checksum verification, import and the swap
+	of the database file run as a background job whose progress is read
+	from GET /api/database/jobs/{job_id}. A partial export is upserted into
+	the live database instead of replacing it.
+	"""
 	settings = get_settings()
-	import_dir = tempfile.mkdtemp()
-	temp_db_dir = tempfile.mkdtemp()
-	temp_db_path = os.path.join(temp_db_dir, 'imported.duckdb')
+	# Reserved before the upload is spooled so that concurrent uploads cannot both start a swap
+	job = job_registry.reserve(IMPORT_JOB, owner=admin_user.username)
+	if job is None:
+		raise HTTPException(
+			status_code=status.HTTP_409_CONFLICT,
+			detail='A database import is already running',
+		)
+
+	work_dir = None
 	try:
+		db_dir = os.path.dirname(os.path.abspath(settings.DB_NAME))
+		work_dir = tempfile.mkdtemp(prefix='.import-', dir=db_dir)
 		logger.info(f'Admin user {admin_user.username} importing database')
-
-		zip_bytes = await file.read()
-		with zipfile.ZipFile(io.BytesIO(zip_bytes), 'r') as zip_ref:
-			zip_ref.extractall(import_dir)
-
-		con = duckdb.connect(temp_db_path)
-		con.execute(f"IMPORT DATABASE '{import_dir}';")
-		con.close()
-
-		shutil.move(temp_db_path, settings.DB_NAME)
-		temp_db_path = None
-
-		logger.info(f'Database imported successfully by {admin_user.username}')
-		return {'message': 'Database imported successfully'}
+		size = await _spool_upload(file, os.path.join(work_dir, UPLOAD_NAME))
+		manifest = await db_executor.run(read_manifest, os.path.join(work_dir, UPLOAD_NAME))
 	except zipfile.BadZipFile as e:
+		_release_import(job['id'], work_dir, f'Invalid zip file: {e}')
 		logger.error(f'Invalid zip file during import: {e}', exc_info=True)
 		raise HTTPException(
 			status_code=status.HTTP_400_BAD_REQUEST,
 			detail=f'Invalid zip file: {e}',
 		)
-	except duckdb.Error as e:
-		logger.error(f'Invalid database import content: {e}', exc_info=True)
+	except ArchiveValidationError as e:
+		_release_import(job['id'], work_dir, f'Invalid database archive: {e}')
+		logger.error(f'Invalid database archive: {e}')
 		raise HTTPException(
 			status_code=status.HTTP_400_BAD_REQUEST,
-			detail=f'Invalid database export format: {e}',
+			detail=f'Invalid database archive: {e}',
 		)
+	except asyncio.CancelledError:
+		# The client went away mid-upload: free the reservation for the next import
+		_release_import(job['id'], work_dir, 'Upload cancelled')
+		raise
 	except Exception as e:
+		_release_import(job['id'], work_dir, 'Failed to import database')
 		logger.error(f'Error importing database: {e}', exc_info=True)
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail='Failed to import database',
 		)
-	finally:
-		shutil.rmtree(import_dir, ignore_errors=True)
-		shutil.rmtree(temp_db_dir, ignore_errors=True)
+
+	logger.info(f'Database import job {job["id"]} queued for a {size} byte archive')
+	background_tasks.add_task(_run_import_job, job['id'], work_dir, manifest, settings.DB_NAME, admin_user.username)
+	return {
+		'message': 'Database import started',
+		'job_id': job['id'],
+		'status_url': f'/api/database/jobs/{job["id"]}',
+	}
+
+
+@router.get('/jobs/{job_id}')
+async def get_job_status(job_id: str, admin_user=Depends(require_admin_role)):
+	"""Return the status and progress of a database job. Admin only."""
+	job = job_registry.get(job_id)
+	if job is None:
+		raise HTTPException(
+			status_code=status.HTTP_404_NOT_FOUND,
+			detail=f'Job {job_id} not found',
+		)
+	return job
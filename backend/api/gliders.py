@@ -1,20 +1,29 @@
 """FastAPI routes for Glider CRUD operations and CG calculations"""
 
-import io
 import logging
+import os
+from dataclasses import asdict
 from datetime import date, datetime
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
 
+from backend.config import get_settings
+from backend.executors import calc_executor, db_executor, pdf_executor
 from backend.middleware.auth import require_admin_role, require_editor_role
+from backend.models.user import RoleChecker
 from backend.schemas.glider import (
 	GliderResponse,
 	GliderRequest,
 	GliderCalculationsResponse,
 	WeightBalanceCalculationRequest,
 	WeightBalanceCalculationResponse,
+	WeightBalanceBatchRequest,
+	FleetCalculationRequest,
+	BallastOptimizationRequest,
+	BallastOptimizationResponse,
+	WeightBalanceBatchResponse,
 	WeightAndBalancesRequest,
 	LimitsSchema,
 	ArmsSchema,
@@ -22,10 +31,14 @@ from backend.schemas.glider import (
 	InstrumentSchema,
 	WeighingRequest,
 	WeighingSchema,
+	WeighingPackRequest,
 )
 from backend.db.glider_queries import (
-	get_all_gliders,
+	get_fleet,
 	get_glider_by_id,
+	get_glider_summary,
+	list_glider_summaries,
+	list_gliders_page,
 	create_glider,
 	update_glider,
 	delete_glider,
@@ -33,17 +46,22 @@ from backend.db.glider_queries import (
 	save_weighings,
 	save_weight_and_balance,
 	delete_instrument,
+	delete_instruments,
 	delete_weighing,
-	_get_database_connection,
 )
-from backend.db.audit_queries import AuditQueries
+from backend.db.audit_writer import audit_writer
 from backend.models.glider import Glider, Limits, Arms, Instrument, Weighing
+from backend.services.envelope import get_envelope
+from backend.services.jobs import job_registry
+from backend.services.pdf_cache import weighing_pdf_cache
+from backend.services.pdf_workers import PdfQueueFullError, PdfRenderTimeout, pdf_workers
+from backend.services.weight_balance import calculate_batch, calculate_fleet, expand_loads, optimize_ballast
+from backend.services.weighing_pack import PACK_JOB, PACK_MEDIA_TYPES, pack_path, run_pack_job, sheet_filename
 from backend.services.weighing_pdf import WeighingPdfService
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix='/api/gliders', tags=['gliders'])
-audit_queries = AuditQueries()
 
 
 def _parse_request_date(value: str, field_name: str) -> date:
@@ -78,6 +96,17 @@ def _parse_optional_date(value: str | date | None, field_name: str) -> date | No
 	raise ValueError(f'Invalid {field_name} type')
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+	"""True when an If-None-Match header lists the (unquoted) entity tag"""
+	if not if_none_match:
+		return False
+	for candidate in if_none_match.split(','):
+		candidate = candidate.strip()
+		if candidate == '*' or candidate.removeprefix('W/').strip('"') == etag:
+			return True
+	return False
+
+
 def _convert_glider_to_response(glider: Glider) -> GliderResponse:
 	"""Convert Glider model to GliderResponse schema"""
 	limits_schema = None
@@ -207,25 +236,43 @@ def _convert_request_to_glider(registration: str, request: GliderRequest) -> Gli
 
 @router.get('', response_model=List[GliderResponse])
 async def list_gliders(
+	response: Response,
 	skip: int = Query(0, ge=0, description='Number of gliders to skip'),
-	limit: int = Query(100, ge=1, le=1000, description='Maximum number of gliders to return')
+	limit: int = Query(100, ge=1, le=1000, description='Maximum number of gliders to return'),
+	model: Optional[str] = Query(None, description='Filter by glider model'),
+	brand: Optional[str] = Query(None, description='Filter by glider brand'),
+	single_seat: Optional[bool] = Query(None, description='Filter single seat (true) or dual seat (false) gliders'),
+	has_weighing: Optional[bool] = Query(None, description='Filter gliders with (true) or without (false) weighing'),
+	after: Optional[str] = Query(None, description='Keyset cursor: return gliders whose registration sorts after this value'),
 ):
 	"""
-	List all gliders with pagination (public endpoint).
+	List gliders ordered by registration with pagination and filters (public endpoint).
 
 	- **skip**: Number of gliders to skip (default: 0)
 	- **limit**: Maximum number of gliders to return (default: 100, max: 1000)
-	- **Returns**: List of GliderResponse objects
+	- **model**, **brand**, **single_seat**, **has_weighing**: Optional filters
+	- **after**: Keyset cursor, typically the `X-Next-Cursor` header of the previous page
+	- **Returns**: List of GliderResponse objects, with the filtered total in the
+	  `X-Total-Count` header and the next page cursor in `X-Next-Cursor` (when more pages may follow)
 	"""
 	try:
-		logger.info(f'Fetching gliders list (skip={skip}, limit={limit})')
-
-		gliders_dict = get_all_gliders()
-		gliders_list = list(gliders_dict.values())
+		logger.info(f'Fetching gliders list (skip={skip}, limit={limit}, after={after})')
+
+		gliders, total = await db_executor.run(list_gliders_page,
+			skip=skip,
+			limit=limit,
+			model=model,
+			brand=brand,
+			single_seat=single_seat,
+			has_weighing=has_weighing,
+			after=after,
+		)
 
-		paginated = gliders_list[skip:skip + limit]
+		response.headers['X-Total-Count'] = str(total)
+		if len(gliders) == limit:
+			response.headers['X-Next-Cursor'] = gliders[-1].registration
 
-		return [_convert_glider_to_response(g) for g in paginated]
+		return [_convert_glider_to_response(g) for g in gliders]
 	except Exception as e:
 		logger.error(f'Error fetching gliders: {e}', exc_info=True)
 		raise HTTPException(
@@ -234,6 +281,32 @@ async def list_gliders(
 		)
 
 
+@router.get('/limits', response_model=List[GliderCalculationsResponse])
+async def list_glider_limits(
+	response: Response,
+	skip: int = Query(0, ge=0, description='Number of gliders to skip'),
+	limit: int = Query(100, ge=1, le=1000, description='Maximum number of gliders to return'),
+):
+	"""
+	List the precomputed CG limits of the fleet, ordered by registration (public endpoint).
+
+	- **skip**: Number of gliders to skip (default: 0)
+	- **limit**: Maximum number of gliders to return (default: 100, max: 1000)
+	- **Returns**: List of GliderCalculationsResponse, with the total in the `X-Total-Count` header
+	"""
+	try:
+		logger.info(f'Fetching fleet limits (skip={skip}, limit={limit})')
+		summaries, total = await db_executor.run(list_glider_summaries, skip=skip, limit=limit)
+		response.headers['X-Total-Count'] = str(total)
+		return [GliderCalculationsResponse(**asdict(summary)) for summary in summaries]
+	except Exception as e:
+		logger.error(f'Error fetching fleet limits: {e}', exc_info=True)
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail='Failed to fetch fleet limits'
+		)
+
+
 @router.get('/by-id/{glider_id:path}/details', response_model=GliderResponse)
 @router.get('/{glider_id}', response_model=GliderResponse)
 async def get_glider(glider_id: str):
@@ -246,7 +319,7 @@ async def get_glider(glider_id: str):
 	try:
 		logger.info(f'Fetching glider {glider_id}')
 
-		glider = get_glider_by_id(glider_id)
+		glider = await db_executor.run(get_glider_by_id, glider_id)
 		if not glider:
 			logger.warning(f'Glider {glider_id} not found')
 			raise HTTPException(
@@ -268,7 +341,7 @@ async def get_glider(glider_id: str):
 @router.post('', response_model=GliderResponse, status_code=status.HTTP_201_CREATED)
 async def create_new_glider(
 	request: GliderRequest,
-	admin_user = Depends(require_admin_role)
+	admin_user = Depends(require_admin_role),
 ):
 	"""
 	Create a new glider (admin only).
@@ -280,7 +353,7 @@ async def create_new_glider(
 	try:
 		logger.info(f'Admin user {admin_user.username} creating new glider {request.registration}')
 
-		glider_exists = get_glider_by_id(request.registration)
+		glider_exists = await db_executor.run(get_glider_by_id, request.registration)
 		if glider_exists:
 			logger.warning(f'Glider {request.registration} already exists')
 			raise HTTPException(
@@ -289,14 +362,14 @@ async def create_new_glider(
 			)
 
 		glider = _convert_request_to_glider(request.registration, request)
-		create_glider(glider)
+		await db_executor.run(create_glider, glider)
 
-		created_glider = get_glider_by_id(request.registration)
+		created_glider = await db_executor.run(get_glider_by_id, request.registration)
 		if not created_glider:
 			raise ValueError('Failed to retrieve created glider')
 
 		event = f'Glider {request.registration} created'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='glider', resource_id=request.registration, action='create') is None:
 			logger.warning(f'Failed to create glider audit event for {request.registration}')
 
 		logger.info(f'Glider {request.registration} created successfully')
@@ -316,7 +389,7 @@ async def create_new_glider(
 async def update_glider_endpoint(
 	glider_id: str,
 	request: GliderRequest,
-	admin_user = Depends(require_admin_role)
+	admin_user = Depends(require_admin_role),
 ):
 	"""
 	Update an existing glider (admin only).
@@ -329,7 +402,7 @@ async def update_glider_endpoint(
 	try:
 		logger.info(f'Admin user {admin_user.username} updating glider {glider_id}')
 
-		glider_exists = get_glider_by_id(glider_id)
+		glider_exists = await db_executor.run(get_glider_by_id, glider_id)
 		if not glider_exists:
 			logger.warning(f'Glider {glider_id} not found for update')
 			raise HTTPException(
@@ -338,14 +411,14 @@ async def update_glider_endpoint(
 			)
 
 		glider = _convert_request_to_glider(glider_id, request)
-		update_glider(glider)
+		await db_executor.run(update_glider, glider)
 
-		updated_glider = get_glider_by_id(glider_id)
+		updated_glider = await db_executor.run(get_glider_by_id, glider_id)
 		if not updated_glider:
 			raise ValueError('Failed to retrieve updated glider')
 
 		event = f'Glider {glider_id} updated'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='glider', resource_id=glider_id, action='update') is None:
 			logger.warning(f'Failed to create glider audit event for {glider_id}')
 
 		logger.info(f'Glider {glider_id} updated successfully')
@@ -364,7 +437,7 @@ async def update_glider_endpoint(
 @router.delete('/{glider_id}', status_code=status.HTTP_204_NO_CONTENT)
 async def delete_glider_endpoint(
 	glider_id: str,
-	admin_user = Depends(require_admin_role)
+	admin_user = Depends(require_admin_role),
 ):
 	"""
 	Delete a glider and all its associated data (admin only).
@@ -376,7 +449,7 @@ async def delete_glider_endpoint(
 	try:
 		logger.info(f'Admin user {admin_user.username} deleting glider {glider_id}')
 
-		glider_exists = get_glider_by_id(glider_id)
+		glider_exists = await db_executor.run(get_glider_by_id, glider_id)
 		if not glider_exists:
 			logger.warning(f'Glider {glider_id} not found for deletion')
 			raise HTTPException(
@@ -384,10 +457,10 @@ async def delete_glider_endpoint(
 				detail=f'Glider {glider_id} not found'
 			)
 
-		delete_glider(glider_id)
+		await db_executor.run(delete_glider, glider_id)
 
 		event = f'Glider {glider_id} deleted'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='glider', resource_id=glider_id, action='delete') is None:
 			logger.warning(f'Failed to create glider audit event for {glider_id}')
 
 		logger.info(f'Glider {glider_id} deleted successfully')
@@ -406,18 +479,14 @@ async def delete_glider_endpoint(
 async def update_glider_instruments(
 	glider_id: str,
 	instruments: List[InstrumentRequest],
-	admin_user = Depends(require_admin_role)
+	admin_user = Depends(require_admin_role),
 ):
 	"""Replace all instruments for a glider (admin only)."""
 	try:
-		glider = get_glider_by_id(glider_id)
+		glider = await db_executor.run(get_glider_by_id, glider_id)
 		if not glider:
 			raise HTTPException(status_code=404, detail=f'Glider {glider_id} not found')
-		conn = _get_database_connection()
-		try:
-			conn.execute('DELETE FROM INVENTORY WHERE registration = ?', [glider_id])
-		finally:
-			conn.close()
+		await db_executor.run(delete_instruments, glider_id)
 		instrument_objects = []
 		for inst in instruments:
 			try:
@@ -438,11 +507,11 @@ async def update_glider_instruments(
 			)
 
 		if instrument_objects:
-			if not save_instruments(glider_id, instrument_objects):
+			if not await db_executor.run(save_instruments, glider_id, instrument_objects):
 				raise ValueError('Failed to save instruments')
 
 		event = f'Instruments {instrument_objects} updated for glider {glider_id}'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='glider', resource_id=glider_id, action='update_instruments') is None:
 			logger.warning(f'Failed to create instrument audit event for {glider_id}')
 
 		return {'registration': glider_id, 'instruments_count': len(instrument_objects)}
@@ -462,15 +531,15 @@ async def delete_glider_instrument(
 ):
 	"""Delete one instrument for a glider (admin only)."""
 	try:
-		glider = get_glider_by_id(glider_id)
+		glider = await db_executor.run(get_glider_by_id, glider_id)
 		if not glider:
 			raise HTTPException(status_code=404, detail=f'Glider {glider_id} not found')
 
-		if not delete_instrument(glider_id, instrument_id):
+		if not await db_executor.run(delete_instrument, glider_id, instrument_id):
 			raise HTTPException(status_code=404, detail=f'Instrument {instrument_id} not found')
 
 		event = f'Instrument {instrument_id} deleted for glider {glider_id}'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='glider', resource_id=glider_id, action='delete_instrument') is None:
 			logger.warning(f'Failed to create instrument deletion audit event for {glider_id}/{instrument_id}')
 	except HTTPException:
 		raise
@@ -484,11 +553,11 @@ async def delete_glider_instrument(
 async def add_weighings(
 	glider_id: str,
 	weighings: List[WeighingRequest],
-	admin_user = Depends(require_admin_role)
+	admin_user = Depends(require_admin_role),
 ):
 	"""Add new weighings for a glider (admin only)."""
 	try:
-		glider = get_glider_by_id(glider_id)
+		glider = await db_executor.run(get_glider_by_id, glider_id)
 		if not glider:
 			raise HTTPException(status_code=404, detail=f'Glider {glider_id} not found')
 
@@ -513,10 +582,10 @@ async def add_weighings(
 				D=w.D,
 			))
 
-		save_weighings(glider_id, weighing_objects)
+		await db_executor.run(save_weighings, glider_id, weighing_objects)
 
 		event = f'Weighings {weighing_objects} added for glider {glider_id}'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='glider', resource_id=glider_id, action='add_weighings') is None:
 			logger.warning(f'Failed to create weighing audit event for {glider_id}')
 
 		return {'registration': glider_id, 'weighings_added': len(weighing_objects)}
@@ -537,7 +606,7 @@ async def update_glider_weighing(
 ):
 	"""Update one weighing for a glider (admin only)."""
 	try:
-		glider = get_glider_by_id(glider_id)
+		glider = await db_executor.run(get_glider_by_id, glider_id)
 		if not glider:
 			raise HTTPException(status_code=404, detail=f'Glider {glider_id} not found')
 
@@ -563,11 +632,11 @@ async def update_glider_weighing(
 			D=weighing.D,
 		)
 
-		if not save_weighings(glider_id, [weighing_object]):
+		if not await db_executor.run(save_weighings, glider_id, [weighing_object]):
 			raise ValueError('Failed to update weighing')
 
 		event = f'Weighing {weighing_id} updated for glider {glider_id}'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='glider', resource_id=glider_id, action='update_weighing') is None:
 			logger.warning(f'Failed to create weighing update audit event for {glider_id}/{weighing_id}')
 
 		return WeighingSchema(
@@ -590,16 +659,89 @@ async def update_glider_weighing(
 		raise HTTPException(status_code=500, detail='Failed to update weighing')
 
 
-@router.get('/by-id/{glider_id:path}/weighings/{weighing_id}/print', response_class=StreamingResponse)
-@router.get('/{glider_id}/weighings/{weighing_id}/print', response_class=StreamingResponse, include_in_schema=False)
+def _get_pack_job(job_id: str, user) -> dict:
+	"""Return a weighing sheet pack job readable by the user, or raise 404"""
+	job = job_registry.get(job_id)
+	if job is None or job['kind'] != PACK_JOB or (job['owner'] != user.username and not RoleChecker.is_admin(user.role)):
+		raise HTTPException(status_code=404, detail=f'Job {job_id} not found')
+	return job
+
+
+@router.post('/weighing-sheets', status_code=status.HTTP_202_ACCEPTED)
+async def create_weighing_pack(
+	request: WeighingPackRequest,
+	background_tasks: BackgroundTasks,
+	current_user = Depends(require_editor_role),
+):
+	"""Render the latest weighing sheet of several gliders as one download.
+
+	Sheets of the requested gliders, or of the whole fleet, render in worker
+	processes as a background job whose progress is read from
+	GET /api/gliders/weighing-sheets/jobs/{job_id}. The finished pack is a
+	zip with one PDF per glider, or a single merged PDF.
+	"""
+	if job_registry.is_running(PACK_JOB):
+		raise HTTPException(
+			status_code=status.HTTP_409_CONFLICT,
+			detail='A weighing sheet pack is already being built',
+		)
+
+	job = job_registry.create(PACK_JOB, owner=current_user.username)
+	target = ', '.join(request.registrations) if request.registrations else 'the whole fleet'
+	event = f'Weighing sheet pack ({request.format}) requested for {target}'
+	if await audit_writer.record(user_id=current_user.username, event=event, resource_type='fleet', action='print_weighing_pack') is None:
+		logger.warning(f'Failed to create weighing sheet pack audit event for job {job["id"]}')
+
+	background_tasks.add_task(run_pack_job, job['id'], request.registrations, request.format)
+	return {
+		'message': 'Weighing sheet pack started',
+		'job_id': job['id'],
+		'status_url': f'/api/gliders/weighing-sheets/jobs/{job["id"]}',
+	}
+
+
+@router.get('/weighing-sheets/jobs/{job_id}')
+async def get_weighing_pack_status(job_id: str, current_user = Depends(require_editor_role)):
+	"""Return the status and progress of a weighing sheet pack job."""
+	return _get_pack_job(job_id, current_user)
+
+
+@router.get('/weighing-sheets/jobs/{job_id}/download', response_class=FileResponse)
+async def download_weighing_pack(job_id: str, current_user = Depends(require_editor_role)):
+	"""Download the file built by a finished weighing sheet pack job."""
+	job = _get_pack_job(job_id, current_user)
+	if job['status'] != 'succeeded':
+		raise HTTPException(
+			status_code=status.HTTP_409_CONFLICT,
+			detail=f'Job {job_id} is {job["status"]}',
+		)
+
+	pack_format = job['result']['format']
+	path = pack_path(job_id, pack_format)
+	if not os.path.exists(path):
+		raise HTTPException(status_code=status.HTTP_410_GONE, detail=f'Pack of job {job_id} has expired')
+	return FileResponse(
+		path,
+		media_type=PACK_MEDIA_TYPES[pack_format],
+		filename=f'weighing-sheets.{pack_format}',
+	)
+
+
+@router.get('/by-id/{glider_id:path}/weighings/{weighing_id}/print', response_class=Response)
+@router.get('/{glider_id}/weighings/{weighing_id}/print', response_class=Response, include_in_schema=False)
 async def print_glider_weighing(
 	glider_id: str,
 	weighing_id: int,
+	if_none_match: Optional[str] = Header(None),
 	current_user = Depends(require_editor_role),
 ):
-	"""Generate the official weighing sheet PDF for one glider weighing."""
+	"""Generate the official weighing sheet PDF for one glider weighing.
+
+	Sheets are cached by a digest of their content, which is also their
+	ETag: a request whose If-None-Match holds it gets 304 Not Modified.
+	"""
 	try:
-		glider = get_glider_by_id(glider_id)
+		glider = await db_executor.run(get_glider_by_id, glider_id)
 		if not glider:
 			raise HTTPException(status_code=404, detail=f'Glider {glider_id} not found')
 
@@ -607,19 +749,41 @@ async def print_glider_weighing(
 		if weighing is None:
 			raise HTTPException(status_code=404, detail=f'Weighing {weighing_id} not found')
 
-		pdf_bytes = WeighingPdfService.render_pdf(glider, weighing)
-		filename = f'weighing-{glider.registration.replace("/", "-")}-{weighing_id}.pdf'
+		key = WeighingPdfService.cache_key(glider, weighing)
+		filename = sheet_filename(glider.registration, weighing_id)
 		headers = {
 			'Content-Disposition': f'inline; filename="{filename}"',
+			'ETag': f'"{key}"',
+			'Cache-Control': 'private, no-cache',
 		}
 
 		event = f'Weighing {weighing_id} printed for glider {glider_id}'
-		if audit_queries.create_audit_entry(user_id=current_user.username, event=event) is None:
+		if await audit_writer.record(user_id=current_user.username, event=event, resource_type='glider', resource_id=glider_id, action='print_weighing') is None:
 			logger.warning(f'Failed to create weighing print audit event for {glider_id}/{weighing_id}')
 
-		return StreamingResponse(io.BytesIO(pdf_bytes), media_type='application/pdf', headers=headers)
+		if _etag_matches(if_none_match, key):
+			return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+		pdf_bytes = await pdf_executor.run(weighing_pdf_cache.get, glider.registration, key)
+		headers['X-Cache'] = 'hit' if pdf_bytes is not None else 'miss'
+		if pdf_bytes is None:
+			version = weighing_pdf_cache.version(glider.registration, key)
+			pdf_bytes = await pdf_workers.run(WeighingPdfService.render_pdf, glider, weighing)
+			await pdf_executor.run(weighing_pdf_cache.put, glider.registration, key, pdf_bytes, version)
+
+		return Response(content=pdf_bytes, media_type='application/pdf', headers=headers)
 	except HTTPException:
 		raise
+	except PdfQueueFullError as e:
+		logger.warning(f'Rejected PDF for weighing {weighing_id} of {glider_id}: {e}')
+		raise HTTPException(
+			status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+			detail='Too many weighing sheets being generated, retry shortly',
+			headers={'Retry-After': '1'},
+		) from e
+	except PdfRenderTimeout as e:
+		logger.error(f'Timed out generating PDF for weighing {weighing_id} of {glider_id}: {e}')
+		raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail='Weighing PDF generation timed out') from e
 	except (ValueError, NotImplementedError) as e:
 		raise HTTPException(status_code=400, detail=str(e)) from e
 	except Exception as e:
@@ -636,14 +800,14 @@ async def delete_glider_weighing(
 ):
 	"""Delete one weighing for a glider (admin only)."""
 	try:
-		glider = get_glider_by_id(glider_id)
+		glider = await db_executor.run(get_glider_by_id, glider_id)
 		if not glider:
 			raise HTTPException(status_code=404, detail=f'Glider {glider_id} not found')
 
-		if not delete_weighing(glider_id, weighing_id):
+		if not await db_executor.run(delete_weighing, glider_id, weighing_id):
 			raise HTTPException(status_code=404, detail=f'Weighing {weighing_id} not found')
 		event = f'Weighing {weighing_id} deleted for glider {glider_id}'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='glider', resource_id=glider_id, action='delete_weighing') is None:
 			logger.warning(f'Failed to create weighing deletion audit event for {glider_id}/{weighing_id}')
 	except HTTPException:
 		raise
@@ -657,19 +821,19 @@ async def delete_glider_weighing(
 async def update_weight_and_balances(
 	glider_id: str,
 	payload: WeightAndBalancesRequest,
-	admin_user = Depends(require_admin_role)
+	admin_user = Depends(require_admin_role),
 ):
 	"""Replace all weight & balance limit points for a glider (admin only)."""
 	try:
-		glider = get_glider_by_id(glider_id)
+		glider = await db_executor.run(get_glider_by_id, glider_id)
 		if not glider:
 			raise HTTPException(status_code=404, detail=f'Glider {glider_id} not found')
 
-		if not save_weight_and_balance(glider_id, payload.weight_and_balances):
+		if not await db_executor.run(save_weight_and_balance, glider_id, payload.weight_and_balances):
 			raise ValueError('Failed to save weight and balances')
 
 		event = f'Weight and balance {payload.weight_and_balances} updated for glider {glider_id}'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='glider', resource_id=glider_id, action='update_weight_and_balance') is None:
 			logger.warning(f'Failed to create weight and balance audit event for {glider_id}')
 
 		return {'registration': glider_id, 'points_count': len(payload.weight_and_balances)}
@@ -692,82 +856,69 @@ async def get_glider_limits(glider_id: str):
 	try:
 		logger.info(f'Fetching limits for glider {glider_id}')
 
-		glider = get_glider_by_id(glider_id)
-		if not glider:
-			logger.warning(f'Glider {glider_id} not found')
-			raise HTTPException(
-				status_code=status.HTTP_404_NOT_FOUND,
-				detail=f'Glider {glider_id} not found'
-			)
-
-		try:
-			empty_weight = glider.empty_weight()
-			last_weighing = glider.last_weighing()
-			mve = last_weighing.mve() if last_weighing else None
-			mvenp = last_weighing.mvenp() if last_weighing else None
-		except ValueError:
-			empty_weight = None
-			mve = None
-			mvenp = None
-			logger.debug(f'No weighing data for glider {glider_id}')
-
-		try:
-			cv_max = glider.cv_max()
-		except ValueError:
-			cv_max = None
+		summary = await db_executor.run(get_glider_summary, glider_id)
+		if summary is None:
+			glider = await db_executor.run(get_glider_by_id, glider_id)
+			if not glider:
+				logger.warning(f'Glider {glider_id} not found')
+				raise HTTPException(
+					status_code=status.HTTP_404_NOT_FOUND,
+					detail=f'Glider {glider_id} not found'
+				)
+			logger.debug(f'No precomputed summary for glider {glider_id}, computing it')
+			summary = glider.summary()
 
-		try:
-			cu_max = glider.cu_max()
-		except ValueError:
-			cu_max = None
+		logger.info(f'Successfully retrieved limits for glider {glider_id}')
+		return GliderCalculationsResponse(**asdict(summary))
+	except HTTPException:
+		raise
+	except Exception as e:
+		logger.error(f'Error fetching limits for glider {glider_id}: {e}', exc_info=True)
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail='Failed to fetch glider limits'
+		)
 
-		try:
-			cu = glider.cu()
-		except ValueError:
-			cu = None
 
-		try:
-			pilot_av_mini = glider.pilot_av_mini()
-		except (ValueError, NotImplementedError):
-			pilot_av_mini = None
+@router.post('/calculate', response_class=StreamingResponse)
+async def calculate_fleet_weight_and_balance(
+	request: FleetCalculationRequest,
+):
+	"""
+	Evaluate one loading against every glider of the fleet (public endpoint).
 
-		try:
-			pilot_av_mini_duo = glider.pilot_av_mini_duo()
-		except (ValueError, NotImplementedError):
-			pilot_av_mini_duo = None
+	- **request**: FleetCalculationRequest with the loading weights and optional
+	  model, brand, single_seat and registrations filters
+	- **Returns**: NDJSON stream with one FleetCalculationResult per glider, ordered
+	  by registration (total weight, CG, envelope verdict and minimum ballast)
+	"""
+	try:
+		gliders = await db_executor.run(get_fleet,
+			model=request.model,
+			brand=request.brand,
+			single_seat=request.single_seat,
+			registrations=request.registrations,
+		)
+		logger.info(f'Calculating W&B for {len(gliders)} gliders')
 
-		try:
-			pilot_av_maxi = glider.pilot_av_maxi()
-		except (ValueError, NotImplementedError):
-			pilot_av_maxi = None
+		event = f'Calcul centrage flotte : {len(gliders)} planeurs, pilote avant {request.front_pilot_weight} kg, pilote arrière {request.rear_pilot_weight} kg'
+		if await audit_writer.record(user_id='unknown', event=event, resource_type='fleet', action='calculate') is None:
+			logger.warning('Failed to create fleet calculation audit event')
 
-		try:
-			empty_arm = glider.empty_arm()
-		except ValueError:
-			empty_arm = None
+		def iter_results():
+			for result in calculate_fleet(gliders, request):
+				yield result.model_dump_json() + '\n'
 
-		logger.info(f'Successfully retrieved limits for glider {glider_id}')
-		return GliderCalculationsResponse(
-			registration=glider.registration,
-			model=glider.model,
-			mve=mve,
-			mvenp=mvenp,
-			empty_weight=empty_weight,
-			cv_max=cv_max,
-			cu_max=cu_max,
-			cu=cu,
-			pilot_av_mini=pilot_av_mini,
-			pilot_av_mini_duo=pilot_av_mini_duo,
-			pilot_av_maxi=pilot_av_maxi,
-			empty_arm=empty_arm,
+		return StreamingResponse(
+			iter_results(),
+			media_type='application/x-ndjson',
+			headers={'X-Total-Count': str(len(gliders))},
 		)
-	except HTTPException:
-		raise
 	except Exception as e:
-		logger.error(f'Error fetching limits for glider {glider_id}: {e}', exc_info=True)
+		logger.error(f'Error calculating fleet W&B: {e}', exc_info=True)
 		raise HTTPException(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-			detail='Failed to fetch glider limits'
+			detail='Failed to calculate weight and balance'
 		)
 
 
@@ -792,7 +943,7 @@ async def calculate_weight_and_balance(
 	try:
 		logger.info(f'Calculating W&B for glider {glider_id}')
 
-		glider = get_glider_by_id(glider_id)
+		glider = await db_executor.run(get_glider_by_id, glider_id)
 		if not glider:
 			logger.warning(f'Glider {glider_id} not found')
 			raise HTTPException(
@@ -828,16 +979,24 @@ async def calculate_weight_and_balance(
 				detail='This glider datum type is not supported for calculations'
 			)
 
-		logger.info(f'W&B calculation complete: weight={total_weight}kg, cg={cg}mm')
+		in_envelope, envelope_margin = None, None
+		envelope = get_envelope(glider)
+		if envelope is not None:
+			inside, margin = envelope.check(total_weight, cg)
+			in_envelope, envelope_margin = bool(inside), round(float(margin), 2)
+
+		logger.info(f'W&B calculation complete: weight={total_weight}kg, cg={cg}mm, in_envelope={in_envelope}')
 		audit_user_id = 'unknown'
 
 		event = f'Calcul centrage planeur pour {glider.registration} : {total_weight} kg, {round(cg,0)} mm'
-		if audit_queries.create_audit_entry(user_id=audit_user_id, event=event) is None:
+		if await audit_writer.record(user_id=audit_user_id, event=event, resource_type='glider', resource_id=glider.registration, action='calculate') is None:
 			logger.warning(f'Failed to create calculation audit event for glider {glider.registration}')
 
 		return WeightBalanceCalculationResponse(
 			total_weight=round(total_weight, 2),
 			center_of_gravity=round(cg, 2),
+			in_envelope=in_envelope,
+			envelope_margin=envelope_margin,
 		)
 	except HTTPException:
 		raise
@@ -847,3 +1006,133 @@ async def calculate_weight_and_balance(
 			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 			detail='Failed to calculate weight and balance'
 		)
+
+
+def _calculate_batch_response(glider: Glider, request: WeightBalanceBatchRequest, max_combinations: int) -> WeightBalanceBatchResponse:
+	"""Expand, compute and serialize a batch calculation, all CPU bound (run in calc_executor)"""
+	results = calculate_batch(glider, expand_loads(request, max_combinations))
+	return WeightBalanceBatchResponse(
+		count=len(results['total_weight']),
+		**{
+			name: [round(value, 2) for value in values.tolist()] if values.dtype.kind == 'f' else values.tolist()
+			for name, values in results.items() if values is not None
+		},
+	)
+
+
+@router.post('/by-id/{glider_id:path}/calculate/batch', response_model=WeightBalanceBatchResponse)
+@router.post('/{glider_id}/calculate/batch', response_model=WeightBalanceBatchResponse)
+async def calculate_weight_and_balance_batch(
+	glider_id: str,
+	request: WeightBalanceBatchRequest,
+):
+	"""
+	Calculate weight and balance for many loadings of a glider at once (public endpoint).
+
+	- **glider_id**: Registration number of the glider
+	- **request**: WeightBalanceBatchRequest with a list or range of weights per load,
+	  paired element by element (``zip``) or combined (``grid``)
+	- **Returns**: WeightBalanceBatchResponse with the loads, total weight, CG and
+	  envelope flag of every loading, in the same order
+	"""
+	try:
+		glider = await db_executor.run(get_glider_by_id, glider_id)
+		if not glider:
+			logger.warning(f'Glider {glider_id} not found')
+			raise HTTPException(
+				status_code=status.HTTP_404_NOT_FOUND,
+				detail=f'Glider {glider_id} not found'
+			)
+
+		if not glider.arms:
+			logger.error(f'Arms data missing for glider {glider_id}')
+			raise HTTPException(
+				status_code=status.HTTP_400_BAD_REQUEST,
+				detail='Glider arms data is not configured'
+			)
+
+		try:
+			response = await calc_executor.run(_calculate_batch_response, glider, request, get_settings().WB_BATCH_MAX_COMBINATIONS)
+		except ValueError as e:
+			logger.warning(f'Batch calculation error for glider {glider_id}: {e}')
+			raise HTTPException(
+				status_code=status.HTTP_400_BAD_REQUEST,
+				detail=str(e)
+			)
+		except NotImplementedError as e:
+			logger.warning(f'Datum type not supported for glider {glider_id}: {e}')
+			raise HTTPException(
+				status_code=status.HTTP_400_BAD_REQUEST,
+				detail='This glider datum type is not supported for calculations'
+			)
+
+		count = response.count
+		logger.info(f'W&B batch calculation complete for glider {glider_id}: {count} loadings')
+
+		event = f'Calcul centrage planeur pour {glider.registration} : {count} chargements ({request.mode})'
+		if await audit_writer.record(user_id='unknown', event=event, resource_type='glider', resource_id=glider.registration, action='calculate') is None:
+			logger.warning(f'Failed to create batch calculation audit event for glider {glider.registration}')
+
+		return response
+	except HTTPException:
+		raise
+	except Exception as e:
+		logger.error(f'Error calculating W&B batch for glider {glider_id}: {e}', exc_info=True)
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail='Failed to calculate weight and balance'
+		)
+
+
+@router.post('/by-id/{glider_id:path}/ballast', response_model=BallastOptimizationResponse)
+@router.post('/{glider_id}/ballast', response_model=BallastOptimizationResponse)
+async def optimize_glider_ballast(
+	glider_id: str,
+	request: BallastOptimizationRequest,
+):
+	"""
+	Compute the feasible front, rear and water ballast ranges for a crew (public endpoint).
+
+	- **glider_id**: Registration number of the glider
+	- **request**: BallastOptimizationRequest with the pilot weights and search step
+	- **Returns**: BallastOptimizationResponse with, for each ballast taken alone,
+	  the smallest and largest amount keeping the CG inside the centering limits
+	  and the weight and balance envelope
+	"""
+	try:
+		glider = await db_executor.run(get_glider_by_id, glider_id)
+		if not glider:
+			logger.warning(f'Glider {glider_id} not found')
+			raise HTTPException(
+				status_code=status.HTTP_404_NOT_FOUND,
+				detail=f'Glider {glider_id} not found'
+			)
+
+		try:
+			result = await calc_executor.run(optimize_ballast, glider, request.front_pilot_weight, request.rear_pilot_weight, request.step)
+		except ValueError as e:
+			logger.warning(f'Ballast optimization error for glider {glider_id}: {e}')
+			raise HTTPException(
+				status_code=status.HTTP_400_BAD_REQUEST,
+				detail=str(e)
+			)
+		except NotImplementedError as e:
+			logger.warning(f'Datum type not supported for glider {glider_id}: {e}')
+			raise HTTPException(
+				status_code=status.HTTP_400_BAD_REQUEST,
+				detail='This glider datum type is not supported for calculations'
+			)
+
+		event = f'Calcul lest planeur pour {glider.registration} : pilote avant {request.front_pilot_weight} kg, pilote arrière {request.rear_pilot_weight} kg'
+		if await audit_writer.record(user_id='unknown', event=event, resource_type='glider', resource_id=glider.registration, action='optimize_ballast') is None:
+			logger.warning(f'Failed to create ballast audit event for glider {glider.registration}')
+
+		return result
+	except HTTPException:
+		raise
+	except Exception as e:
+		logger.error(f'Error optimizing ballast for glider {glider_id}: {e}', exc_info=True)
+		raise HTTPException(
+			status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+			detail='Failed to optimize ballast'
+		)
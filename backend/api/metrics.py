@@ -0,0 +1,34 @@
+"""FastAPI routes exposing runtime metrics for capacity planning"""
+
+import logging
+
+from fastapi import APIRouter, Depends
+
+from backend.db.audit_writer import audit_writer
+from backend.db.connection import get_connection_pool
+from backend.db.glider_queries import glider_cache
+from backend.executors import executor_stats
+from backend.middleware.auth import principal_cache, require_admin_role
+from backend.services.envelope import envelope_cache
+from backend.services.pdf_cache import weighing_pdf_cache
+from backend.services.pdf_workers import pdf_worker_stats
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix='/api/metrics', tags=['metrics'])
+
+
+@router.get('')
+async def get_metrics(admin_user = Depends(require_admin_role)) -> dict:
+	"""Return runtime statistics of shared backend resources (admin only)."""
+	logger.debug(f'Admin user {admin_user.username} reading metrics')
+	return {
+		'db_pool': get_connection_pool().stats(),
+		'glider_cache': glider_cache.stats(),
+		'envelope_cache': envelope_cache.stats(),
+		'pdf_cache': weighing_pdf_cache.stats(),
+		'principal_cache': principal_cache.stats(),
+		'executors': executor_stats(),
+		'pdf_workers': pdf_worker_stats(),
+		'audit_writer': audit_writer.stats(),
+	}
@@ -5,16 +5,16 @@ from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from backend.db.audit_queries import AuditQueries
-from backend.db.user_queries import UserQueries
-from backend.middleware.auth import require_admin_role
-from backend.models.user import User
+from backend.db.audit_writer import audit_writer
+from backend.db.user_queries import UserQueries, get_user_queries
+from backend.executors import auth_executor, db_executor
+from backend.middleware.auth import principal_cache, require_admin_role
+from backend.models.user import PasswordHasher, User
 from backend.schemas.user import UserRequest, UserResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix='/api/users', tags=['users'])
-audit_queries = AuditQueries()
 
 
 def _to_user_response(user: User) -> UserResponse:
@@ -27,11 +27,13 @@ def _to_user_response(user: User) -> UserResponse:
 
 
 @router.get('', response_model=List[UserResponse])
-async def list_users(admin_user = Depends(require_admin_role)):
+async def list_users(
+	admin_user = Depends(require_admin_role),
+	user_queries: UserQueries = Depends(get_user_queries),
+):
 	try:
 		logger.info(f'Admin user {admin_user.username} listing users')
-		user_queries = UserQueries()
-		users = user_queries.list_users()
+		users = await db_executor.run(user_queries.list_users)
 		return [_to_user_response(user) for user in users]
 	except Exception as e:
 		logger.error(f'Error listing users: {e}', exc_info=True)
@@ -45,12 +47,12 @@ async def list_users(admin_user = Depends(require_admin_role)):
 async def create_user(
 	request: UserRequest,
 	admin_user = Depends(require_admin_role),
+	user_queries: UserQueries = Depends(get_user_queries),
 ):
 	try:
 		logger.info(f'Admin user {admin_user.username} creating user {request.username}')
-		user_queries = UserQueries()
 
-		if user_queries.user_exists(request.username):
+		if await db_executor.run(user_queries.user_exists, request.username):
 			raise HTTPException(
 				status_code=status.HTTP_400_BAD_REQUEST,
 				detail=f'User {request.username} already exists',
@@ -65,19 +67,19 @@ async def create_user(
 		user = User(
 			username=request.username,
 			email=request.email,
-			password=request.password,
+			password=await auth_executor.run(PasswordHasher.hash_password, request.password),
 			role=request.role,
 		)
-		created = user_queries.create_user(user)
+		created = await db_executor.run(user_queries.create_user, user)
 		if not created:
 			raise ValueError('Failed to create user')
 
-		created_user = user_queries.get_user_by_username(request.username)
+		created_user = await db_executor.run(user_queries.get_user_by_username, request.username)
 		if not created_user:
 			raise ValueError('Failed to fetch created user')
 
 		event = f'User {request.username} created'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='user', resource_id=request.username, action='create') is None:
 			logger.warning(f'Failed to create audit event for user creation: {request.username}')
 
 		return _to_user_response(created_user)
@@ -96,12 +98,12 @@ async def update_user(
 	username: str,
 	request: UserRequest,
 	admin_user = Depends(require_admin_role),
+	user_queries: UserQueries = Depends(get_user_queries),
 ):
 	try:
 		logger.info(f'Admin user {admin_user.username} updating user {username}')
-		user_queries = UserQueries()
 
-		existing = user_queries.get_user_by_username(username)
+		existing = await db_executor.run(user_queries.get_user_by_username, username)
 		if not existing:
 			raise HTTPException(
 				status_code=status.HTTP_404_NOT_FOUND,
@@ -120,17 +122,20 @@ async def update_user(
 		}
 		if request.password:
 			updates['password'] = request.password
+			if not PasswordHasher.is_already_hashed(request.password):
+				updates['password'] = await auth_executor.run(PasswordHasher.hash_password, request.password)
 
-		updated = user_queries.update_user(username, updates)
+		updated = await db_executor.run(user_queries.update_user, username, updates)
 		if not updated:
 			raise ValueError('Failed to update user')
+		principal_cache.invalidate_user(username)
 
-		updated_user = user_queries.get_user_by_username(username)
+		updated_user = await db_executor.run(user_queries.get_user_by_username, username)
 		if not updated_user:
 			raise ValueError('Failed to fetch updated user')
 
 		event = f'User {username} updated'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='user', resource_id=username, action='update') is None:
 			logger.warning(f'Failed to create audit event for user update: {username}')
 
 		return _to_user_response(updated_user)
@@ -148,24 +153,25 @@ async def update_user(
 async def delete_user(
 	username: str,
 	admin_user = Depends(require_admin_role),
+	user_queries: UserQueries = Depends(get_user_queries),
 ):
 	try:
 		logger.info(f'Admin user {admin_user.username} deleting user {username}')
-		user_queries = UserQueries()
 
-		existing = user_queries.get_user_by_username(username)
+		existing = await db_executor.run(user_queries.get_user_by_username, username)
 		if not existing:
 			raise HTTPException(
 				status_code=status.HTTP_404_NOT_FOUND,
 				detail=f'User {username} not found',
 			)
 
-		deleted = user_queries.delete_user(username)
+		deleted = await db_executor.run(user_queries.delete_user, username)
 		if not deleted:
 			raise ValueError('Failed to delete user')
+		principal_cache.invalidate_user(username)
 
 		event = f'User {username} deleted'
-		if audit_queries.create_audit_entry(user_id=admin_user.username, event=event) is None:
+		if await audit_writer.record(user_id=admin_user.username, event=event, resource_type='user', resource_id=username, action='delete') is None:
 			logger.warning(f'Failed to create audit event for user deletion: {username}')
 
 	except HTTPException:
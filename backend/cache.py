@@ -0,0 +1,155 @@
+"""In-process versioned LRU cache with TTL, shared by backend caches"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class VersionedLRUCache:
+	"""Thread-safe LRU cache whose entries expire after a TTL
+
+	Writers call ``invalidate`` after changing the data behind a key. Readers
+	take a ``version`` token before loading a value and hand it back to
+	``put``: if the key was invalidated in between, the loaded value may be
+	stale and is not stored. Entries may also carry a tag (for example the
+	user an entry belongs to) so that ``invalidate_tag`` drops every entry
+	built from the same data at once.
+
+	Invalidation versions are kept for at most ``max_entries`` keys and as
+	many tags. When the oldest one is dropped, its version becomes a floor
+	for every key. A trimmed key never reverts to an older version, and the
+	only cost is that some in-flight loads of other keys are rejected.
+
+	The cache lives in the worker process, so with several workers an
+	invalidation only reaches the worker that performed the write; the TTL
+	bounds how long the other workers may serve the previous value.
+	"""
+
+	def __init__(self, name: str, max_entries: int = 256, ttl: float = 300.0):
+		"""Create an empty cache
+
+		Args:
+			name: Cache name used in metrics
+			max_entries: Maximum number of entries kept before evicting the least recently used
+			ttl: Seconds an entry stays valid after being stored (0 disables expiry)
+		"""
+		self.name = name
+		self.max_entries = max_entries
+		self.ttl = ttl
+		self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+		self._lock = threading.Lock()
+		self._clock = 0
+		self._floor = 0
+		self._versions: 'OrderedDict[Hashable, int]' = OrderedDict()
+		self._tag_versions: 'OrderedDict[Hashable, int]' = OrderedDict()
+		self._tags: Dict[Hashable, Hashable] = {}
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+		self._expirations = 0
+		self._invalidations = 0
+		self._stale_puts = 0
+
+	def _version(self, key: Hashable, tag: Optional[Hashable] = None) -> int:
+		version = max(self._versions.get(key, 0), self._floor)
+		if tag is not None:
+			version = max(version, self._tag_versions.get(tag, 0))
+		return version
+
+	def _bump(self, versions: 'OrderedDict[Hashable, int]', key: Hashable) -> None:
+		self._clock += 1
+		versions[key] = self._clock
+		versions.move_to_end(key)
+		while len(versions) > self.max_entries:
+			_, version = versions.popitem(last=False)
+			self._floor = max(self._floor, version)
+
+	def version(self, key: Hashable, tag: Optional[Hashable] = None) -> int:
+		"""Return the version token to pass to ``put`` for a value loaded now"""
+		with self._lock:
+			return self._version(key, tag)
+
+	def get(self, key: Hashable) -> Optional[Any]:
+		"""Return the cached value for a key, or None on miss or expiry"""
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				self._misses += 1
+				return None
+			stored_at, value = entry
+			if self.ttl and time.monotonic() - stored_at > self.ttl:
+				del self._entries[key]
+				self._tags.pop(key, None)
+				self._expirations += 1
+				self._misses += 1
+				return None
+			self._entries.move_to_end(key)
+			self._hits += 1
+			return value
+
+	def put(self, key: Hashable, value: Any, version: int, tag: Optional[Hashable] = None) -> bool:
+		"""Store a value loaded under ``version``
+
+		Returns:
+			False when the key or tag was invalidated since ``version`` was taken
+		"""
+		with self._lock:
+			if self._version(key, tag) != version:
+				self._stale_puts += 1
+				return False
+			self._entries[key] = (time.monotonic(), value)
+			self._entries.move_to_end(key)
+			if tag is not None:
+				self._tags[key] = tag
+			while len(self._entries) > self.max_entries:
+				evicted, _ = self._entries.popitem(last=False)
+				self._tags.pop(evicted, None)
+				self._evictions += 1
+			return True
+
+	def invalidate(self, key: Hashable) -> None:
+		"""Drop a key and reject values loaded before this call"""
+		with self._lock:
+			self._bump(self._versions, key)
+			self._entries.pop(key, None)
+			self._tags.pop(key, None)
+			self._invalidations += 1
+
+	def invalidate_tag(self, tag: Hashable) -> None:
+		"""Drop every entry stored with ``tag`` and reject values loaded before this call"""
+		with self._lock:
+			self._bump(self._tag_versions, tag)
+			for key in [key for key, entry_tag in self._tags.items() if entry_tag == tag]:
+				del self._entries[key]
+				del self._tags[key]
+			self._invalidations += 1
+
+	def clear(self) -> None:
+		"""Drop every entry and reject values loaded before this call"""
+		with self._lock:
+			self._clock += 1
+			self._floor = self._clock
+			self._versions.clear()
+			self._tag_versions.clear()
+			self._tags.clear()
+			self._entries.clear()
+			self._invalidations += 1
+
+	def stats(self) -> Dict[str, Any]:
+		"""Return hit/miss counters and occupancy"""
+		with self._lock:
+			lookups = self._hits + self._misses
+			return {
+				'name': self.name,
+				'size': len(self._entries),
+				'max_entries': self.max_entries,
+				'ttl_seconds': self.ttl,
+				'hits': self._hits,
+				'misses': self._misses,
+				'hit_ratio': round(self._hits / lookups, 4) if lookups else 0.0,
+				'evictions': self._evictions,
+				'expirations': self._expirations,
+				'invalidations': self._invalidations,
+				'stale_puts': self._stale_puts,
+			}
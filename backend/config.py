@@ -22,12 +22,57 @@ class Settings(BaseSettings):
 
     # Database
     DB_NAME: str = os.getenv("DB_NAME", "pyglider.duckdb")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+    # Worker threads for blocking work (0 picks min(4, CPU count)): bcrypt
+    # hashing, and weight and balance batch and ballast calculations
+    BCRYPT_WORKERS: int = int(os.getenv("BCRYPT_WORKERS", "0"))
+    CALC_WORKERS: int = int(os.getenv("CALC_WORKERS", "0"))
+
+    # PDF rendering worker processes: PDF_WORKERS for single sheets with at most
+    # PDF_QUEUE_SIZE renders waiting, PDF_PACK_WORKERS for packs (0 picks the CPU
+    # count). A render is killed after PDF_TIMEOUT seconds and a worker whose peak
+    # RSS exceeds PDF_WORKER_MAX_RSS_MB (0 disables) is replaced
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", "2"))
+    PDF_QUEUE_SIZE: int = int(os.getenv("PDF_QUEUE_SIZE", "16"))
+    PDF_PACK_WORKERS: int = int(os.getenv("PDF_PACK_WORKERS", "0"))
+    PDF_TIMEOUT: float = float(os.getenv("PDF_TIMEOUT", "30"))
+    PDF_WORKER_MAX_RSS_MB: int = int(os.getenv("PDF_WORKER_MAX_RSS_MB", "512"))
+
+    # Glider aggregate cache
+    GLIDER_CACHE_SIZE: int = int(os.getenv("GLIDER_CACHE_SIZE", "256"))
+    GLIDER_CACHE_TTL: float = float(os.getenv("GLIDER_CACHE_TTL", "300"))
+    # Rendered weighing sheet cache: PDFs kept in memory, and optionally in
+    # PDF_CACHE_DIR (empty: memory only) up to PDF_CACHE_DISK_SIZE files
+    PDF_CACHE_SIZE: int = int(os.getenv("PDF_CACHE_SIZE", "128"))
+    PDF_CACHE_DIR: str = os.getenv("PDF_CACHE_DIR", "")
+    PDF_CACHE_DISK_SIZE: int = int(os.getenv("PDF_CACHE_DISK_SIZE", "1024"))
+
+    # Audit log writer: queued entries are inserted in batches of AUDIT_BATCH_SIZE
+    # at least every AUDIT_FLUSH_INTERVAL seconds; a full queue either blocks
+    # callers for up to AUDIT_BLOCK_TIMEOUT seconds ("block") or drops ("drop")
+    AUDIT_QUEUE_SIZE: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_INTERVAL: float = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+    AUDIT_QUEUE_FULL_POLICY: str = os.getenv("AUDIT_QUEUE_FULL_POLICY", "block")
+    AUDIT_BLOCK_TIMEOUT: float = float(os.getenv("AUDIT_BLOCK_TIMEOUT", "5"))
+    # Filtered audit log pages with an estimated total count at most this many rows
+    AUDIT_COUNT_CAP: int = int(os.getenv("AUDIT_COUNT_CAP", "10000"))
+    # Parquet archive of old audit entries (empty: <DB_NAME stem>_audit_archive next to the database)
+    AUDIT_ARCHIVE_DIR: str = os.getenv("AUDIT_ARCHIVE_DIR", "")
+
+    # Weight and balance calculations
+    WB_BATCH_MAX_COMBINATIONS: int = int(os.getenv("WB_BATCH_MAX_COMBINATIONS", "100000"))
 
     # JWT/Authentication
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRY_HOURS: int = 24
     JWT_REFRESH_EXPIRY_DAYS: int = 7
+    # Authenticated principal cache: max cached tokens and seconds before re-verification
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+    PRINCIPAL_CACHE_TTL: float = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
 
     # CORS
     CORS_ORIGINS: list[str] = [
@@ -37,6 +82,7 @@ class Settings(BaseSettings):
     CORS_ALLOW_CREDENTIALS: bool = True
     CORS_ALLOW_METHODS: list[str] = ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"]
     CORS_ALLOW_HEADERS: list[str] = ["*"]
+    CORS_EXPOSE_HEADERS: list[str] = ["X-Total-Count", "X-Next-Cursor", "ETag"]
 
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
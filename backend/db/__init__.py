@@ -1,15 +1,19 @@
 """Database utilities for PyGliderCG backend"""
 
 from backend.db.glider_queries import (
-	get_all_gliders, get_glider_by_id, get_glider_by_model,
+	get_all_gliders, get_fleet, get_glider_by_id, get_glider_by_model, list_gliders_page,
 	create_glider, update_glider, delete_glider,
-	save_weight_and_balance, save_weighings, save_instruments
+	save_weight_and_balance, save_weighings, save_instruments,
+	delete_instrument, delete_instruments, delete_weighing, glider_cache,
+	get_glider_summary, list_glider_summaries, refresh_glider_summaries,
 )
 from backend.db.user_queries import UserQueries
 
 __all__ = [
-	'get_all_gliders', 'get_glider_by_id', 'get_glider_by_model',
+	'get_all_gliders', 'get_fleet', 'get_glider_by_id', 'get_glider_by_model', 'list_gliders_page',
 	'create_glider', 'update_glider', 'delete_glider',
 	'save_weight_and_balance', 'save_weighings', 'save_instruments',
+	'delete_instrument', 'delete_instruments', 'delete_weighing', 'glider_cache',
+	'get_glider_summary', 'list_glider_summaries', 'refresh_glider_summaries',
 	'UserQueries',
 ]
@@ -0,0 +1,164 @@
+"""Date-partitioned Parquet archive of old audit log entries"""
+
+import glob
+import logging
+import os
+import shutil
+import threading
+import uuid
+from datetime import date
+from typing import Collection, List, Optional
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+PARTITION_PREFIX = 'day='
+
+# Held while rows move between AUDITLOG and the archive, and while a
+# database export or import reads or replaces both, so that they always
+# see each row exactly once. Taken before any pooled cursor.
+archive_lock = threading.Lock()
+
+
+def _sql_string(value: str) -> str:
+	return "'" + value.replace("'", "''") + "'"
+
+
+class AuditArchive:
+	"""Directory of archived audit entries, one ``day=YYYY-MM-DD`` partition per day
+
+	Rows are written by DuckDB ``COPY ... (PARTITION_BY (day))`` into a
+	staging directory first. The staged files are moved into their
+	partitions only after the rows were deleted from AUDITLOG. A staging
+	directory left behind by a crash is published if its rows are gone from
+	AUDITLOG and discarded otherwise, so rows are never both hot and
+	archived.
+	"""
+
+	def __init__(self, directory: str):
+		"""Create an archive rooted at ``directory`` (created on first write)"""
+		self.directory = directory
+
+	def days(self) -> List[date]:
+		"""Return the archived days in ascending order"""
+		days = []
+		for path in glob.glob(os.path.join(self.directory, f'{PARTITION_PREFIX}*')):
+			try:
+				day = date.fromisoformat(os.path.basename(path)[len(PARTITION_PREFIX):])
+			except ValueError:
+				continue
+			if glob.glob(os.path.join(path, '*.parquet')):
+				days.append(day)
+		return sorted(days)
+
+	def files(self, start: Optional[date] = None, end: Optional[date] = None, days: Optional[Collection[date]] = None) -> List[str]:
+		"""Return the Parquet files of the partitions between start and end (inclusive), and among days if given"""
+		files = []
+		for day in self.days():
+			if (start is None or day >= start) and (end is None or day <= end) and (days is None or day in days):
+				files.extend(sorted(glob.glob(os.path.join(self.directory, f'{PARTITION_PREFIX}{day.isoformat()}', '*.parquet'))))
+		return files
+
+	def source(self, start: Optional[date] = None, end: Optional[date] = None, days: Optional[Collection[date]] = None) -> Optional[str]:
+		"""Return a read_parquet() SQL expression over the pruned partitions, or None"""
+		files = self.files(start, end, days)
+		if not files:
+			return None
+		file_list = ', '.join(_sql_string(path) for path in files)
+		return f'read_parquet([{file_list}], hive_partitioning = true)'
+
+	def new_staging_dir(self) -> str:
+		"""Return the path of a fresh staging directory inside the archive"""
+		os.makedirs(self.directory, exist_ok=True)
+		return os.path.join(self.directory, f'.staging-{uuid.uuid4().hex}')
+
+	def copy_sql(self, select_sql: str, staging_dir: str) -> str:
+		"""COPY statement writing a query with a ``day`` column into staging_dir partitions"""
+		return (
+			f'COPY ({select_sql}) TO {_sql_string(staging_dir)} '
+			"(FORMAT PARQUET, PARTITION_BY (day), FILENAME_PATTERN 'audit_{uuid}')"
+		)
+
+	def publish(self, staging_dir: str) -> None:
+		"""Move the files of a committed staging directory into their partitions"""
+		for path in glob.glob(os.path.join(staging_dir, f'{PARTITION_PREFIX}*', '*.parquet')):
+			partition = os.path.join(self.directory, os.path.basename(os.path.dirname(path)))
+			os.makedirs(partition, exist_ok=True)
+			os.replace(path, os.path.join(partition, os.path.basename(path)))
+		shutil.rmtree(staging_dir, ignore_errors=True)
+
+	def discard(self, staging_dir: str) -> None:
+		"""Remove a staging directory whose rows are still in AUDITLOG"""
+		shutil.rmtree(staging_dir, ignore_errors=True)
+
+	def copy_to(self, target_dir: str) -> int:
+		"""Copy the published partitions into target_dir and return the number of files"""
+		files = self.files()
+		for path in files:
+			partition = os.path.join(target_dir, os.path.basename(os.path.dirname(path)))
+			os.makedirs(partition, exist_ok=True)
+			shutil.copyfile(path, os.path.join(partition, os.path.basename(path)))
+		return len(files)
+
+	def stage_replacement(self, source_dir: Optional[str]) -> str:
+		"""Copy the partitions of an imported archive next to this one
+
+		Args:
+			source_dir: Directory of ``day=`` partitions, or None for an empty archive
+
+		Returns:
+			Directory to pass to ``replace``
+		"""
+		parent = os.path.dirname(os.path.abspath(self.directory))
+		os.makedirs(parent, exist_ok=True)
+		staged_dir = os.path.join(parent, f'.{os.path.basename(self.directory)}-import-{uuid.uuid4().hex}')
+		if source_dir and os.path.isdir(source_dir):
+			shutil.copytree(source_dir, staged_dir)
+		else:
+			os.makedirs(staged_dir)
+		return staged_dir
+
+	def replace(self, staged_dir: str) -> Optional[str]:
+		"""Swap in a directory made by ``stage_replacement``
+
+		Both renames stay within one directory, so the swap cannot fail
+		half way on a full disk.
+
+		Returns:
+			The previous archive directory, to be removed by the caller, or None
+		"""
+		retired_dir = None
+		if os.path.exists(self.directory):
+			retired_dir = f'{staged_dir}-retired'
+			os.replace(self.directory, retired_dir)
+		os.replace(staged_dir, self.directory)
+		return retired_dir
+
+	def recover(self, conn) -> None:
+		"""Finish or discard staging directories left by an interrupted run
+
+		Args:
+			conn: DuckDB connection used to check whether staged rows are still in AUDITLOG
+		"""
+		for staging_dir in glob.glob(os.path.join(self.directory, '.staging-*')):
+			staged = glob.glob(os.path.join(staging_dir, f'{PARTITION_PREFIX}*', '*.parquet'))
+			still_hot = bool(staged) and conn.execute(
+				f'SELECT count(*) FROM AUDITLOG WHERE id IN (SELECT id FROM read_parquet([{", ".join(_sql_string(path) for path in staged)}]))'
+			).fetchone()[0] > 0
+			if staged and not still_hot:
+				logger.warning(f'Publishing audit archive staging directory {staging_dir} left by an interrupted run')
+				self.publish(staging_dir)
+			else:
+				logger.warning(f'Discarding uncommitted audit archive staging directory {staging_dir}')
+				self.discard(staging_dir)
+
+
+def get_audit_archive(db_path: Optional[str] = None) -> AuditArchive:
+	"""Return the archive of a database: AUDIT_ARCHIVE_DIR, or <db name>_audit_archive next to it"""
+	if settings.AUDIT_ARCHIVE_DIR:
+		return AuditArchive(settings.AUDIT_ARCHIVE_DIR)
+	db_path = os.path.abspath(db_path or settings.DB_NAME)
+	stem = os.path.splitext(os.path.basename(db_path))[0]
+	return AuditArchive(os.path.join(os.path.dirname(db_path), f'{stem}_audit_archive'))
@@ -1,16 +1,61 @@
 """Database operations for audit logs in DuckDB"""
 
+import base64
 import logging
-from typing import Optional, List, Dict, Any
-from datetime import datetime, timezone
-
-import duckdb
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple, Set, Collection
+from datetime import date, datetime, time, timedelta, timezone
 
 from backend.config import get_settings
+from backend.db.audit_archive import archive_lock, get_audit_archive
+from backend.db.connection import get_connection_pool
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Columns written by inserts; id comes from the audit_id_seq sequence
+AUDIT_COLUMNS = 'timestamp, username, event, resource_type, resource_id, action'
+# Columns shared by AUDITLOG and the Parquet archive
+ARCHIVE_COLUMNS = f'id, {AUDIT_COLUMNS}'
+
+
+def encode_audit_cursor(timestamp: datetime, entry_id: int) -> str:
+	"""Encode the (timestamp, id) key of the last entry of a page as an opaque cursor"""
+	key = f'{timestamp.isoformat()}|{entry_id}'
+	return base64.urlsafe_b64encode(key.encode()).decode().rstrip('=')
+
+
+def decode_audit_cursor(cursor: str) -> Tuple[datetime, int]:
+	"""Decode a cursor made by encode_audit_cursor
+
+	Raises:
+		ValueError: If the cursor is malformed
+	"""
+	try:
+		key = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+		timestamp, entry_id = key.split('|')
+		return datetime.fromisoformat(timestamp), int(entry_id)
+	except ValueError as e:
+		raise ValueError(f'Invalid audit log cursor: {cursor}') from e
+
+
+def _utc_date(value: datetime):
+	"""Date of a datetime in UTC, the zone AUDITLOG timestamps are stored in"""
+	if value.tzinfo is not None:
+		value = value.astimezone(timezone.utc)
+	return value.date()
+
+
+def _empty_page(skip: int, limit: int) -> Dict[str, Any]:
+	return {
+		'total': 0,
+		'total_exact': True,
+		'skip': skip,
+		'limit': limit,
+		'next_cursor': None,
+		'items': []
+	}
+
 
 class AuditQueries:
 	"""Database operations for audit log management"""
@@ -22,69 +67,108 @@ class AuditQueries:
 			db_path: Path to DuckDB database (uses settings.DB_NAME if not provided)
 		"""
 		self.db_path = db_path or settings.DB_NAME
-		self._ensure_audit_table()
-
-	def _get_connection(self):
-		"""Get a DuckDB connection"""
-		return duckdb.connect(self.db_path)
-
-	def _ensure_audit_table(self):
-		"""Ensure the AUDITLOG table exists in the database"""
-		conn = self._get_connection()
-		try:
-			conn.execute('''
-				CREATE TABLE IF NOT EXISTS AUDITLOG (
-					timestamp TIMESTAMP PRIMARY KEY,
-					username VARCHAR,
-					event VARCHAR
-				)
-			''')
-			conn.commit()
-			logger.debug('AUDITLOG table ensured in database')
-		except Exception as e:
-			logger.error(f'Error ensuring AUDITLOG table: {e}')
-		finally:
-			conn.close()
+		self.archive = get_audit_archive(self.db_path)
+
+	def _get_connection(self, read_only: bool = False):
+		"""Check out a pooled DuckDB cursor (use as a context manager)"""
+		return get_connection_pool(self.db_path).cursor(read_only=read_only)
+
+	def _source(
+		self,
+		start_date: Optional[datetime] = None,
+		end_date: Optional[datetime] = None,
+		days: Optional[Collection[date]] = None,
+	) -> str:
+		"""AUDITLOG, unioned with the archived partitions between start_date and end_date (and among days) if any"""
+		archive_source = self.archive.source(
+			_utc_date(start_date) if start_date else None,
+			_utc_date(end_date) if end_date else None,
+			days,
+		)
+		if not archive_source:
+			return 'AUDITLOG'
+		return f'(SELECT {ARCHIVE_COLUMNS} FROM AUDITLOG UNION ALL SELECT {ARCHIVE_COLUMNS} FROM {archive_source})'
 
 	def create_audit_entry(
 		self,
 		user_id: str,
 		event: str,
+		resource_type: Optional[str] = None,
+		resource_id: Optional[str] = None,
+		action: Optional[str] = None,
 	) -> Optional[Dict[str, Any]]:
 		"""Insert an audit log entry
 		
 		Args:
 			user_id: User ID who performed the action
 			event: Audit event text
+			resource_type: Type of the resource acted on ('glider', 'user', ...)
+			resource_id: ID of the resource acted on
+			action: What was done ('create', 'update', 'delete', ...)
 			
 		Returns:
 			Created audit entry data if successful, None otherwise
 		"""
-		conn = self._get_connection()
-		try:
-			timestamp = datetime.now(timezone.utc).replace(tzinfo=None)
-			conn.execute(
-				'INSERT INTO AUDITLOG VALUES (?, ?, ?)',
-				[timestamp, user_id, event]
-			)
+		with self._get_connection() as conn:
+			try:
+				timestamp = datetime.now(timezone.utc).replace(tzinfo=None)
+				entry_id = conn.execute(
+					f'INSERT INTO AUDITLOG ({AUDIT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?) RETURNING id',
+					[timestamp, user_id, event, resource_type, resource_id, action]
+				).fetchone()[0]
 			
+				conn.commit()
+				logger.info(f'Audit entry created: {user_id} {event}')
+				return {
+					'id': entry_id,
+					'timestamp': timestamp,
+					'user_id': user_id,
+					'event': event,
+					'resource_type': resource_type,
+					'resource_id': resource_id,
+					'action': action,
+				}
+			except Exception as e:
+				logger.error(f'Error creating audit entry: {e}')
+				return None
+
+	def create_audit_entries(self, entries: List[Dict[str, Any]]) -> int:
+		"""Insert several audit log entries with one multi-row INSERT
+
+		Args:
+			entries: Entries with 'timestamp', 'user_id' and 'event' keys and
+				optional 'resource_type', 'resource_id' and 'action' keys
+
+		Returns:
+			Number of inserted entries
+
+		Raises:
+			duckdb.Error: If the insert fails; no entry of the batch is stored
+		"""
+		if not entries:
+			return 0
+		placeholders = ', '.join(['(?, ?, ?, ?, ?, ?)'] * len(entries))
+		params = []
+		for entry in entries:
+			params.extend([
+				entry['timestamp'], entry['user_id'], entry['event'],
+				entry.get('resource_type'), entry.get('resource_id'), entry.get('action'),
+			])
+		with self._get_connection() as conn:
+			conn.execute(f'INSERT INTO AUDITLOG ({AUDIT_COLUMNS}) VALUES {placeholders}', params)
 			conn.commit()
-			logger.info(f'Audit entry created: {user_id} {event}')
-			return {
-				'timestamp': timestamp,
-				'user_id': user_id,
-				'event': event,
-			}
-		except Exception as e:
-			logger.error(f'Error creating audit entry: {e}')
-			return None
-		finally:
-			conn.close()
+		logger.debug(f'Inserted {len(entries)} audit entries')
+		return len(entries)
 
 	def create_event(self, user_id: str, event: str) -> Optional[Dict[str, Any]]:
 		"""Insert a raw audit event in AUDITLOG table"""
 		return self.create_audit_entry(user_id=user_id, event=event)
 
+	def _archived_days(self, conn, column_filter: str, params: list) -> Set[date]:
+		"""Archived days holding entries that match a filter on AUDIT_ARCHIVE_KEYS columns"""
+		rows = conn.execute(f'SELECT DISTINCT day FROM AUDIT_ARCHIVE_KEYS WHERE {column_filter}', params).fetchall()
+		return {row[0] for row in rows}
+
 	def get_audit_logs(
 		self,
 		skip: int = 0,
@@ -92,86 +176,143 @@ class AuditQueries:
 		user_id: Optional[str] = None,
 		resource_type: Optional[str] = None,
 		start_date: Optional[datetime] = None,
-		end_date: Optional[datetime] = None
+		end_date: Optional[datetime] = None,
+		after: Optional[Tuple[datetime, int]] = None,
+		total_mode: str = 'exact',
 	) -> Dict[str, Any]:
-		"""Query audit logs with optional filters
+		"""Query audit logs with optional filters, newest first
 		
 		Args:
 			skip: Number of entries to skip (pagination)
 			limit: Maximum number of entries to return
 			user_id: Filter by user ID (optional)
-			resource_type: Filter by resource type (optional)
+			resource_type: Filter by resource type, e.g. 'glider' (optional)
 			start_date: Filter entries after this date (optional)
 			end_date: Filter entries before this date (optional)
+			after: Keyset cursor from decode_audit_cursor: return entries older than it (optional)
+			total_mode: 'exact', 'estimated' or 'none' (see _count)
+			
+		With start_date or end_date, the archived partitions falling in the
+		range are read along with AUDITLOG; listings without dates only read
+		AUDITLOG.
 			
 		Returns:
-			Dictionary with total count and list of audit entries
+			Dictionary with total count, next page cursor and list of audit entries
 		"""
-		conn = self._get_connection()
-		try:
-			where_clauses = []
-			params = []
-			
-			if user_id:
-				where_clauses.append('username = ?')
-				params.append(user_id)
-			
-			if resource_type:
-				where_clauses.append('event ILIKE ?')
-				params.append(f'%{resource_type}%')
+		source = self._source(start_date, end_date) if start_date or end_date else 'AUDITLOG'
+		with self._get_connection(read_only=True) as conn:
+			try:
+				where_clauses = []
+				params = []
 			
-			if start_date:
-				where_clauses.append('timestamp >= ?')
-				params.append(start_date)
+				if user_id:
+					where_clauses.append('username = ?')
+					params.append(user_id)
 			
-			if end_date:
-				where_clauses.append('timestamp <= ?')
-				params.append(end_date)
+				if resource_type:
+					where_clauses.append('resource_type = ?')
+					params.append(resource_type.lower())
 			
-			where_clause = 'WHERE ' + ' AND '.join(where_clauses) if where_clauses else ''
+				if start_date:
+					where_clauses.append('timestamp >= ?')
+					params.append(start_date)
 			
-			total_result = conn.execute(
-				f'SELECT COUNT(*) FROM AUDITLOG {where_clause}',
-				params
-			).fetchall()
+				if end_date:
+					where_clauses.append('timestamp <= ?')
+					params.append(end_date)
 			
-			total = total_result[0][0] if total_result else 0
-			
-			results = conn.execute(
-				f'''SELECT timestamp, username, event
-				   FROM AUDITLOG {where_clause}
-				   ORDER BY timestamp DESC
-				   LIMIT ? OFFSET ?''',
-				params + [limit, skip]
-			).fetchall()
-
-			entries = []
-			for row in results:
-				timestamp, username, event = row
-
-				entries.append({
-					'timestamp': timestamp,
-					'user_id': username,
-					'event': event or ''
-				})
-
-			logger.debug(f'Retrieved {len(entries)} audit entries from AUDITLOG (total: {total})')
-			return {
-				'total': total,
-				'skip': skip,
-				'limit': limit,
-				'items': entries
-			}
-		except Exception as e:
-			logger.error(f'Error fetching audit logs: {e}')
-			return {
-				'total': 0,
-				'skip': skip,
-				'limit': limit,
-				'items': []
-			}
-		finally:
-			conn.close()
+				page = self._page(conn, where_clauses, params, skip, limit, after, total_mode, source)
+				logger.debug(f'Retrieved {len(page["items"])} audit entries from AUDITLOG (total: {page["total"]})')
+				return page
+			except Exception as e:
+				logger.error(f'Error fetching audit logs: {e}')
+				return _empty_page(skip, limit)
+
+	def _count(
+		self,
+		conn,
+		where_clauses: List[str],
+		params: list,
+		total_mode: str,
+		source: str = 'AUDITLOG',
+	) -> Tuple[Optional[int], bool]:
+		"""Count the entries matching a filter
+		
+		'exact' runs COUNT(*) over every matching row. 'estimated' reads the
+		table's row estimate when there is no filter and otherwise counts at
+		most AUDIT_COUNT_CAP matching rows. 'none' skips counting.
+		
+		Returns:
+			(total, whether the total is exact); total is None for 'none'
+		"""
+		if total_mode == 'none':
+			return None, False
+		where_clause = 'WHERE ' + ' AND '.join(where_clauses) if where_clauses else ''
+		if total_mode == 'estimated':
+			if not where_clauses and source == 'AUDITLOG':
+				row = conn.execute(
+					"SELECT estimated_size FROM duckdb_tables() WHERE table_name = 'AUDITLOG'"
+				).fetchone()
+				return (row[0] if row else 0), False
+			cap = settings.AUDIT_COUNT_CAP
+			total = conn.execute(
+				f'SELECT COUNT(*) FROM (SELECT 1 FROM {source} {where_clause} LIMIT ?)',
+				params + [cap]
+			).fetchone()[0]
+			return total, total < cap
+		total = conn.execute(f'SELECT COUNT(*) FROM {source} {where_clause}', params).fetchone()[0]
+		return total, True
+
+	def _page(
+		self,
+		conn,
+		where_clauses: List[str],
+		params: list,
+		skip: int,
+		limit: int,
+		after: Optional[Tuple[datetime, int]],
+		total_mode: str,
+		source: str = 'AUDITLOG',
+	) -> Dict[str, Any]:
+		"""Fetch one page of entries from source ordered by (timestamp, id) descending"""
+		total, total_exact = self._count(conn, where_clauses, params, total_mode, source)
+
+		page_clauses = list(where_clauses)
+		page_params = list(params)
+		if after is not None:
+			page_clauses.append('(timestamp < ? OR (timestamp = ? AND id < ?))')
+			page_params.extend([after[0], after[0], after[1]])
+		where_clause = 'WHERE ' + ' AND '.join(page_clauses) if page_clauses else ''
+
+		results = conn.execute(
+			f'''SELECT id, timestamp, username, event
+			   FROM {source} {where_clause}
+			   ORDER BY timestamp DESC, id DESC
+			   LIMIT ? OFFSET ?''',
+			page_params + [limit, skip]
+		).fetchall()
+
+		entries = []
+		for row in results:
+			entry_id, timestamp, username, event = row
+			entries.append({
+				'timestamp': timestamp,
+				'user_id': username,
+				'event': event or ''
+			})
+
+		next_cursor = None
+		if len(results) == limit:
+			next_cursor = encode_audit_cursor(results[-1][1], results[-1][0])
+
+		return {
+			'total': total,
+			'total_exact': total_exact,
+			'skip': skip,
+			'limit': limit,
+			'next_cursor': next_cursor,
+			'items': entries
+		}
 
 	def get_audit_logs_by_resource(
 		self,
@@ -180,101 +321,128 @@ class AuditQueries:
 	) -> List[Dict[str, Any]]:
 		"""Get complete history of changes for a specific resource
 		
+		The AUDITLOG lookup goes through the resource_id index, so its cost
+		depends on the history of the resource, not on the size of the audit
+		log. Archived entries of the resource are included, read from the
+		partitions that AUDIT_ARCHIVE_KEYS lists for it only.
+		
 		Args:
-			resource_type: Type of resource
+			resource_type: Type of resource ('glider', 'user', ...)
 			resource_id: ID of the resource
 			
 		Returns:
 			List of audit entries for this resource
 		"""
-		conn = self._get_connection()
-		try:
-			results = conn.execute(
-				'''SELECT timestamp, username, event
-				   FROM AUDITLOG
-				   WHERE event ILIKE ?
-				   ORDER BY timestamp DESC''',
-				[f'%{resource_type}/{resource_id}%']
-			).fetchall()
+		with self._get_connection(read_only=True) as conn:
+			try:
+				days = self._archived_days(conn, 'resource_id = ? AND resource_type = ?', [resource_id, resource_type.lower()])
+				source = self._source(days=days) if days else 'AUDITLOG'
+				results = conn.execute(
+					f'''SELECT timestamp, username, event
+					   FROM {source}
+					   WHERE resource_id = ? AND resource_type = ?
+					   ORDER BY timestamp DESC, id DESC''',
+					[resource_id, resource_type.lower()]
+				).fetchall()
 			
-			entries = []
-			for row in results:
-				timestamp, username, event = row
-				entries.append({
-					'timestamp': timestamp,
-					'user_id': username,
-					'event': event or ''
-				})
+				entries = []
+				for row in results:
+					timestamp, username, event = row
+					entries.append({
+						'timestamp': timestamp,
+						'user_id': username,
+						'event': event or ''
+					})
 			
-			logger.debug(f'Retrieved {len(entries)} audit entries for {resource_type}/{resource_id}')
-			return entries
-		except Exception as e:
-			logger.error(f'Error fetching audit logs for resource: {e}')
-			return []
-		finally:
-			conn.close()
+				logger.debug(f'Retrieved {len(entries)} audit entries for {resource_type}/{resource_id}')
+				return entries
+			except Exception as e:
+				logger.error(f'Error fetching audit logs for resource: {e}')
+				return []
 
 	def get_user_actions(
 		self,
 		user_id: str,
 		skip: int = 0,
-		limit: int = 100
+		limit: int = 100,
+		after: Optional[Tuple[datetime, int]] = None,
+		total_mode: str = 'exact',
 	) -> Dict[str, Any]:
-		"""Get all actions performed by a specific user
+		"""Get all actions performed by a specific user, newest first, archived ones included
+		
+		Only the archived partitions that AUDIT_ARCHIVE_KEYS lists for the
+		user, and that are not newer than the cursor, are read.
 		
 		Args:
 			user_id: User ID to get actions for
 			skip: Number of entries to skip (pagination)
 			limit: Maximum number of entries to return
+			after: Keyset cursor from decode_audit_cursor: return entries older than it (optional)
+			total_mode: 'exact', 'estimated' or 'none' (see _count)
 			
 		Returns:
-			Dictionary with total count and list of audit entries
+			Dictionary with total count, next page cursor and list of audit entries
 		"""
-		conn = self._get_connection()
-		try:
-			total_result = conn.execute(
-				'SELECT COUNT(*) FROM AUDITLOG WHERE username = ?',
-				[user_id]
-			).fetchall()
-			
-			total = total_result[0][0] if total_result else 0
-			
-			results = conn.execute(
-				'''SELECT timestamp, username, event
-				   FROM AUDITLOG
-				   WHERE username = ?
-				   ORDER BY timestamp DESC
-				   LIMIT ? OFFSET ?''',
-				[user_id, limit, skip]
-			).fetchall()
-			
-			entries = []
-			for row in results:
-				timestamp, username, event = row
-				entries.append({
-					'timestamp': timestamp,
-					'user_id': username,
-					'event': event or ''
-				})
-			
-			logger.debug(f'Retrieved {len(entries)} actions for user {user_id} (total: {total})')
+		with self._get_connection(read_only=True) as conn:
+			try:
+				days = self._archived_days(conn, 'username = ?', [user_id])
+				if after is not None:
+					days = {day for day in days if day <= _utc_date(after[0])}
+				source = self._source(days=days) if days else 'AUDITLOG'
+				page = self._page(conn, ['username = ?'], [user_id], skip, limit, after, total_mode, source)
+				logger.debug(f'Retrieved {len(page["items"])} actions for user {user_id} (total: {page["total"]})')
+				return page
+			except Exception as e:
+				logger.error(f'Error fetching user actions: {e}')
+				return _empty_page(skip, limit)
+
+	def archive_audit_logs_older_than(self, days: int) -> int:
+		"""Move audit logs older than a number of days to the Parquet archive
+		
+		Entries stamped before midnight (UTC) ``days`` days ago are written
+		to one partition per day and deleted from AUDITLOG in the same
+		transaction; get_audit_logs still returns them for date ranges
+		reaching back to their day, and the resource history and user
+		actions always include them.
+		
+		Args:
+			days: Number of days to keep in AUDITLOG
 			
-			return {
-				'total': total,
-				'skip': skip,
-				'limit': limit,
-				'items': entries
-			}
-		except Exception as e:
-			logger.error(f'Error fetching user actions: {e}')
-			return {
-				'total': 0,
-				'skip': skip,
-				'limit': limit,
-				'items': []
-			}
-		finally:
-			conn.close()
+		Returns:
+			Number of archived entries
+		"""
+		cutoff = datetime.combine(datetime.now(timezone.utc).date() - timedelta(days=days), time())
+		with archive_lock, self._get_connection() as conn:
+			staging_dir = None
+			try:
+				self.archive.recover(conn)
+				conn.begin()
+				archived_count = conn.execute('SELECT COUNT(*) FROM AUDITLOG WHERE timestamp < ?', [cutoff]).fetchone()[0]
+				if archived_count:
+					conn.execute(
+						'''INSERT INTO AUDIT_ARCHIVE_KEYS
+						   SELECT DISTINCT CAST(timestamp AS DATE), username, resource_type, resource_id
+						   FROM AUDITLOG WHERE timestamp < ?''',
+						[cutoff]
+					)
+					staging_dir = self.archive.new_staging_dir()
+					conn.execute(self.archive.copy_sql(
+						f"SELECT {ARCHIVE_COLUMNS}, CAST(timestamp AS DATE) AS day FROM AUDITLOG "
+						f"WHERE timestamp < TIMESTAMP '{cutoff.isoformat(sep=' ')}'",
+						staging_dir,
+					))
+					conn.execute('DELETE FROM AUDITLOG WHERE timestamp < ?', [cutoff])
+				conn.commit()
+			except Exception as e:
+				logger.error(f'Error archiving audit logs: {e}')
+				conn.rollback()
+				if staging_dir:
+					self.archive.discard(staging_dir)
+				return 0
+			if staging_dir:
+				self.archive.publish(staging_dir)
+			logger.info(f'Archived {archived_count} audit log entries older than {days} days to {self.archive.directory}')
+			return archived_count
 
 	def delete_audit_logs_older_than(self, days: int) -> int:
 		"""Delete audit logs older than specified number of days
@@ -285,23 +453,21 @@ class AuditQueries:
 		Returns:
 			Number of deleted entries
 		"""
-		conn = self._get_connection()
-		try:
-			conn.execute(
-				'''DELETE FROM AUDITLOG
-				   WHERE timestamp < (CURRENT_TIMESTAMP - INTERVAL ? DAY)''',
-				[days]
-			)
-			conn.commit()
-			changes_result = conn.execute('SELECT changes()').fetchone()
-			deleted_count = int(changes_result[0]) if changes_result else 0
-			logger.info(f'Deleted {deleted_count} audit log entries older than {days} days')
-			return deleted_count
-		except Exception as e:
-			logger.error(f'Error deleting old audit logs: {e}')
-			return 0
-		finally:
-			conn.close()
+		with self._get_connection() as conn:
+			try:
+				conn.execute(
+					'''DELETE FROM AUDITLOG
+					   WHERE timestamp < (CURRENT_TIMESTAMP - INTERVAL ? DAY)''',
+					[days]
+				)
+				conn.commit()
+				changes_result = conn.execute('SELECT changes()').fetchone()
+				deleted_count = int(changes_result[0]) if changes_result else 0
+				logger.info(f'Deleted {deleted_count} audit log entries older than {days} days')
+				return deleted_count
+			except Exception as e:
+				logger.error(f'Error deleting old audit logs: {e}')
+				return 0
 
 	def delete_all_audit_logs(self) -> int:
 		"""Delete all audit log entries
@@ -309,16 +475,20 @@ class AuditQueries:
 		Returns:
 			Number of deleted entries
 		"""
-		conn = self._get_connection()
-		try:
-			before_result = conn.execute('SELECT COUNT(*) FROM AUDITLOG').fetchall()
-			before_count = before_result[0][0] if before_result else 0
-			conn.execute('DELETE FROM AUDITLOG')
-			conn.commit()
-			logger.info(f'Deleted all audit log entries ({before_count})')
-			return before_count
-		except Exception as e:
-			logger.error(f'Error deleting all audit logs: {e}')
-			return 0
-		finally:
-			conn.close()
+		with self._get_connection() as conn:
+			try:
+				before_result = conn.execute('SELECT COUNT(*) FROM AUDITLOG').fetchall()
+				before_count = before_result[0][0] if before_result else 0
+				conn.execute('DELETE FROM AUDITLOG')
+				conn.commit()
+				logger.info(f'Deleted all audit log entries ({before_count})')
+				return before_count
+			except Exception as e:
+				logger.error(f'Error deleting all audit logs: {e}')
+				return 0
+
+
+@lru_cache()
+def get_audit_queries() -> AuditQueries:
+	"""Get the shared AuditQueries instance (FastAPI dependency)"""
+	return AuditQueries()
@@ -0,0 +1,299 @@
+"""Background writer batching audit log entries off the request path"""
+
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.config import get_settings
+from backend.db.audit_queries import get_audit_queries
+from backend.executors import db_executor
+
+logger = logging.getLogger(__name__)
+
+QUEUE_FULL_POLICIES = ('block', 'drop')
+
+
+class AuditWriter:
+	"""Queue audit entries and insert them in batches from a worker thread
+
+	``record`` stamps an entry and enqueues it without touching the
+	database. The worker thread inserts queued entries with one multi-row
+	INSERT once ``batch_size`` entries are waiting or ``flush_interval``
+	seconds after the first one arrived. When the queue is full, the
+	``block`` policy makes callers wait up to ``block_timeout`` seconds for
+	room and the ``drop`` policy discards the entry; either way dropped
+	entries are counted in ``stats``.
+	"""
+
+	def __init__(
+		self,
+		max_queue: int,
+		batch_size: int,
+		flush_interval: float,
+		queue_full_policy: str = 'block',
+		block_timeout: float = 5.0,
+		writer: Optional[Callable[[List[Dict[str, Any]]], int]] = None,
+	):
+		"""Create a writer (the worker thread starts on first use)
+
+		Args:
+			max_queue: Maximum number of entries waiting to be written
+			batch_size: Maximum number of entries per INSERT
+			flush_interval: Seconds an entry may wait for its batch to fill
+			queue_full_policy: 'block' or 'drop'
+			block_timeout: Seconds 'block' waits for room before dropping
+			writer: Function inserting a batch (defaults to AuditQueries.create_audit_entries)
+		"""
+		if queue_full_policy not in QUEUE_FULL_POLICIES:
+			raise ValueError(f'queue_full_policy must be one of {QUEUE_FULL_POLICIES}')
+		self.batch_size = batch_size
+		self.flush_interval = flush_interval
+		self.queue_full_policy = queue_full_policy
+		self.block_timeout = block_timeout
+		self._writer = writer
+		self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+		self._lock = threading.Lock()
+		self._idle = threading.Condition(self._lock)
+		self._thread: Optional[threading.Thread] = None
+		self._stopping = threading.Event()
+		self._last_timestamp: Optional[datetime] = None
+		self._pending = 0
+		self._peak_queued = 0
+		self._submitted = 0
+		self._written = 0
+		self._dropped = 0
+		self._failed = 0
+		self._batches = 0
+		self._flush_time_total = 0.0
+
+	def _ensure_started(self) -> None:
+		with self._lock:
+			if self._thread is None or not self._thread.is_alive():
+				self._stopping.clear()
+				self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+				self._thread.start()
+
+	def _timestamp(self) -> datetime:
+		"""Return a UTC timestamp strictly later than the previous one
+
+		Entries stamped in the same microsecond are moved apart so that
+		timestamps keep the order entries were submitted in.
+		"""
+		timestamp = datetime.now(timezone.utc).replace(tzinfo=None)
+		if self._last_timestamp is not None and timestamp <= self._last_timestamp:
+			timestamp = self._last_timestamp + timedelta(microseconds=1)
+		self._last_timestamp = timestamp
+		return timestamp
+
+	def submit(
+		self,
+		user_id: str,
+		event: str,
+		resource_type: Optional[str] = None,
+		resource_id: Optional[str] = None,
+		action: Optional[str] = None,
+	) -> Optional[Dict[str, Any]]:
+		"""Stamp and enqueue an audit entry, blocking if the policy asks for it
+
+		Args:
+			user_id: User ID who performed the action
+			event: Audit event text
+			resource_type: Type of the resource acted on ('glider', 'user', ...)
+			resource_id: ID of the resource acted on
+			action: What was done ('create', 'update', 'delete', ...)
+
+		Returns:
+			The queued entry, or None if it was dropped because the queue is full
+		"""
+		entry = self._new_entry(user_id, event, resource_type, resource_id, action)
+		return self._put(entry, self.block_timeout if self.queue_full_policy == 'block' else None)
+
+	def _new_entry(
+		self,
+		user_id: str,
+		event: str,
+		resource_type: Optional[str],
+		resource_id: Optional[str],
+		action: Optional[str],
+	) -> Dict[str, Any]:
+		"""Stamp an entry and count it as pending"""
+		self._ensure_started()
+		with self._lock:
+			self._submitted += 1
+			self._pending += 1
+			return {
+				'timestamp': self._timestamp(),
+				'user_id': user_id,
+				'event': event,
+				'resource_type': resource_type,
+				'resource_id': resource_id,
+				'action': action,
+			}
+
+	def _put(self, entry: Dict[str, Any], timeout: Optional[float]) -> Optional[Dict[str, Any]]:
+		"""Enqueue a stamped entry, waiting up to ``timeout`` seconds for room (None: not at all)
+
+		Returns:
+			The entry, or None if it was dropped because the queue is full
+		"""
+		try:
+			if timeout is None:
+				self._queue.put_nowait(entry)
+			else:
+				self._queue.put(entry, timeout=timeout)
+		except queue.Full:
+			with self._lock:
+				self._dropped += 1
+				self._pending -= 1
+				self._idle.notify_all()
+			logger.warning(f'Audit queue full, dropped entry: {entry["user_id"]} {entry["event"]}')
+			return None
+		with self._lock:
+			self._peak_queued = max(self._peak_queued, self._queue.qsize())
+		return entry
+
+	async def record(
+		self,
+		user_id: str,
+		event: str,
+		resource_type: Optional[str] = None,
+		resource_id: Optional[str] = None,
+		action: Optional[str] = None,
+	) -> Optional[Dict[str, Any]]:
+		"""Enqueue an audit entry from a route handler (arguments as for ``submit``)
+
+		The entry is offered to the queue without waiting. If the queue is
+		full, the 'drop' policy drops it, and the 'block' policy waits for
+		room on a database worker, so the event loop is never blocked.
+
+		Returns:
+			The queued entry, or None if it was dropped because the queue is full
+		"""
+		entry = self._new_entry(user_id, event, resource_type, resource_id, action)
+		if self.queue_full_policy == 'block':
+			try:
+				self._queue.put_nowait(entry)
+			except queue.Full:
+				return await db_executor.run(self._put, entry, self.block_timeout)
+			with self._lock:
+				self._peak_queued = max(self._peak_queued, self._queue.qsize())
+			return entry
+		return self._put(entry, None)
+
+	def _next_batch(self) -> List[Dict[str, Any]]:
+		"""Wait for entries and return up to ``batch_size`` of them"""
+		batch = []
+		deadline = None
+		while len(batch) < self.batch_size:
+			if self._stopping.is_set():
+				timeout = 0.0
+			elif deadline is None:
+				timeout = self.flush_interval
+			else:
+				timeout = deadline - time.monotonic()
+			try:
+				entry = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+			except queue.Empty:
+				break
+			if entry is None:
+				if batch or self._stopping.is_set():
+					break
+				continue
+			batch.append(entry)
+			if deadline is None:
+				deadline = time.monotonic() + self.flush_interval
+		return batch
+
+	def _write(self, batch: List[Dict[str, Any]]) -> None:
+		writer = self._writer or get_audit_queries().create_audit_entries
+		started_at = time.perf_counter()
+		written = 0
+		try:
+			written = writer(batch)
+		except Exception as e:
+			logger.error(f'Error writing batch of {len(batch)} audit entries: {e}')
+		with self._lock:
+			self._batches += 1
+			self._written += written
+			self._failed += len(batch) - written
+			self._pending -= len(batch)
+			self._flush_time_total += time.perf_counter() - started_at
+			self._idle.notify_all()
+
+	def _run(self) -> None:
+		while True:
+			batch = self._next_batch()
+			if batch:
+				self._write(batch)
+			elif self._stopping.is_set() and self._queue.empty():
+				return
+
+	def _wake(self) -> None:
+		try:
+			self._queue.put_nowait(None)
+		except queue.Full:
+			pass
+
+	def flush(self, timeout: Optional[float] = None) -> bool:
+		"""Write every queued entry now
+
+		Args:
+			timeout: Seconds to wait for the worker (None waits indefinitely)
+
+		Returns:
+			False if entries were still pending when the timeout expired
+		"""
+		with self._lock:
+			if self._pending == 0:
+				return True
+		self._ensure_started()
+		self._wake()
+		with self._lock:
+			return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+	def shutdown(self, timeout: Optional[float] = None) -> None:
+		"""Flush queued entries and stop the worker thread"""
+		with self._lock:
+			thread = self._thread
+		if thread is None:
+			return
+		self._stopping.set()
+		self._wake()
+		thread.join(timeout)
+		if thread.is_alive():
+			logger.warning(f'Audit writer did not stop within {timeout}s, {self._pending} entries pending')
+		with self._lock:
+			self._thread = None
+
+	def stats(self) -> Dict[str, Any]:
+		"""Return queue depth and write counters"""
+		with self._lock:
+			return {
+				'queue_full_policy': self.queue_full_policy,
+				'batch_size': self.batch_size,
+				'flush_interval_seconds': self.flush_interval,
+				'max_queue': self._queue.maxsize,
+				'queued': self._pending,
+				'peak_queued': self._peak_queued,
+				'submitted': self._submitted,
+				'written': self._written,
+				'dropped': self._dropped,
+				'failed': self._failed,
+				'batches': self._batches,
+				'batch_size_avg': round((self._written + self._failed) / self._batches, 2) if self._batches else 0.0,
+				'flush_time_avg_ms': round(self._flush_time_total * 1000 / self._batches, 3) if self._batches else 0.0,
+			}
+
+
+settings = get_settings()
+
+audit_writer = AuditWriter(
+	max_queue=settings.AUDIT_QUEUE_SIZE,
+	batch_size=settings.AUDIT_BATCH_SIZE,
+	flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+	queue_full_policy=settings.AUDIT_QUEUE_FULL_POLICY,
+	block_timeout=settings.AUDIT_BLOCK_TIMEOUT,
+)
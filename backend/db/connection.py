@@ -0,0 +1,238 @@
+"""Process-wide DuckDB connection pool shared by all query modules"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import duckdb
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(RuntimeError):
+	"""Raised when no cursor could be checked out before the pool timeout"""
+
+
+class ConnectionPool:
+	"""Hold one DuckDB database instance and hand out per-request cursors
+
+	DuckDB cursors are lightweight connections to an already opened database
+	instance, so the expensive part (opening the file and loading its catalog)
+	is paid once per process. The number of cursors checked out at the same
+	time is bounded by ``max_cursors``.
+	"""
+
+	def __init__(self, db_path: str, max_cursors: int = 10, timeout: float = 30.0):
+		"""Create a pool for a database file (the database is opened lazily)
+
+		Args:
+			db_path: Path to the DuckDB database file
+			max_cursors: Maximum number of cursors checked out concurrently
+			timeout: Seconds to wait for a free cursor before giving up
+		"""
+		self.db_path = db_path
+		self.max_cursors = max_cursors
+		self.timeout = timeout
+		self._connection: Optional[duckdb.DuckDBPyConnection] = None
+		self._lock = threading.Lock()
+		self._slots = threading.BoundedSemaphore(max_cursors)
+		self._gate = threading.Lock()
+		self._checkouts = 0
+		self._read_only_checkouts = 0
+		self._read_write_checkouts = 0
+		self._timeouts = 0
+		self._open_cursors = 0
+		self._peak_open_cursors = 0
+		self._wait_time_total = 0.0
+		self._wait_time_max = 0.0
+
+	@property
+	def is_open(self) -> bool:
+		"""True when the underlying database instance is open"""
+		return self._connection is not None
+
+	def open(self) -> None:
+		"""Open the database instance if it is not already open"""
+		with self._lock:
+			if self._connection is None:
+				self._connection = duckdb.connect(self.db_path)
+				logger.info(f'Connection pool opened on {self.db_path} (max cursors: {self.max_cursors})')
+
+	def close(self) -> None:
+		"""Close the database instance, invalidating every outstanding cursor"""
+		with self._lock:
+			if self._connection is not None:
+				self._connection.close()
+				self._connection = None
+				logger.info(f'Connection pool closed on {self.db_path}')
+
+	def _new_cursor(self) -> duckdb.DuckDBPyConnection:
+		with self._lock:
+			if self._connection is None:
+				self._connection = duckdb.connect(self.db_path)
+				logger.info(f'Connection pool opened on {self.db_path} (max cursors: {self.max_cursors})')
+			return self._connection.cursor()
+
+	def _acquire_slot(self, timeout: float) -> bool:
+		"""Take a cursor slot, waiting behind a running ``quiesce`` if needed"""
+		deadline = time.monotonic() + timeout
+		if not self._gate.acquire(timeout=timeout):
+			return False
+		try:
+			return self._slots.acquire(timeout=max(0.0, deadline - time.monotonic()))
+		finally:
+			self._gate.release()
+
+	@contextmanager
+	def cursor(self, read_only: bool = False) -> Iterator[duckdb.DuckDBPyConnection]:
+		"""Check out a cursor for the duration of a ``with`` block
+
+		Read-only cursors run inside a ``READ ONLY`` transaction, so any write
+		attempt fails instead of silently modifying the database. Read-write
+		cursors run in autocommit mode unless the caller opens a transaction.
+
+		Args:
+			read_only: Whether the cursor should reject writes
+
+		Yields:
+			A DuckDB cursor, closed when the block exits
+		"""
+		started = time.perf_counter()
+		if not self._acquire_slot(self.timeout):
+			with self._lock:
+				self._timeouts += 1
+			raise PoolTimeoutError(f'No database cursor available after {self.timeout}s')
+		waited = time.perf_counter() - started
+
+		try:
+			cursor = self._new_cursor()
+		except Exception:
+			self._slots.release()
+			raise
+
+		with self._lock:
+			self._checkouts += 1
+			if read_only:
+				self._read_only_checkouts += 1
+			else:
+				self._read_write_checkouts += 1
+			self._wait_time_total += waited
+			self._wait_time_max = max(self._wait_time_max, waited)
+			self._open_cursors += 1
+			self._peak_open_cursors = max(self._peak_open_cursors, self._open_cursors)
+
+		try:
+			if read_only:
+				cursor.execute('BEGIN TRANSACTION READ ONLY')
+			yield cursor
+		finally:
+			try:
+				cursor.close()
+			except duckdb.Error as e:
+				logger.debug(f'Error closing pooled cursor: {e}')
+			with self._lock:
+				self._open_cursors -= 1
+			self._slots.release()
+
+	@contextmanager
+	def quiesce(self, timeout: Optional[float] = None) -> Iterator[None]:
+		"""Close the database for the duration of a ``with`` block
+
+		New checkouts are held back, cursors already checked out are waited
+		for, then the database instance is closed so its file can be replaced.
+		It is reopened when the block exits and the held back checkouts
+		proceed.
+
+		Args:
+			timeout: Seconds to wait for checked out cursors (defaults to the pool timeout)
+
+		Raises:
+			PoolTimeoutError: If cursors were still checked out after the timeout
+		"""
+		timeout = self.timeout if timeout is None else timeout
+		deadline = time.monotonic() + timeout
+		acquired = 0
+		if not self._gate.acquire(timeout=timeout):
+			raise PoolTimeoutError(f'Could not quiesce the connection pool within {timeout}s')
+		try:
+			while acquired < self.max_cursors:
+				if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+					raise PoolTimeoutError(f'Database cursors still checked out after {timeout}s')
+				acquired += 1
+		except BaseException:
+			for _ in range(acquired):
+				self._slots.release()
+			raise
+		finally:
+			self._gate.release()
+
+		try:
+			self.close()
+			yield
+		finally:
+			try:
+				self.open()
+			finally:
+				for _ in range(acquired):
+					self._slots.release()
+
+	def stats(self) -> Dict[str, Any]:
+		"""Return checkout and wait statistics used to size the pool"""
+		with self._lock:
+			checkouts = self._checkouts
+			return {
+				'db_path': self.db_path,
+				'open': self._connection is not None,
+				'max_cursors': self.max_cursors,
+				'open_cursors': self._open_cursors,
+				'peak_open_cursors': self._peak_open_cursors,
+				'checkouts': checkouts,
+				'read_only_checkouts': self._read_only_checkouts,
+				'read_write_checkouts': self._read_write_checkouts,
+				'timeouts': self._timeouts,
+				'wait_time_total_ms': round(self._wait_time_total * 1000, 3),
+				'wait_time_avg_ms': round(self._wait_time_total * 1000 / checkouts, 3) if checkouts else 0.0,
+				'wait_time_max_ms': round(self._wait_time_max * 1000, 3),
+			}
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: Optional[str] = None) -> ConnectionPool:
+	"""Get the process-wide pool for a database (settings.DB_NAME by default)
+
+	Args:
+		db_path: Path to DuckDB database (uses settings.DB_NAME if not provided)
+
+	Returns:
+		The shared ConnectionPool for this database file
+	"""
+	settings = get_settings()
+	path = db_path or settings.DB_NAME
+	with _pools_lock:
+		pool = _pools.get(path)
+		if pool is None:
+			pool = ConnectionPool(path, max_cursors=settings.DB_POOL_SIZE, timeout=settings.DB_POOL_TIMEOUT)
+			_pools[path] = pool
+		return pool
+
+
+def open_connection_pool(db_path: Optional[str] = None) -> ConnectionPool:
+	"""Open the process-wide pool eagerly (called from the application lifespan)"""
+	pool = get_connection_pool(db_path)
+	pool.open()
+	return pool
+
+
+def close_connection_pools() -> None:
+	"""Close every pool opened by this process"""
+	with _pools_lock:
+		pools = list(_pools.values())
+	for pool in pools:
+		pool.close()
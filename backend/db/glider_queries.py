@@ -2,22 +2,35 @@
 
 import logging
 import math
-from typing import Dict, List, Optional, Sequence
-
-import duckdb
+from dataclasses import astuple, fields
+from typing import Dict, List, Optional, Sequence, Tuple
 
+from backend.cache import VersionedLRUCache
 from backend.config import get_settings
-from backend.models.glider import Arms, Glider, Instrument, Limits, Weighing
+from backend.db.connection import get_connection_pool
+from backend.models.glider import Arms, Glider, GliderSummary, Instrument, Limits, Weighing
+from backend.services.pdf_cache import weighing_pdf_cache
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Hydrated Glider aggregates keyed by registration, invalidated by every mutation below
+glider_cache = VersionedLRUCache(
+	'gliders',
+	max_entries=settings.GLIDER_CACHE_SIZE,
+	ttl=settings.GLIDER_CACHE_TTL,
+)
+
+
+def _invalidate(registration: str) -> None:
+	"""Drop the cached aggregate and rendered weighing sheets of a changed glider."""
+	glider_cache.invalidate(registration)
+	weighing_pdf_cache.invalidate_glider(registration)
 
 
 def _get_database_connection(read_only: bool = False):
-	"""Get DuckDB connection with proper configuration."""
-	settings = get_settings()
-	if read_only:
-		return duckdb.connect(settings.DB_NAME, config={'access_mode': 'READ_ONLY'})
-	return duckdb.connect(settings.DB_NAME)
+	"""Check out a pooled DuckDB cursor, to be used as a context manager."""
+	return get_connection_pool().cursor(read_only=read_only)
 
 
 def _normalize_serial_number(value) -> Optional[int]:
@@ -77,309 +90,545 @@ def _glider_values(glider: Glider) -> List:
 	]
 
 
-def _build_glider_from_row(conn, row: Sequence) -> Glider:
+def _build_glider_from_row(row: Sequence) -> Glider:
 	main_values = list(row[:10])
 	main_values[3] = _normalize_serial_number(main_values[3])
 
 	glider = Glider(*main_values)
 	glider.limits = Limits(*[_normalize_required_float(value) for value in row[10:17]])
 	glider.arms = Arms(*[_normalize_required_float(value) for value in row[17:25]])
+	return glider
+
+
+def _load_gliders(conn, rows: Sequence[Sequence]) -> Dict[str, Glider]:
+	"""Hydrate GLIDER rows with their child rows using one query per child table."""
+	gliders = {row[1]: _build_glider_from_row(row) for row in rows}
+	if not gliders:
+		return gliders
+	registrations = list(gliders)
 
-	registration = row[1]
 	points = conn.execute(
-		'''SELECT center_of_gravity, weight
+		'''SELECT registration, center_of_gravity, weight
 		FROM WB_LIMIT
-		WHERE registration = ?
-		ORDER BY point_index''',
-		[registration],
+		WHERE registration = ANY(?)
+		ORDER BY registration, point_index''',
+		[registrations],
 	).fetchall()
-	glider.weight_and_balances = [
-		(int(point[0]), _normalize_required_float(point[1]))
-		for point in points
-	]
+	for point in points:
+		gliders[point[0]].weight_and_balances.append(
+			(int(point[1]), _normalize_required_float(point[2]))
+		)
 
 	weighing_rows = conn.execute(
-		'''SELECT id, date, p1, p2, right_wing_weight, left_wing_weight, tail_weight,
+		'''SELECT registration, id, date, p1, p2, right_wing_weight, left_wing_weight, tail_weight,
 		fuselage_weight, fix_ballast_weight, A, D
 		FROM WEIGHING
-		WHERE registration = ?''',
-		[registration],
+		WHERE registration = ANY(?)''',
+		[registrations],
 	).fetchall()
-	glider.weighings = [
-		Weighing(
-			id=item[0],
-			date=item[1],
-			p1=float(item[2]),
-			p2=float(item[3]),
-			right_wing_weight=float(item[4]),
-			left_wing_weight=float(item[5]),
-			tail_weight=float(item[6]),
-			fuselage_weight=float(item[7]),
-			fix_ballast_weight=float(item[8]),
-			A=item[9],
-			D=item[10],
+	for item in weighing_rows:
+		gliders[item[0]].weighings.append(
+			Weighing(
+				id=item[1],
+				date=item[2],
+				p1=float(item[3]),
+				p2=float(item[4]),
+				right_wing_weight=float(item[5]),
+				left_wing_weight=float(item[6]),
+				tail_weight=float(item[7]),
+				fuselage_weight=float(item[8]),
+				fix_ballast_weight=float(item[9]),
+				A=item[10],
+				D=item[11],
+			)
 		)
-		for item in weighing_rows
-	]
 
 	instrument_rows = conn.execute(
-		'''SELECT id, on_board, instrument, brand, type, number, date, seat
+		'''SELECT registration, id, on_board, instrument, brand, type, number, date, seat
 		FROM INVENTORY
-		WHERE registration = ?''',
-		[registration],
+		WHERE registration = ANY(?)''',
+		[registrations],
 	).fetchall()
-	glider.instruments = [
-		Instrument(
-			id=item[0],
-			on_board=item[1],
-			instrument=item[2],
-			brand=item[3],
-			type=item[4],
-			number=item[5],
-			date=item[6],
-			seat=item[7] or '',
+	for item in instrument_rows:
+		gliders[item[0]].instruments.append(
+			Instrument(
+				id=item[1],
+				on_board=item[2],
+				instrument=item[3],
+				brand=item[4],
+				type=item[5],
+				number=item[6],
+				date=item[7],
+				seat=item[8] or '',
+			)
 		)
-		for item in instrument_rows
-	]
 
-	return glider
+	return gliders
+
+
+def _record_change(conn, registration: str, deleted: bool = False) -> None:
+	"""Mark a glider as changed (or deleted) for incremental exports."""
+	conn.execute(
+		"INSERT OR REPLACE INTO GLIDER_CHANGE (registration, changed_at, deleted) VALUES (?, now() AT TIME ZONE 'UTC', ?)",
+		[registration, deleted],
+	)
+
+
+_SUMMARY_COLUMNS = [field.name for field in fields(GliderSummary)]
+
+
+def _refresh_glider_summary(conn, registration: str) -> None:
+	"""Recompute the GLIDER_SUMMARY row of a glider from its current data."""
+	row = conn.execute('SELECT * FROM GLIDER WHERE registration = ?', [registration]).fetchone()
+	if row is None:
+		conn.execute('DELETE FROM GLIDER_SUMMARY WHERE registration = ?', [registration])
+		return
+	summary = _load_gliders(conn, [row])[registration].summary()
+	conn.execute(
+		f'''INSERT OR REPLACE INTO GLIDER_SUMMARY ({', '.join(_SUMMARY_COLUMNS)}, computed_at)
+		VALUES ({', '.join('?' for _ in _SUMMARY_COLUMNS)}, CURRENT_TIMESTAMP)''',
+		list(astuple(summary)),
+	)
+
+
+def refresh_glider_summaries() -> int:
+	"""Recompute the GLIDER_SUMMARY rows of every glider (startup and after an import)."""
+	with _get_database_connection() as conn:
+		try:
+			rows = conn.execute('SELECT * FROM GLIDER').fetchall()
+			summaries = [glider.summary() for glider in _load_gliders(conn, rows).values()]
+			conn.execute('BEGIN TRANSACTION')
+			conn.execute('DELETE FROM GLIDER_SUMMARY')
+			if summaries:
+				conn.executemany(
+					f'''INSERT INTO GLIDER_SUMMARY ({', '.join(_SUMMARY_COLUMNS)})
+					VALUES ({', '.join('?' for _ in _SUMMARY_COLUMNS)})''',
+					[list(astuple(summary)) for summary in summaries],
+				)
+			conn.execute('COMMIT')
+			logger.debug(f'Summaries of {len(summaries)} gliders refreshed')
+			return len(summaries)
+		except Exception as e:
+			logger.error(f'Error refreshing glider summaries: {e}')
+			raise
+
+
+def get_glider_summary(registration: str) -> Optional[GliderSummary]:
+	"""Fetch the precomputed CG summary of a glider."""
+	with _get_database_connection(read_only=True) as conn:
+		try:
+			row = conn.execute(
+				f'SELECT {", ".join(_SUMMARY_COLUMNS)} FROM GLIDER_SUMMARY WHERE registration = ?',
+				[registration],
+			).fetchone()
+			return GliderSummary(*row) if row else None
+		except Exception as e:
+			logger.error(f'Error fetching summary of glider {registration}: {e}')
+			raise
+
+
+def list_glider_summaries(skip: int = 0, limit: int = 100) -> Tuple[List[GliderSummary], int]:
+	"""Fetch one page of precomputed CG summaries ordered by registration, with the total."""
+	with _get_database_connection(read_only=True) as conn:
+		try:
+			total = conn.execute('SELECT COUNT(*) FROM GLIDER_SUMMARY').fetchone()[0]
+			rows = conn.execute(
+				f'''SELECT {", ".join(_SUMMARY_COLUMNS)} FROM GLIDER_SUMMARY
+				ORDER BY registration
+				LIMIT ? OFFSET ?''',
+				[limit, skip],
+			).fetchall()
+			return [GliderSummary(*row) for row in rows], int(total)
+		except Exception as e:
+			logger.error(f'Error fetching glider summaries: {e}')
+			raise
 
 
 def get_all_gliders() -> Dict[str, Glider]:
 	"""Fetch all gliders from database keyed by registration."""
-	conn = _get_database_connection(read_only=True)
-	try:
-		rows = conn.execute('SELECT * FROM GLIDER').fetchall()
-		return {row[1]: _build_glider_from_row(conn, row) for row in rows}
-	except Exception as e:
-		logger.error(f'Error fetching all gliders: {e}')
-		raise
-	finally:
-		conn.close()
+	with _get_database_connection(read_only=True) as conn:
+		try:
+			rows = conn.execute('SELECT * FROM GLIDER').fetchall()
+			return _load_gliders(conn, rows)
+		except Exception as e:
+			logger.error(f'Error fetching all gliders: {e}')
+			raise
+
+
+def _glider_filters(
+	model: Optional[str] = None,
+	brand: Optional[str] = None,
+	single_seat: Optional[bool] = None,
+	has_weighing: Optional[bool] = None,
+	registrations: Optional[List[str]] = None,
+) -> Tuple[List[str], List]:
+	"""Build the WHERE conditions and parameters of the glider list filters"""
+	where_clauses = []
+	params: List = []
+	if model is not None:
+		where_clauses.append('model = ?')
+		params.append(model)
+	if brand is not None:
+		where_clauses.append('brand = ?')
+		params.append(brand)
+	if single_seat is not None:
+		where_clauses.append('single_seat = ?')
+		params.append(single_seat)
+	if has_weighing is not None:
+		exists_clause = 'EXISTS (SELECT 1 FROM WEIGHING w WHERE w.registration = GLIDER.registration)'
+		where_clauses.append(exists_clause if has_weighing else f'NOT {exists_clause}')
+	if registrations is not None:
+		where_clauses.append('registration = ANY(?)')
+		params.append(list(registrations))
+	return where_clauses, params
+
+
+def list_gliders_page(
+	skip: int = 0,
+	limit: int = 100,
+	model: Optional[str] = None,
+	brand: Optional[str] = None,
+	single_seat: Optional[bool] = None,
+	has_weighing: Optional[bool] = None,
+	after: Optional[str] = None,
+) -> Tuple[List[Glider], int]:
+	"""Fetch one page of gliders ordered by registration.
+
+	Filters, ordering and paging run in SQL so that only the requested page is
+	hydrated. ``after`` is a keyset cursor: only registrations sorting after it
+	are returned. The total is the filtered count, regardless of the cursor.
+	"""
+	where_clauses, params = _glider_filters(model, brand, single_seat, has_weighing)
+
+	page_clauses = list(where_clauses)
+	page_params = list(params)
+	if after is not None:
+		page_clauses.append('registration > ?')
+		page_params.append(after)
+
+	where_clause = 'WHERE ' + ' AND '.join(where_clauses) if where_clauses else ''
+	page_where_clause = 'WHERE ' + ' AND '.join(page_clauses) if page_clauses else ''
+
+	with _get_database_connection(read_only=True) as conn:
+		try:
+			total = conn.execute(f'SELECT COUNT(*) FROM GLIDER {where_clause}', params).fetchone()[0]
+			rows = conn.execute(
+				f'''SELECT * FROM GLIDER {page_where_clause}
+				ORDER BY registration
+				LIMIT ? OFFSET ?''',
+				page_params + [limit, skip],
+			).fetchall()
+			return list(_load_gliders(conn, rows).values()), int(total)
+		except Exception as e:
+			logger.error(f'Error fetching gliders page: {e}')
+			raise
+
+
+def get_fleet(
+	model: Optional[str] = None,
+	brand: Optional[str] = None,
+	single_seat: Optional[bool] = None,
+	registrations: Optional[List[str]] = None,
+) -> List[Glider]:
+	"""Fetch every glider matching the filters, ordered by registration.
+
+	Gliders found in ``glider_cache`` are reused; the others are hydrated in one
+	bulk load and added to the cache. The returned aggregates are shared and
+	must be treated as read-only.
+	"""
+	where_clauses, params = _glider_filters(model, brand, single_seat, registrations=registrations)
+	where_clause = 'WHERE ' + ' AND '.join(where_clauses) if where_clauses else ''
+
+	with _get_database_connection(read_only=True) as conn:
+		try:
+			fleet_registrations = [
+				row[0] for row in conn.execute(
+					f'SELECT registration FROM GLIDER {where_clause} ORDER BY registration',
+					params,
+				).fetchall()
+			]
+			gliders = {}
+			versions = {}
+			for registration in fleet_registrations:
+				glider = glider_cache.get(registration)
+				if glider is not None:
+					gliders[registration] = glider
+				else:
+					versions[registration] = glider_cache.version(registration)
+
+			if versions:
+				rows = conn.execute(
+					'SELECT * FROM GLIDER WHERE registration = ANY(?)',
+					[list(versions)],
+				).fetchall()
+				loaded = _load_gliders(conn, rows)
+				for registration, glider in loaded.items():
+					glider_cache.put(registration, glider, versions[registration])
+				gliders.update(loaded)
+		except Exception as e:
+			logger.error(f'Error fetching fleet: {e}')
+			raise
+
+	return [gliders[registration] for registration in fleet_registrations if registration in gliders]
 
 
 def get_glider_by_id(registration: str) -> Optional[Glider]:
-	"""Fetch a single glider by registration."""
-	conn = _get_database_connection(read_only=True)
-	try:
-		row = conn.execute(
-			'SELECT * FROM GLIDER WHERE registration = ?',
-			[registration],
-		).fetchone()
-		if row is None:
-			return None
-		return _build_glider_from_row(conn, row)
-	except Exception as e:
-		logger.error(f'Error fetching glider {registration}: {e}')
-		raise
-	finally:
-		conn.close()
+	"""Fetch a single glider by registration.
+
+	Hydrated gliders are served from ``glider_cache``; the returned aggregate
+	is shared and must be treated as read-only.
+	"""
+	glider = glider_cache.get(registration)
+	if glider is not None:
+		return glider
+
+	version = glider_cache.version(registration)
+	with _get_database_connection(read_only=True) as conn:
+		try:
+			row = conn.execute(
+				'SELECT * FROM GLIDER WHERE registration = ?',
+				[registration],
+			).fetchone()
+			if row is None:
+				return None
+			glider = _load_gliders(conn, [row])[row[1]]
+		except Exception as e:
+			logger.error(f'Error fetching glider {registration}: {e}')
+			raise
+
+	glider_cache.put(registration, glider, version)
+	return glider
 
 
 def get_glider_by_model(model: str) -> Optional[Glider]:
 	"""Fetch first glider matching model."""
-	conn = _get_database_connection(read_only=True)
-	try:
-		row = conn.execute(
-			'SELECT * FROM GLIDER WHERE model = ? LIMIT 1',
-			[model],
-		).fetchone()
-		if row is None:
-			return None
-		return _build_glider_from_row(conn, row)
-	except Exception as e:
-		logger.error(f'Error fetching glider by model {model}: {e}')
-		raise
-	finally:
-		conn.close()
+	with _get_database_connection(read_only=True) as conn:
+		try:
+			row = conn.execute(
+				'SELECT * FROM GLIDER WHERE model = ? LIMIT 1',
+				[model],
+			).fetchone()
+			if row is None:
+				return None
+			return _load_gliders(conn, [row])[row[1]]
+		except Exception as e:
+			logger.error(f'Error fetching glider by model {model}: {e}')
+			raise
 
 
 def create_glider(glider: Glider) -> bool:
 	"""Create a new glider in the database."""
-	conn = _get_database_connection()
-	try:
-		conn.execute(
-			'INSERT INTO GLIDER VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
-			_glider_values(glider),
-		)
-		logger.debug(f'Glider {glider.registration} created in database')
-		return True
-	except Exception as e:
-		logger.error(f'Error creating glider {glider.registration}: {e}')
-		raise
-	finally:
-		conn.close()
+	with _get_database_connection() as conn:
+		try:
+			conn.execute(
+				'INSERT INTO GLIDER VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+				_glider_values(glider),
+			)
+			_refresh_glider_summary(conn, glider.registration)
+			_record_change(conn, glider.registration)
+			logger.debug(f'Glider {glider.registration} created in database')
+			return True
+		except Exception as e:
+			logger.error(f'Error creating glider {glider.registration}: {e}')
+			raise
+		finally:
+			_invalidate(glider.registration)
 
 
 def update_glider(glider: Glider) -> bool:
 	"""Update an existing glider in the database."""
-	conn = _get_database_connection()
-	try:
-		conn.execute(
-			'INSERT OR REPLACE INTO GLIDER VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
-			_glider_values(glider),
-		)
-		logger.debug(f'Glider {glider.registration} updated in database')
-		return True
-	except Exception as e:
-		logger.error(f'Error updating glider {glider.registration}: {e}')
-		raise
-	finally:
-		conn.close()
+	with _get_database_connection() as conn:
+		try:
+			conn.execute(
+				'INSERT OR REPLACE INTO GLIDER VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+				_glider_values(glider),
+			)
+			_refresh_glider_summary(conn, glider.registration)
+			_record_change(conn, glider.registration)
+			logger.debug(f'Glider {glider.registration} updated in database')
+			return True
+		except Exception as e:
+			logger.error(f'Error updating glider {glider.registration}: {e}')
+			raise
+		finally:
+			_invalidate(glider.registration)
 
 
 def delete_glider(registration: str) -> bool:
 	"""Delete a glider and all related data from the database."""
-	conn = _get_database_connection()
-	try:
-		for table in ('WEIGHING', 'WB_LIMIT', 'INVENTORY', 'GLIDER'):
-			conn.execute(f'DELETE FROM {table} WHERE registration = ?', [registration])
-		logger.debug(f'Glider {registration} deleted from database')
-		return True
-	except Exception as e:
-		logger.error(f'Error deleting glider {registration}: {e}')
-		raise
-	finally:
-		conn.close()
+	with _get_database_connection() as conn:
+		try:
+			for table in ('WEIGHING', 'WB_LIMIT', 'INVENTORY', 'GLIDER_SUMMARY', 'GLIDER'):
+				conn.execute(f'DELETE FROM {table} WHERE registration = ?', [registration])
+			_record_change(conn, registration, deleted=True)
+			logger.debug(f'Glider {registration} deleted from database')
+			return True
+		except Exception as e:
+			logger.error(f'Error deleting glider {registration}: {e}')
+			raise
+		finally:
+			_invalidate(registration)
 
 
 def save_weight_and_balance(registration: str, weight_and_balances: List[tuple]) -> bool:
 	"""Save weight and balance limit points for a glider."""
-	conn = _get_database_connection()
-	try:
-		conn.execute('DELETE FROM WB_LIMIT WHERE registration = ?', [registration])
-		for point_index, point in enumerate(weight_and_balances):
-			conn.execute(
-				'INSERT INTO WB_LIMIT VALUES (?, ?, ?, ?)',
-				[registration, point_index, point[0], point[1]],
-			)
-		logger.debug(f'Weight & balance for glider {registration} updated')
-		return True
-	except Exception as e:
-		logger.error(f'Error saving weight and balance for {registration}: {e}')
-		raise
-	finally:
-		conn.close()
+	with _get_database_connection() as conn:
+		try:
+			conn.execute('DELETE FROM WB_LIMIT WHERE registration = ?', [registration])
+			for point_index, point in enumerate(weight_and_balances):
+				conn.execute(
+					'INSERT INTO WB_LIMIT VALUES (?, ?, ?, ?)',
+					[registration, point_index, point[0], point[1]],
+				)
+			_record_change(conn, registration)
+			logger.debug(f'Weight & balance for glider {registration} updated')
+			return True
+		except Exception as e:
+			logger.error(f'Error saving weight and balance for {registration}: {e}')
+			raise
+		finally:
+			_invalidate(registration)
 
 
 def save_weighings(registration: str, weighings: List[Weighing]) -> bool:
 	"""Save weighing data for a glider."""
-	conn = _get_database_connection()
-	try:
-		for weighing in weighings:
-			weighing_id = weighing.id
-			if weighing_id is None:
-				weighing_id = _next_sequence_value(conn, 'auto_increment')
-				weighing.id = weighing_id
-				logger.debug(f'Next weighing id is {weighing.id}')
-
-			conn.execute(
-				'''INSERT OR REPLACE INTO WEIGHING
-				(id, date, registration, p1, p2, right_wing_weight, left_wing_weight, tail_weight, fuselage_weight, fix_ballast_weight, A, D)
-				VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-				[
-					weighing_id,
-					weighing.date,
-					registration,
-					weighing.p1,
-					weighing.p2,
-					weighing.right_wing_weight,
-					weighing.left_wing_weight,
-					weighing.tail_weight,
-					weighing.fuselage_weight,
-					weighing.fix_ballast_weight,
-					weighing.A,
-					weighing.D,
-				],
-			)
-		logger.debug(f'Weighings for glider {registration} saved')
-		return True
-	except Exception as e:
-		logger.error(f'Error saving weighings for {registration}: {e}')
-		raise
-	finally:
-		conn.close()
+	with _get_database_connection() as conn:
+		try:
+			for weighing in weighings:
+				weighing_id = weighing.id
+				if weighing_id is None:
+					weighing_id = _next_sequence_value(conn, 'auto_increment')
+					weighing.id = weighing_id
+					logger.debug(f'Next weighing id is {weighing.id}')
+
+				conn.execute(
+					'''INSERT OR REPLACE INTO WEIGHING
+					(id, date, registration, p1, p2, right_wing_weight, left_wing_weight, tail_weight, fuselage_weight, fix_ballast_weight, A, D)
+					VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+					[
+						weighing_id,
+						weighing.date,
+						registration,
+						weighing.p1,
+						weighing.p2,
+						weighing.right_wing_weight,
+						weighing.left_wing_weight,
+						weighing.tail_weight,
+						weighing.fuselage_weight,
+						weighing.fix_ballast_weight,
+						weighing.A,
+						weighing.D,
+					],
+				)
+			_refresh_glider_summary(conn, registration)
+			_record_change(conn, registration)
+			logger.debug(f'Weighings for glider {registration} saved')
+			return True
+		except Exception as e:
+			logger.error(f'Error saving weighings for {registration}: {e}')
+			raise
+		finally:
+			_invalidate(registration)
 
 
 def save_instruments(registration: str, instruments: List[Instrument]) -> bool:
 	"""Save instrument/equipment data for a glider."""
-	conn = _get_database_connection()
-	try:
-		for instrument in instruments:
-			instrument_id = instrument.id
-			if instrument_id is None:
-				instrument_id = _next_sequence_value(conn, 'inventory_id_seq')
-				instrument.id = instrument_id
-				logger.debug(f'Next instrument id is {instrument.id}')
-
-			conn.execute(
-				'''INSERT OR REPLACE INTO INVENTORY
-				(id, registration, on_board, instrument, brand, type, number, date, seat)
-				VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-				[
-					instrument_id,
-					registration,
-					instrument.on_board,
-					instrument.instrument,
-					instrument.brand,
-					instrument.type,
-					instrument.number,
-					instrument.date,
-					instrument.seat,
-				],
-			)
-		logger.debug(f'Instruments for glider {registration} saved')
-		return True
-	except Exception as e:
-		logger.error(f'Error saving instruments for {registration}: {e}')
-		raise
-	finally:
-		conn.close()
+	with _get_database_connection() as conn:
+		try:
+			for instrument in instruments:
+				instrument_id = instrument.id
+				if instrument_id is None:
+					instrument_id = _next_sequence_value(conn, 'inventory_id_seq')
+					instrument.id = instrument_id
+					logger.debug(f'Next instrument id is {instrument.id}')
+
+				conn.execute(
+					'''INSERT OR REPLACE INTO INVENTORY
+					(id, registration, on_board, instrument, brand, type, number, date, seat)
+					VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+					[
+						instrument_id,
+						registration,
+						instrument.on_board,
+						instrument.instrument,
+						instrument.brand,
+						instrument.type,
+						instrument.number,
+						instrument.date,
+						instrument.seat,
+					],
+				)
+			_record_change(conn, registration)
+			logger.debug(f'Instruments for glider {registration} saved')
+			return True
+		except Exception as e:
+			logger.error(f'Error saving instruments for {registration}: {e}')
+			raise
+		finally:
+			_invalidate(registration)
+
+
+def delete_instruments(registration: str) -> bool:
+	"""Delete every instrument of a glider."""
+	with _get_database_connection() as conn:
+		try:
+			conn.execute('DELETE FROM INVENTORY WHERE registration = ?', [registration])
+			_record_change(conn, registration)
+			logger.debug(f'Instruments for glider {registration} deleted')
+			return True
+		except Exception as e:
+			logger.error(f'Error deleting instruments for {registration}: {e}')
+			raise
+		finally:
+			_invalidate(registration)
 
 
 def delete_instrument(registration: str, instrument_id: int) -> bool:
 	"""Delete a single instrument for a glider."""
-	conn = _get_database_connection()
-	try:
-		exists = conn.execute(
-			'SELECT 1 FROM INVENTORY WHERE registration = ? AND id = ? LIMIT 1',
-			[registration, instrument_id],
-		).fetchone()
-		if not exists:
-			return False
-
-		conn.execute(
-			'DELETE FROM INVENTORY WHERE registration = ? AND id = ?',
-			[registration, instrument_id],
-		)
-		logger.debug(f'Instrument {instrument_id} for glider {registration} deleted')
-		return True
-	except Exception as e:
-		logger.error(f'Error deleting instrument {instrument_id} for {registration}: {e}')
-		raise
-	finally:
-		conn.close()
+	with _get_database_connection() as conn:
+		try:
+			exists = conn.execute(
+				'SELECT 1 FROM INVENTORY WHERE registration = ? AND id = ? LIMIT 1',
+				[registration, instrument_id],
+			).fetchone()
+			if not exists:
+				return False
+
+			conn.execute(
+				'DELETE FROM INVENTORY WHERE registration = ? AND id = ?',
+				[registration, instrument_id],
+			)
+			_record_change(conn, registration)
+			logger.debug(f'Instrument {instrument_id} for glider {registration} deleted')
+			return True
+		except Exception as e:
+			logger.error(f'Error deleting instrument {instrument_id} for {registration}: {e}')
+			raise
+		finally:
+			_invalidate(registration)
 
 
 def delete_weighing(registration: str, weighing_id: int) -> bool:
 	"""Delete a single weighing for a glider."""
-	conn = _get_database_connection()
-	try:
-		exists = conn.execute(
-			'SELECT 1 FROM WEIGHING WHERE registration = ? AND id = ? LIMIT 1',
-			[registration, weighing_id],
-		).fetchone()
-		if not exists:
-			return False
-
-		conn.execute(
-			'DELETE FROM WEIGHING WHERE registration = ? AND id = ?',
-			[registration, weighing_id],
-		)
-		logger.debug(f'Weighing {weighing_id} for glider {registration} deleted')
-		return True
-	except Exception as e:
-		logger.error(f'Error deleting weighing {weighing_id} for {registration}: {e}')
-		raise
-	finally:
-		conn.close()
+	with _get_database_connection() as conn:
+		try:
+			exists = conn.execute(
+				'SELECT 1 FROM WEIGHING WHERE registration = ? AND id = ? LIMIT 1',
+				[registration, weighing_id],
+			).fetchone()
+			if not exists:
+				return False
+
+			conn.execute(
+				'DELETE FROM WEIGHING WHERE registration = ? AND id = ?',
+				[registration, weighing_id],
+			)
+			_refresh_glider_summary(conn, registration)
+			_record_change(conn, registration)
+			logger.debug(f'Weighing {weighing_id} for glider {registration} deleted')
+			return True
+		except Exception as e:
+			logger.error(f'Error deleting weighing {weighing_id} for {registration}: {e}')
+			raise
+		finally:
+			_invalidate(registration)
@@ -1,11 +1,11 @@
 """Database operations for users in DuckDB"""
 
 import logging
-from typing import Optional, List, Set
-
-import duckdb
+from functools import lru_cache
+from typing import Optional, List
 
 from backend.config import get_settings
+from backend.db.connection import get_connection_pool
 from backend.models.user import User, PasswordHasher
 
 logger = logging.getLogger(__name__)
@@ -22,42 +22,10 @@ class UserQueries:
 			db_path: Path to DuckDB database (uses settings.DB_NAME if not provided)
 		"""
 		self.db_path = db_path or settings.DB_NAME
-		self._ensure_users_table()
-
-	def _get_connection(self):
-		"""Get a DuckDB connection"""
-		return duckdb.connect(self.db_path)
-
-	def _ensure_users_table(self):
-		"""Ensure the USERS table exists in the database"""
-		conn = self._get_connection()
-		try:
-			conn.execute('''
-				CREATE TABLE IF NOT EXISTS USERS (
-					username VARCHAR PRIMARY KEY,
-					email VARCHAR NOT NULL,
-					password VARCHAR NOT NULL,
-					role VARCHAR DEFAULT 'viewer',
-					created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-					updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-				)
-			''')
 
-			columns = self._get_users_columns(conn)
-			if 'created_at' not in columns:
-				conn.execute('ALTER TABLE USERS ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
-			if 'updated_at' not in columns:
-				conn.execute('ALTER TABLE USERS ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
-
-			conn.commit()
-			logger.debug('USERS table ensured in database')
-		finally:
-			conn.close()
-
-	def _get_users_columns(self, conn) -> Set[str]:
-		"""Get USERS table column names"""
-		results = conn.execute("PRAGMA table_info('USERS')").fetchall()
-		return {row[1] for row in results}
+	def _get_connection(self, read_only: bool = False):
+		"""Check out a pooled DuckDB cursor (use as a context manager)"""
+		return get_connection_pool(self.db_path).cursor(read_only=read_only)
 
 	def get_user_by_username(self, username: str) -> Optional[User]:
 		"""Get a user by username
@@ -68,29 +36,27 @@ class UserQueries:
 		Returns:
 			User object if found, None otherwise
 		"""
-		conn = self._get_connection()
-		try:
-			result = conn.execute(
-				'SELECT username, email, password, role FROM USERS WHERE username = ?',
-				[username]
-			).fetchall()
+		with self._get_connection(read_only=True) as conn:
+			try:
+				result = conn.execute(
+					'SELECT username, email, password, role FROM USERS WHERE username = ?',
+					[username]
+				).fetchall()
 			
-			if result:
-				username, email, password, role = result[0]
-				logger.debug(f'User {username} found in database')
-				return User(
-					username=username,
-					email=email,
-					password=password,
-					role=role
-				)
-			logger.debug(f'User {username} not found in database')
-			return None
-		except Exception as e:
-			logger.error(f'Error fetching user {username}: {e}')
-			return None
-		finally:
-			conn.close()
+				if result:
+					username, email, password, role = result[0]
+					logger.debug(f'User {username} found in database')
+					return User(
+						username=username,
+						email=email,
+						password=password,
+						role=role
+					)
+				logger.debug(f'User {username} not found in database')
+				return None
+			except Exception as e:
+				logger.error(f'Error fetching user {username}: {e}')
+				return None
 
 	def get_user_by_id(self, user_id: str) -> Optional[User]:
 		"""Get a user by ID (username is used as ID in this implementation)
@@ -130,22 +96,20 @@ class UserQueries:
 		Returns:
 			True if user was created, False otherwise
 		"""
-		conn = self._get_connection()
-		try:
-			hashed_password = PasswordHasher.hash_password(user.password)
+		with self._get_connection() as conn:
+			try:
+				hashed_password = PasswordHasher.hash_password(user.password) if not PasswordHasher.is_already_hashed(user.password) else user.password
 			
-			conn.execute(
-				'INSERT INTO USERS (username, email, password, role) VALUES (?, ?, ?, ?)',
-				[user.username, user.email, hashed_password, user.role]
-			)
-			conn.commit()
-			logger.info(f'User {user.username} created in database')
-			return True
-		except Exception as e:
-			logger.error(f'Error creating user {user.username}: {e}')
-			return False
-		finally:
-			conn.close()
+				conn.execute(
+					'INSERT INTO USERS (username, email, password, role) VALUES (?, ?, ?, ?)',
+					[user.username, user.email, hashed_password, user.role]
+				)
+				conn.commit()
+				logger.info(f'User {user.username} created in database')
+				return True
+			except Exception as e:
+				logger.error(f'Error creating user {user.username}: {e}')
+				return False
 
 	def update_user(self, username: str, updates: dict) -> bool:
 		"""Update an existing user in the database
@@ -157,39 +121,35 @@ class UserQueries:
 		Returns:
 			True if user was updated, False otherwise
 		"""
-		conn = self._get_connection()
-		try:
-			set_clauses = []
-			params = []
-			columns = self._get_users_columns(conn)
+		with self._get_connection() as conn:
+			try:
+				set_clauses = []
+				params = []
 			
-			for key, value in updates.items():
-				if key == 'password':
-					hashed_password = PasswordHasher.hash_password(value) if not PasswordHasher.is_already_hashed(value) else value
-					set_clauses.append(f'{key} = ?')
-					params.append(hashed_password)
-				elif key in ('email', 'role'):
-					set_clauses.append(f'{key} = ?')
-					params.append(value)
+				for key, value in updates.items():
+					if key == 'password':
+						hashed_password = PasswordHasher.hash_password(value) if not PasswordHasher.is_already_hashed(value) else value
+						set_clauses.append(f'{key} = ?')
+						params.append(hashed_password)
+					elif key in ('email', 'role'):
+						set_clauses.append(f'{key} = ?')
+						params.append(value)
 			
-			if not set_clauses:
-				logger.warning(f'No valid fields to update for user {username}')
-				return False
+				if not set_clauses:
+					logger.warning(f'No valid fields to update for user {username}')
+					return False
 			
-			if 'updated_at' in columns:
 				set_clauses.append('updated_at = CURRENT_TIMESTAMP')
-			params.append(username)
+				params.append(username)
 			
-			sql = f"UPDATE USERS SET {', '.join(set_clauses)} WHERE username = ?"
-			conn.execute(sql, params)
-			conn.commit()
-			logger.info(f'User {username} updated in database')
-			return True
-		except Exception as e:
-			logger.error(f'Error updating user {username}: {e}')
-			return False
-		finally:
-			conn.close()
+				sql = f"UPDATE USERS SET {', '.join(set_clauses)} WHERE username = ?"
+				conn.execute(sql, params)
+				conn.commit()
+				logger.info(f'User {username} updated in database')
+				return True
+			except Exception as e:
+				logger.error(f'Error updating user {username}: {e}')
+				return False
 
 	def delete_user(self, username: str) -> bool:
 		"""Delete a user from the database
@@ -200,17 +160,15 @@ class UserQueries:
 		Returns:
 			True if user was deleted, False otherwise
 		"""
-		conn = self._get_connection()
-		try:
-			conn.execute('DELETE FROM USERS WHERE username = ?', [username])
-			conn.commit()
-			logger.info(f'User {username} deleted from database')
-			return True
-		except Exception as e:
-			logger.error(f'Error deleting user {username}: {e}')
-			return False
-		finally:
-			conn.close()
+		with self._get_connection() as conn:
+			try:
+				conn.execute('DELETE FROM USERS WHERE username = ?', [username])
+				conn.commit()
+				logger.info(f'User {username} deleted from database')
+				return True
+			except Exception as e:
+				logger.error(f'Error deleting user {username}: {e}')
+				return False
 
 	def list_users(self) -> List[User]:
 		"""Get all users from the database
@@ -220,28 +178,26 @@ class UserQueries:
 		Returns:
 			List of User objects
 		"""
-		conn = self._get_connection()
-		try:
-			results = conn.execute(
-				'SELECT username, email, password, role FROM USERS ORDER BY username'
-			).fetchall()
+		with self._get_connection(read_only=True) as conn:
+			try:
+				results = conn.execute(
+					'SELECT username, email, password, role FROM USERS ORDER BY username'
+				).fetchall()
 			
-			users = [
-				User(
-					username=username,
-					email=email,
-					password=password,
-					role=role
-				)
-				for username, email, password, role in results
-			]
-			logger.debug(f'Retrieved {len(users)} users from database')
-			return users
-		except Exception as e:
-			logger.error(f'Error fetching all users: {e}')
-			return []
-		finally:
-			conn.close()
+				users = [
+					User(
+						username=username,
+						email=email,
+						password=password,
+						role=role
+					)
+					for username, email, password, role in results
+				]
+				logger.debug(f'Retrieved {len(users)} users from database')
+				return users
+			except Exception as e:
+				logger.error(f'Error fetching all users: {e}')
+				return []
 
 	def user_exists(self, username: str) -> bool:
 		"""Check if a user exists in the database
@@ -254,3 +210,9 @@ class UserQueries:
 		"""
 		user = self.get_user_by_username(username)
 		return user is not None
+
+
+@lru_cache()
+def get_user_queries() -> UserQueries:
+	"""Get the shared UserQueries instance (FastAPI dependency)"""
+	return UserQueries()
@@ -3,7 +3,8 @@
 import logging
 from typing import Optional, List
 from datetime import date
-import duckdb
+
+from backend.db.connection import get_connection_pool
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +16,10 @@ class WeighingQueries:
 	def get_weighing_by_id(db_path: str, weighing_id: int) -> Optional[dict]:
 		"""Retrieve a single weighing record by ID"""
 		try:
-			conn = duckdb.connect(db_path, config={'access_mode': 'READ_ONLY'})
-			result = conn.execute(
-				'SELECT * FROM WEIGHING WHERE id = ?', [weighing_id]
-			).fetchone()
-			conn.close()
+			with get_connection_pool(db_path).cursor(read_only=True) as conn:
+				result = conn.execute(
+					'SELECT * FROM WEIGHING WHERE id = ?', [weighing_id]
+				).fetchone()
 			return result
 		except Exception as e:
 			logger.error(f'Error fetching weighing {weighing_id}: {e}')
@@ -29,12 +29,11 @@ class WeighingQueries:
 	def get_weighings_by_glider(db_path: str, glider_registration: str) -> List[dict]:
 		"""Retrieve all weighing records for a glider"""
 		try:
-			conn = duckdb.connect(db_path, config={'access_mode': 'READ_ONLY'})
-			results = conn.execute(
-				'SELECT * FROM WEIGHING WHERE registration = ? ORDER BY date DESC',
-				[glider_registration],
-			).fetchall()
-			conn.close()
+			with get_connection_pool(db_path).cursor(read_only=True) as conn:
+				results = conn.execute(
+					'SELECT * FROM WEIGHING WHERE registration = ? ORDER BY date DESC',
+					[glider_registration],
+				).fetchall()
 			return results if results else []
 		except Exception as e:
 			logger.error(f'Error fetching weighings for {glider_registration}: {e}')
@@ -44,15 +43,14 @@ class WeighingQueries:
 	def get_latest_weighing(db_path: str, glider_registration: str) -> Optional[dict]:
 		"""Retrieve the most recent weighing for a glider"""
 		try:
-			conn = duckdb.connect(db_path, config={'access_mode': 'READ_ONLY'})
-			result = conn.execute(
-				'''SELECT * FROM WEIGHING
-				WHERE registration = ?
-				ORDER BY date DESC
-				LIMIT 1''',
-				[glider_registration],
-			).fetchone()
-			conn.close()
+			with get_connection_pool(db_path).cursor(read_only=True) as conn:
+				result = conn.execute(
+					'''SELECT * FROM WEIGHING
+					WHERE registration = ?
+					ORDER BY date DESC
+					LIMIT 1''',
+					[glider_registration],
+				).fetchone()
 			return result
 		except Exception as e:
 			logger.error(
@@ -72,13 +70,12 @@ class WeighingQueries:
 	) -> bool:
 		"""Save calculated weighing data (requires write access)"""
 		try:
-			conn = duckdb.connect(db_path)
-			# This would require a WEIGHING_CALCULATIONS table or similar
-			# For now, we just log it
-			logger.info(
-				f'Calculated: weighing_id={weighing_id}, mve={mve}, mvenp={mvenp}, empty_arm={empty_arm}'
-			)
-			conn.close()
+			with get_connection_pool(db_path).cursor() as conn:
+				# This would require a WEIGHING_CALCULATIONS table or similar
+				# For now, we just log it
+				logger.info(
+					f'Calculated: weighing_id={weighing_id}, mve={mve}, mvenp={mvenp}, empty_arm={empty_arm}'
+				)
 			return True
 		except Exception as e:
 			logger.error(f'Error saving weighing calculation: {e}')
@@ -92,18 +89,17 @@ class WeighingQueries:
 	) -> List[dict]:
 		"""Get weighing history for a glider"""
 		try:
-			conn = duckdb.connect(db_path, config={'access_mode': 'READ_ONLY'})
-			results = conn.execute(
-				'''SELECT id, registration, date, p1, p2, A, D,
-					right_wing_weight, left_wing_weight, tail_weight,
-					fuselage_weight, fix_ballast_weight
-				FROM WEIGHING
-				WHERE registration = ?
-				ORDER BY date DESC
-				LIMIT ?''',
-				[glider_registration, limit],
-			).fetchall()
-			conn.close()
+			with get_connection_pool(db_path).cursor(read_only=True) as conn:
+				results = conn.execute(
+					'''SELECT id, registration, date, p1, p2, A, D,
+						right_wing_weight, left_wing_weight, tail_weight,
+						fuselage_weight, fix_ballast_weight
+					FROM WEIGHING
+					WHERE registration = ?
+					ORDER BY date DESC
+					LIMIT ?''',
+					[glider_registration, limit],
+				).fetchall()
 			return results if results else []
 		except Exception as e:
 			logger.error(f'Error fetching weighing history for {glider_registration}: {e}')
@@ -117,14 +113,13 @@ class WeighingQueries:
 	) -> List[dict]:
 		"""Get weighing records after a specific date"""
 		try:
-			conn = duckdb.connect(db_path, config={'access_mode': 'READ_ONLY'})
-			results = conn.execute(
-				'''SELECT * FROM WEIGHING
-				WHERE registration = ? AND date >= ?
-				ORDER BY date DESC''',
-				[glider_registration, start_date],
-			).fetchall()
-			conn.close()
+			with get_connection_pool(db_path).cursor(read_only=True) as conn:
+				results = conn.execute(
+					'''SELECT * FROM WEIGHING
+					WHERE registration = ? AND date >= ?
+					ORDER BY date DESC''',
+					[glider_registration, start_date],
+				).fetchall()
 			return results if results else []
 		except Exception as e:
 			logger.error(
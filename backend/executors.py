@@ -0,0 +1,139 @@
+"""Bounded thread pools keeping blocking work off the asyncio event loop"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+	"""Fixed-size thread pool awaited from async route handlers
+
+	Work submitted while every worker is busy waits in the pool queue; the
+	queue depth and the time spent waiting are tracked for the metrics
+	endpoint. The pool is created on first use and again after ``shutdown``.
+	"""
+
+	def __init__(self, name: str, max_workers: int):
+		"""Create an executor
+
+		Args:
+			name: Executor name used in thread names and metrics
+			max_workers: Number of worker threads
+		"""
+		self.name = name
+		self.max_workers = max_workers
+		self._executor: Optional[ThreadPoolExecutor] = None
+		self._lock = threading.Lock()
+		self._queued = 0
+		self._peak_queued = 0
+		self._active = 0
+		self._submitted = 0
+		self._completed = 0
+		self._failed = 0
+		self._wait_time_total = 0.0
+		self._wait_time_max = 0.0
+		self._run_time_total = 0.0
+
+	def _get_executor(self) -> ThreadPoolExecutor:
+		with self._lock:
+			if self._executor is None:
+				self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f'{self.name}-worker')
+			return self._executor
+
+	async def run(self, fn: Callable, *args, **kwargs) -> Any:
+		"""Run ``fn(*args, **kwargs)`` in the pool and return its result"""
+		executor = self._get_executor()
+		submitted_at = time.perf_counter()
+		with self._lock:
+			self._submitted += 1
+			self._queued += 1
+			self._peak_queued = max(self._peak_queued, self._queued)
+
+		def call():
+			started_at = time.perf_counter()
+			waited = started_at - submitted_at
+			with self._lock:
+				self._queued -= 1
+				self._active += 1
+				self._wait_time_total += waited
+				self._wait_time_max = max(self._wait_time_max, waited)
+			failed = False
+			try:
+				return fn(*args, **kwargs)
+			except BaseException:
+				failed = True
+				raise
+			finally:
+				with self._lock:
+					self._active -= 1
+					self._completed += 1
+					self._failed += failed
+					self._run_time_total += time.perf_counter() - started_at
+
+		def forget_cancelled(future):
+			if future.cancelled():
+				with self._lock:
+					self._queued -= 1
+
+		future = executor.submit(call)
+		future.add_done_callback(forget_cancelled)
+		return await asyncio.wrap_future(future)
+
+	def shutdown(self, wait: bool = True) -> None:
+		"""Stop the worker threads, waiting for running work when ``wait`` is set"""
+		with self._lock:
+			executor, self._executor = self._executor, None
+		if executor is not None:
+			executor.shutdown(wait=wait)
+
+	def stats(self) -> Dict[str, Any]:
+		"""Return queue depth, utilisation and wait time counters"""
+		with self._lock:
+			started = self._submitted - self._queued
+			return {
+				'name': self.name,
+				'max_workers': self.max_workers,
+				'active': self._active,
+				'queued': self._queued,
+				'peak_queued': self._peak_queued,
+				'submitted': self._submitted,
+				'completed': self._completed,
+				'failed': self._failed,
+				'wait_time_total_ms': round(self._wait_time_total * 1000, 3),
+				'wait_time_avg_ms': round(self._wait_time_total * 1000 / started, 3) if started else 0.0,
+				'wait_time_max_ms': round(self._wait_time_max * 1000, 3),
+				'run_time_avg_ms': round(self._run_time_total * 1000 / self._completed, 3) if self._completed else 0.0,
+			}
+
+
+settings = get_settings()
+
+# DuckDB work: one worker per pooled cursor so workers never wait on the pool
+db_executor = BoundedExecutor('db', settings.DB_POOL_SIZE)
+# bcrypt hashing and verification, CPU bound
+auth_executor = BoundedExecutor('bcrypt', settings.BCRYPT_WORKERS or min(4, os.cpu_count() or 1))
+# Weight and balance batch and ballast calculations, CPU bound
+calc_executor = BoundedExecutor('calc', settings.CALC_WORKERS or min(4, os.cpu_count() or 1))
+# PDF cache reads and writes and pack assembly (rendering runs in backend.services.pdf_workers)
+pdf_executor = BoundedExecutor('pdf', settings.PDF_WORKERS)
+
+EXECUTORS = (db_executor, auth_executor, calc_executor, pdf_executor)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+	"""Return the stats of every executor keyed by name"""
+	return {executor.name: executor.stats() for executor in EXECUTORS}
+
+
+def shutdown_executors() -> None:
+	"""Stop every executor, waiting for running work"""
+	for executor in EXECUTORS:
+		executor.shutdown()
@@ -31,12 +31,16 @@ def init_users_table(conn):
 			)
 	'''
 	conn.execute(sql)
+	logger.debug('END init_users_table()')
+
 
+def seed_default_admin(conn):
+	"""Insert the default admin user when the USERS table is empty"""
 	number_of_rows = conn.execute('SELECT count(*) FROM USERS').fetchone()[0]
 	if number_of_rows == 0:
 		logging.debug('No users in table USERS, insert a dummy user.')
 		try:
-			conn.execute('INSERT INTO USERS VALUES (?, ?, ?, ?)', [
+			conn.execute('INSERT INTO USERS (username, email, password, role) VALUES (?, ?, ?, ?)', [
 				'admin',
 				'admin@gmail.com',
 				PasswordHasher.hash_password('admin-pw'),
@@ -45,8 +49,6 @@ def init_users_table(conn):
 		except duckdb.ConstraintException as e:
 			logger.error(e)
 
-	logger.debug('END init_users_table()')
-
 
 def init_gliders_tables(conn):
 	logger.debug('START init_gliders_tables()')
@@ -128,17 +130,203 @@ def init_gliders_tables(conn):
 		)
 	'''
 	conn.execute(sql)
+
+	sql = '''
+		CREATE TABLE IF NOT EXISTS GLIDER_SUMMARY (
+			registration VARCHAR PRIMARY KEY,
+			model VARCHAR,
+			mve DOUBLE,
+			mvenp DOUBLE,
+			empty_weight DOUBLE,
+			cv_max DOUBLE,
+			cu_max DOUBLE,
+			cu DOUBLE,
+			pilot_av_mini DOUBLE,
+			pilot_av_mini_duo DOUBLE,
+			pilot_av_maxi DOUBLE,
+			empty_arm DOUBLE,
+			computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+		)
+	'''
+	conn.execute(sql)
 	logger.debug('END init_gliders_tables()')
 
 
+def migrate_initial_schema(conn):
+	init_users_table(conn)
+	init_gliders_tables(conn)
+	init_audit_log_table(conn)
+
+
+def migrate_users_timestamps(conn):
+	conn.execute('ALTER TABLE USERS ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
+	conn.execute('ALTER TABLE USERS ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
+
+
+# Audit events written before AUDITLOG had structured columns, as
+# (pattern with the resource id as first group, resource type, action)
+LEGACY_AUDIT_EVENTS = [
+	(r'^Glider (\S+) created$', 'glider', 'create'),
+	(r'^Glider (\S+) updated$', 'glider', 'update'),
+	(r'^Glider (\S+) deleted$', 'glider', 'delete'),
+	(r'^Instruments .* updated for glider (\S+)$', 'glider', 'update_instruments'),
+	(r'^Instrument \S+ deleted for glider (\S+)$', 'glider', 'delete_instrument'),
+	(r'^Weighings .* added for glider (\S+)$', 'glider', 'add_weighings'),
+	(r'^Weighing \S+ updated for glider (\S+)$', 'glider', 'update_weighing'),
+	(r'^Weighing \S+ printed for glider (\S+)$', 'glider', 'print_weighing'),
+	(r'^Weighing \S+ deleted for glider (\S+)$', 'glider', 'delete_weighing'),
+	(r'^Weight and balance .* updated for glider (\S+)$', 'glider', 'update_weight_and_balance'),
+	(r'^Calcul centrage planeur pour (\S+) : ', 'glider', 'calculate'),
+	(r'^Calcul lest planeur pour (\S+) : ', 'glider', 'optimize_ballast'),
+	(r'^Calcul centrage flotte()', 'fleet', 'calculate'),
+	(r'^User (\S+) created$', 'user', 'create'),
+	(r'^User (\S+) updated$', 'user', 'update'),
+	(r'^User (\S+) deleted$', 'user', 'delete'),
+]
+
+
+def _legacy_audit_case(value) -> str:
+	"""SQL CASE expression deriving a structured column from the event text"""
+	branches = ' '.join(
+		f"WHEN regexp_matches(event, '{pattern}') THEN {value(pattern, resource_type, action)}"
+		for pattern, resource_type, action in LEGACY_AUDIT_EVENTS
+	)
+	return f'CASE {branches} END'
+
+
+def migrate_audit_log_ids(conn):
+	"""Key AUDITLOG by a sequence id and add resource_type, resource_id and action
+
+	Existing rows are copied in timestamp order into the new table, with the
+	structured columns parsed from their event text, in a single
+	INSERT ... SELECT inside the migration transaction. DuckDB only serves
+	equality filters from single-column indexes, so resource_id and
+	resource_type are indexed separately.
+	"""
+	columns = {row[0] for row in conn.execute(
+		"SELECT column_name FROM information_schema.columns WHERE table_name = 'AUDITLOG'"
+	).fetchall()}
+	if 'id' not in columns:
+		number_of_rows = conn.execute('SELECT count(*) FROM AUDITLOG').fetchone()[0]
+		conn.execute(f'CREATE SEQUENCE IF NOT EXISTS audit_id_seq START WITH {number_of_rows + 1} INCREMENT BY 1')
+		conn.execute('''
+			CREATE TABLE AUDITLOG_V3 (
+				id BIGINT PRIMARY KEY DEFAULT nextval('audit_id_seq'),
+				timestamp TIMESTAMP NOT NULL,
+				username VARCHAR,
+				event VARCHAR,
+				resource_type VARCHAR,
+				resource_id VARCHAR,
+				action VARCHAR,
+			)
+		''')
+		resource_type = _legacy_audit_case(lambda pattern, resource_type, action: f"'{resource_type}'")
+		resource_id = _legacy_audit_case(lambda pattern, resource_type, action: f"nullif(regexp_extract(event, '{pattern}', 1), '')")
+		action = _legacy_audit_case(lambda pattern, resource_type, action: f"'{action}'")
+		conn.execute(f'''
+			INSERT INTO AUDITLOG_V3 (id, timestamp, username, event, resource_type, resource_id, action)
+			SELECT row_number() OVER (ORDER BY timestamp), timestamp, username, event,
+				{resource_type}, {resource_id}, {action}
+			FROM AUDITLOG
+		''')
+		conn.execute('DROP TABLE AUDITLOG')
+		conn.execute('ALTER TABLE AUDITLOG_V3 RENAME TO AUDITLOG')
+		logger.info(f'Migrated {number_of_rows} audit log entries')
+
+	conn.execute('CREATE INDEX IF NOT EXISTS auditlog_timestamp_idx ON AUDITLOG (timestamp)')
+	conn.execute('CREATE INDEX IF NOT EXISTS auditlog_username_idx ON AUDITLOG (username, timestamp)')
+	conn.execute('CREATE INDEX IF NOT EXISTS auditlog_resource_id_idx ON AUDITLOG (resource_id)')
+	conn.execute('CREATE INDEX IF NOT EXISTS auditlog_resource_type_idx ON AUDITLOG (resource_type)')
+
+
+def migrate_glider_changes(conn):
+	"""Track when each glider or one of its child rows last changed
+
+	Incremental exports select the gliders changed after a watermark from
+	GLIDER_CHANGE; deleted gliders keep a row with ``deleted`` set so the
+	deletion reaches the delta. Existing gliders are marked as changed now.
+	"""
+	conn.execute('''
+		CREATE TABLE IF NOT EXISTS GLIDER_CHANGE (
+			registration VARCHAR PRIMARY KEY,
+			changed_at TIMESTAMP NOT NULL,
+			deleted BOOLEAN NOT NULL DEFAULT false,
+		)
+	''')
+	conn.execute('''
+		INSERT OR IGNORE INTO GLIDER_CHANGE (registration, changed_at)
+		SELECT registration, now() AT TIME ZONE 'UTC' FROM GLIDER
+	''')
+
+
+def migrate_audit_archive_keys(conn):
+	"""Record which users and resources each archived audit day holds
+
+	Resource history and user actions read only the archived partitions
+	listed here for their resource or user.
+	"""
+	conn.execute('''
+		CREATE TABLE IF NOT EXISTS AUDIT_ARCHIVE_KEYS (
+			day DATE NOT NULL,
+			username VARCHAR,
+			resource_type VARCHAR,
+			resource_id VARCHAR,
+		)
+	''')
+
+
+# Schema migrations applied in order, once per database. Databases created
+# before versioning start at version 0, so every migration must be idempotent
+# against a schema that may already contain its changes.
+MIGRATIONS = [
+	(1, 'initial schema', migrate_initial_schema),
+	(2, 'USERS created_at and updated_at columns', migrate_users_timestamps),
+	(3, 'AUDITLOG sequence id, resource columns and indexes', migrate_audit_log_ids),
+	(4, 'GLIDER_CHANGE table', migrate_glider_changes),
+	(5, 'AUDIT_ARCHIVE_KEYS table', migrate_audit_archive_keys),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn) -> int:
+	conn.execute('''
+		CREATE TABLE IF NOT EXISTS SCHEMA_VERSION (
+			version INTEGER PRIMARY KEY,
+			description VARCHAR,
+			applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+		)
+	''')
+	return conn.execute('SELECT coalesce(max(version), 0) FROM SCHEMA_VERSION').fetchone()[0]
+
+
+def run_migrations(conn) -> int:
+	"""Apply pending migrations, each in its own transaction, and return the schema version"""
+	version = get_schema_version(conn)
+	for migration_version, description, migrate in MIGRATIONS:
+		if migration_version <= version:
+			continue
+		logger.info(f'Applying schema migration {migration_version}: {description}')
+		conn.begin()
+		try:
+			migrate(conn)
+			conn.execute('INSERT INTO SCHEMA_VERSION (version, description) VALUES (?, ?)', [migration_version, description])
+			conn.commit()
+		except Exception:
+			conn.rollback()
+			raise
+		version = migration_version
+	return version
+
+
 def initialize_database(dbname):
 	conn = None
 	try:
 		logger.debug('initialise Database...')
 		conn = duckdb.connect(dbname).cursor()
-		init_users_table(conn)
-		init_gliders_tables(conn)
-		init_audit_log_table(conn)
+		version = run_migrations(conn)
+		seed_default_admin(conn)
+		logger.debug(f'Database schema at version {version}')
 	except Exception as e:
 		logger.error(f'Error on database {dbname}: {e}')
 	finally:
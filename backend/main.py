@@ -14,8 +14,14 @@ from backend.api.auth import router as auth_router
 from backend.api.database import router as database_router
 from backend.api.gliders import router as gliders_router
 from backend.api.audit import router as audit_router
+from backend.api.metrics import router as metrics_router
 from backend.api.users import router as users_router
+from backend.db.audit_writer import audit_writer
+from backend.db.connection import close_connection_pools, open_connection_pool
+from backend.db.glider_queries import refresh_glider_summaries
+from backend.executors import shutdown_executors
 from backend.init_db import initialize_database
+from backend.services.pdf_workers import pdf_workers, shutdown_pdf_workers
 
 # Configure logging using LOG_LEVEL env variable (default: INFO)
 _settings = get_settings()
@@ -37,10 +43,23 @@ async def lifespan(app: FastAPI):
     initialize_database(get_settings().DB_NAME)
     logger.info(f"✅ Database {get_settings().DB_NAME} initialized")
 
+    open_connection_pool(get_settings().DB_NAME)
+    logger.info("✅ Database connection pool started")
+
+    refresh_glider_summaries()
+    logger.info("✅ Glider summaries refreshed")
+
+    pdf_workers.start()
+    logger.info("✅ PDF rendering workers started")
+
     yield
 
     # Shutdown
     logger.info("🛑 Shutting down PyGliderCG backend")
+    audit_writer.shutdown()
+    shutdown_executors()
+    shutdown_pdf_workers()
+    close_connection_pools()
 
 
 def create_app() -> FastAPI:
@@ -61,6 +80,7 @@ def create_app() -> FastAPI:
         allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
         allow_methods=settings.CORS_ALLOW_METHODS,
         allow_headers=settings.CORS_ALLOW_HEADERS,
+        expose_headers=settings.CORS_EXPOSE_HEADERS,
     )
 
     # Health check endpoint
@@ -78,6 +98,7 @@ def create_app() -> FastAPI:
     app.include_router(database_router)
     app.include_router(gliders_router)
     app.include_router(audit_router)
+    app.include_router(metrics_router)
     app.include_router(users_router)
 
     web_dist = Path(__file__).resolve().parent.parent / 'web' / 'dist'
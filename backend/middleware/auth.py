@@ -1,14 +1,19 @@
 """Authentication middleware and dependencies for FastAPI"""
 
+import hashlib
 import logging
-from typing import Optional
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from backend.cache import VersionedLRUCache
 from backend.config import get_settings
 from backend.models.user import TokenManager, RoleChecker
-from backend.db.user_queries import UserQueries
+from backend.db.user_queries import UserQueries, get_user_queries
+from backend.executors import db_executor
 from backend.schemas.user import TokenPayload
 
 logger = logging.getLogger(__name__)
@@ -17,17 +22,81 @@ settings = get_settings()
 security = HTTPBearer()
 
 
-async def verify_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)) -> TokenPayload:
-	"""Verify JWT token from request headers
-	
-	Args:
-		credentials: HTTP credentials from Authorization header
-		
-	Returns:
-		TokenPayload with decoded token information
-		
+class PrincipalCache:
+	"""Short-lived cache of authenticated principals keyed by token
+
+	Entries hold the decoded token payload and the user it resolved to, so
+	repeated requests carrying the same token skip the signature check and
+	the user lookup. Entries are tagged with the username and dropped by
+	``invalidate_user`` when that user is updated or deleted.
+	"""
+
+	def __init__(self, max_entries: int, ttl: float):
+		"""Create a principal cache
+
+		Args:
+			max_entries: Maximum number of cached tokens
+			ttl: Seconds a principal is trusted before it is verified again
+		"""
+		self.cache = VersionedLRUCache('principals', max_entries=max_entries, ttl=ttl)
+		self._lock = threading.Lock()
+		self._hit_time_total = 0.0
+		self._miss_time_total = 0.0
+		self._hits = 0
+		self._misses = 0
+
+	@staticmethod
+	def key(token: str) -> str:
+		"""Return the identifier a token is cached under"""
+		return hashlib.sha256(token.encode()).hexdigest()
+
+	def get(self, token: str) -> Optional[Tuple[TokenPayload, Any]]:
+		"""Return (payload, user) cached for an unexpired token, or None"""
+		cached = self.cache.get(self.key(token))
+		if cached is None or cached[0].exp <= time.time():
+			return None
+		return cached
+
+	def record(self, hit: bool, elapsed: float) -> None:
+		"""Record how long resolving a principal took"""
+		with self._lock:
+			if hit:
+				self._hits += 1
+				self._hit_time_total += elapsed
+			else:
+				self._misses += 1
+				self._miss_time_total += elapsed
+
+	def invalidate_user(self, username: str) -> None:
+		"""Drop every cached token of a user"""
+		self.cache.invalidate_tag(username)
+
+	def clear(self) -> None:
+		"""Drop every cached principal"""
+		self.cache.clear()
+
+	def stats(self) -> Dict[str, Any]:
+		"""Return cache counters and the estimated verification time saved"""
+		with self._lock:
+			hit_avg = self._hit_time_total / self._hits if self._hits else 0.0
+			miss_avg = self._miss_time_total / self._misses if self._misses else 0.0
+			saved = max(miss_avg - hit_avg, 0.0) * self._hits
+		return {
+			**self.cache.stats(),
+			'hit_time_avg_ms': round(hit_avg * 1000, 3),
+			'miss_time_avg_ms': round(miss_avg * 1000, 3),
+			'time_saved_ms': round(saved * 1000, 3),
+		}
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
+
+
+def _decode_credentials(credentials: Optional[HTTPAuthorizationCredentials]) -> TokenPayload:
+	"""Check the signature and expiry of a bearer token and parse its payload
+
 	Raises:
-		HTTPException: If token is invalid or expired
+		HTTPException: If token is missing, invalid or expired
 	"""
 	if not credentials:
 		raise HTTPException(
@@ -59,21 +128,54 @@ async def verify_token(credentials: Optional[HTTPAuthorizationCredentials] = Dep
 		)
 
 
-async def get_current_user(token_payload: TokenPayload = Depends(verify_token)):
+async def verify_token(
+	credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+) -> TokenPayload:
+	"""Verify JWT token from request headers
+	
+	Args:
+		credentials: HTTP credentials from Authorization header
+		
+	Returns:
+		TokenPayload with decoded token information
+		
+	Raises:
+		HTTPException: If token is invalid or expired
+	"""
+	return _decode_credentials(credentials)
+
+
+async def get_current_user(
+	credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+	user_queries: UserQueries = Depends(get_user_queries),
+):
 	"""Get the current authenticated user from token
 	
+	Principals resolved from the same token are served from
+	``principal_cache`` until they expire or the user is changed.
+	
 	Args:
-		token_payload: Verified token payload
+		credentials: HTTP credentials from Authorization header
+		user_queries: Shared user queries (dependency injection)
 		
 	Returns:
-		Username of authenticated user
+		Authenticated user
 		
 	Raises:
-		HTTPException: If user not found in database
+		HTTPException: If token is invalid or user not found in database
 	"""
+	started_at = time.perf_counter()
+	if credentials:
+		cached = principal_cache.get(credentials.credentials)
+		if cached is not None:
+			principal_cache.record(True, time.perf_counter() - started_at)
+			return cached[1]
+	
+	token_payload = _decode_credentials(credentials)
 	username = token_payload.username
-	user_queries = UserQueries()
-	user = user_queries.get_user_by_username(username)
+	key = principal_cache.key(credentials.credentials)
+	version = principal_cache.cache.version(key, username)
+	user = await db_executor.run(user_queries.get_user_by_username, username)
 	
 	if user is None:
 		raise HTTPException(
@@ -82,6 +184,8 @@ async def get_current_user(token_payload: TokenPayload = Depends(verify_token)):
 			headers={'WWW-Authenticate': 'Bearer'}
 		)
 	
+	principal_cache.cache.put(key, (token_payload, user), version, tag=username)
+	principal_cache.record(False, time.perf_counter() - started_at)
 	return user
 
 
@@ -1,12 +1,12 @@
 """Data models for PyGliderCG backend"""
 
 from backend.models.glider import (
-	Glider, Limits, Arms, Weighing, Instrument,
+	Glider, GliderSummary, Limits, Arms, Weighing, Instrument,
 	DatumWeighingPoints, DatumPilotPosition, DATUMS, get_datum_image_by_label
 )
 
 __all__ = [
-	'Glider', 'Limits', 'Arms', 'Weighing', 'Instrument',
+	'Glider', 'GliderSummary', 'Limits', 'Arms', 'Weighing', 'Instrument',
 	'DatumWeighingPoints', 'DatumPilotPosition', 'DATUMS', 'get_datum_image_by_label'
 ]
 
@@ -5,6 +5,8 @@ from datetime import date
 from enum import Enum
 from typing import List, Tuple, Optional
 
+import numpy as np
+
 
 class DatumWeighingPoints(Enum):
 	DATUM_WING_2POINTS_AFT_OF_DATUM = 1
@@ -105,6 +107,23 @@ class Instrument:
 	date: Optional[date] = None
 
 
+@dataclass
+class GliderSummary:
+	"""Derived CG figures of a glider (None when they cannot be computed)"""
+	registration: str
+	model: str
+	mve: Optional[float] = None
+	mvenp: Optional[float] = None
+	empty_weight: Optional[float] = None
+	cv_max: Optional[float] = None
+	cu_max: Optional[float] = None
+	cu: Optional[float] = None
+	pilot_av_mini: Optional[float] = None
+	pilot_av_mini_duo: Optional[float] = None
+	pilot_av_maxi: Optional[float] = None
+	empty_arm: Optional[float] = None
+
+
 @dataclass
 class Glider:
 	"""Main Glider data model with CG calculation methods"""
@@ -137,6 +156,22 @@ class Glider:
 		"""Get the most recent weighing"""
 		return max(self.weighings, key=lambda x: x.date) if len(self.weighings) > 0 else None
 
+	def summary(self) -> GliderSummary:
+		"""Compute every derived CG figure, leaving out those that cannot be computed"""
+		summary = GliderSummary(registration=self.registration, model=self.model)
+		last_weighing = self.last_weighing()
+		if last_weighing is not None:
+			summary.empty_weight = last_weighing.mve()
+			summary.mve = last_weighing.mve()
+			summary.mvenp = last_weighing.mvenp()
+
+		for name in ('cv_max', 'cu_max', 'cu', 'pilot_av_mini', 'pilot_av_mini_duo', 'pilot_av_maxi', 'empty_arm'):
+			try:
+				setattr(summary, name, getattr(self, name)())
+			except (ValueError, NotImplementedError, ZeroDivisionError):
+				setattr(summary, name, None)
+		return summary
+
 	def empty_weight(self) -> float:
 		"""Empty weight (mass à vide équipée) in kg"""
 		last_weighing = self.last_weighing()
@@ -241,6 +276,20 @@ class Glider:
 	def weight_and_balance_calculator(self, front_pilot_weight, rear_pilot_weight, front_ballast_weight, rear_ballast_weight, wing_water_ballast_weight):
 		"""Calculate total weight and center of gravity for given loading
 		Returns tuple of (total_weight_kg, cg_mm)"""
+		return self._weight_and_balance(front_pilot_weight, rear_pilot_weight, front_ballast_weight, rear_ballast_weight, wing_water_ballast_weight)
+
+	def weight_and_balance_batch(self, front_pilot_weight, rear_pilot_weight, front_ballast_weight, rear_ballast_weight, wing_water_ballast_weight) -> Tuple[np.ndarray, np.ndarray]:
+		"""Calculate total weight and center of gravity for many loadings at once
+		Loads are broadcast NumPy arrays; element i gives the same result as
+		weight_and_balance_calculator called with the loads at index i.
+		Returns tuple of arrays (total_weight_kg, cg_mm)"""
+		loads = np.broadcast_arrays(*(np.asarray(load, dtype=np.float64) for load in (
+			front_pilot_weight, rear_pilot_weight, front_ballast_weight, rear_ballast_weight, wing_water_ballast_weight,
+		)))
+		return self._weight_and_balance(*loads)
+
+	def _weight_and_balance(self, front_pilot_weight, rear_pilot_weight, front_ballast_weight, rear_ballast_weight, wing_water_ballast_weight):
+		"""Shared arithmetic of the scalar and batch calculators (floats or NumPy arrays)"""
 		glider_weight = self.empty_weight() + front_pilot_weight + rear_pilot_weight + front_ballast_weight + rear_ballast_weight + wing_water_ballast_weight
 		if self.arms is None:
 			raise ValueError('Arms data is missing for this glider')
@@ -1,7 +1,7 @@
 """Pydantic schemas for audit log API requests and responses"""
 
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -37,17 +37,21 @@ class AuditLogResponse(BaseModel):
 
 class AuditLogListResponse(BaseModel):
 	"""Response body for listing audit logs"""
-	total: int = Field(..., description='Total number of audit log entries')
+	total: Optional[int] = Field(..., description='Number of matching audit log entries (null when not counted)')
+	total_exact: bool = Field(True, description='False when total is an estimate or a lower bound')
 	skip: int = Field(..., description='Number of entries skipped')
 	limit: int = Field(..., description='Limit used in query')
+	next_cursor: Optional[str] = Field(None, description='Cursor of the next page (null on the last page)')
 	items: List[AuditLogResponse] = Field(..., description='List of audit log entries')
 
 	class Config:
 		json_schema_extra = {
 			'example': {
 				'total': 150,
+				'total_exact': True,
 				'skip': 0,
 				'limit': 10,
+				'next_cursor': 'MjAyNC0wMS0xNVQxMDozMDo0NS4xMjM0NTZ8MTUw',
 				'items': [
 					{
 						'timestamp': '2024-01-15T10:30:45.123456Z',
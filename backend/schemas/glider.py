@@ -1,9 +1,9 @@
 """Pydantic schemas for Glider API endpoints"""
 
 from datetime import date as DateType
-from typing import List, Tuple, Optional
+from typing import List, Literal, Tuple, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, NonNegativeFloat, model_validator
 
 from backend.models.glider import DatumWeighingPoints, DatumPilotPosition
 
@@ -169,7 +169,103 @@ class WeightBalanceCalculationRequest(BaseModel):
 	wing_water_ballast_weight: float = Field(..., ge=0)
 
 
+class FleetCalculationRequest(WeightBalanceCalculationRequest):
+	"""Request for evaluating one loading against several gliders"""
+	model: Optional[str] = Field(None, description='Only gliders of this model')
+	brand: Optional[str] = Field(None, description='Only gliders of this brand')
+	single_seat: Optional[bool] = Field(None, description='Only single or dual seat gliders')
+	registrations: Optional[List[str]] = Field(None, description='Only these registrations')
+
+
+class FleetCalculationResult(BaseModel):
+	"""Weight and balance of one glider in a fleet calculation"""
+	registration: str
+	model: str
+	total_weight: Optional[float] = None
+	center_of_gravity: Optional[float] = None
+	in_envelope: Optional[bool] = None
+	envelope_margin: Optional[float] = None
+	min_ballast: Optional[float] = Field(None, description='Front ballast (kg) needed to be inside the envelope')
+	error: Optional[str] = None
+
+
 class WeightBalanceCalculationResponse(BaseModel):
 	"""Response from weight and balance calculation"""
 	total_weight: float
 	center_of_gravity: float
+	in_envelope: Optional[bool] = Field(None, description='Loading lies inside the weight and balance envelope')
+	envelope_margin: Optional[float] = Field(None, description='Distance to the envelope boundary, negative outside')
+
+
+class LoadRange(BaseModel):
+	"""Evenly spaced loads from start to stop (inclusive) in kg"""
+	start: float = Field(..., ge=0)
+	stop: float = Field(..., ge=0)
+	step: float = Field(..., gt=0)
+
+	@model_validator(mode='after')
+	def check_bounds(self) -> 'LoadRange':
+		if self.stop < self.start:
+			raise ValueError('stop must be greater than or equal to start')
+		return self
+
+
+LoadValues = Union[List[NonNegativeFloat], LoadRange]
+
+
+class WeightBalanceBatchRequest(BaseModel):
+	"""Request for weight and balance calculation of many loadings
+
+	Each load is a list of weights or a range. In ``zip`` mode the lists are
+	paired element by element (single values are repeated); in ``grid`` mode
+	every combination of the loads is evaluated.
+	"""
+	mode: Literal['zip', 'grid'] = 'zip'
+	front_pilot_weight: LoadValues = Field(default_factory=lambda: [0.0])
+	rear_pilot_weight: LoadValues = Field(default_factory=lambda: [0.0])
+	front_ballast_weight: LoadValues = Field(default_factory=lambda: [0.0])
+	rear_ballast_weight: LoadValues = Field(default_factory=lambda: [0.0])
+	wing_water_ballast_weight: LoadValues = Field(default_factory=lambda: [0.0])
+
+
+class WeightBalanceBatchResponse(BaseModel):
+	"""Column-oriented results of a batch weight and balance calculation"""
+	count: int
+	front_pilot_weight: List[float]
+	rear_pilot_weight: List[float]
+	front_ballast_weight: List[float]
+	rear_ballast_weight: List[float]
+	wing_water_ballast_weight: List[float]
+	total_weight: List[float]
+	center_of_gravity: List[float]
+	in_envelope: Optional[List[bool]] = None
+	envelope_margin: Optional[List[float]] = None
+
+
+class BallastOptimizationRequest(BaseModel):
+	"""Request for the feasible ballast ranges of a crew"""
+	front_pilot_weight: float = Field(..., ge=0)
+	rear_pilot_weight: float = Field(0.0, ge=0)
+	step: float = Field(0.5, ge=0.01, le=10, description='Search resolution in kg')
+
+
+class BallastRange(BaseModel):
+	"""Feasible amounts of one ballast in kg (None when no amount is feasible)"""
+	available: bool = Field(..., description='Glider has an arm for this ballast')
+	min: Optional[float] = None
+	max: Optional[float] = None
+
+
+class BallastOptimizationResponse(BaseModel):
+	"""Feasible range of each ballast, the other ballasts being empty"""
+	registration: str
+	step: float
+	front_ballast: BallastRange
+	rear_ballast: BallastRange
+	wing_water_ballast: BallastRange
+
+
+class WeighingPackRequest(BaseModel):
+	"""Request for the latest weighing sheet of several gliders in one file"""
+	registrations: Optional[List[str]] = Field(None, description='Only these registrations (the whole fleet when omitted)')
+	format: Literal['zip', 'pdf'] = Field('zip', description='One PDF per glider in a zip, or a single merged PDF')
@@ -0,0 +1,449 @@
+"""Database export archives: manifest with checksums, streamed zip output and validated extraction"""
+
+import hashlib
+import json
+import logging
+import os
+import zipfile
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+from backend.init_db import SCHEMA_VERSION
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+ARCHIVE_FORMAT = 'pyglidercg-export'
+ARCHIVE_FORMAT_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+
+# Files every EXPORT DATABASE directory contains
+EXPORT_SCRIPTS = ('schema.sql', 'load.sql')
+# Directory of a full export holding the Parquet audit archive partitions
+AUDIT_ARCHIVE_DIR = 'audit_archive'
+# Tables an imported database must contain once migrated
+REQUIRED_TABLES = ('USERS', 'GLIDER', 'WEIGHING', 'WB_LIMIT', 'INVENTORY', 'AUDITLOG')
+
+# Tables a partial export can contain, in the order they are applied on import
+EXPORTABLE_TABLES = ('USERS', 'GLIDER', 'WB_LIMIT', 'WEIGHING', 'INVENTORY', 'AUDITLOG')
+# Tables whose rows belong to a glider: an incremental export carries all
+# the rows of every glider changed since the watermark
+GLIDER_TABLES = ('GLIDER', 'WB_LIMIT', 'WEIGHING', 'INVENTORY')
+# Child tables keeping their exported ids, with the sequence advanced past them
+CHILD_ID_SEQUENCES = {'WEIGHING': 'auto_increment', 'INVENTORY': 'inventory_id_seq'}
+
+ARCHIVE_KINDS = ('full', 'partial')
+
+
+class ArchiveValidationError(ValueError):
+	"""Raised when an uploaded archive is not a usable database export"""
+
+
+def file_sha256(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+	"""Return the SHA-256 hex digest of a file, read in chunks"""
+	digest = hashlib.sha256()
+	with open(path, 'rb') as f:
+		for chunk in iter(lambda: f.read(chunk_size), b''):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+
+def build_manifest(export_dir: str, partial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+	"""Describe the files of an export directory
+
+	Args:
+		export_dir: EXPORT DATABASE directory, or one written by ``export_tables``
+		partial: Description returned by ``export_tables`` for a partial export
+
+	Returns:
+		Manifest with the archive format, kind and schema version and the
+		size and SHA-256 of every file keyed by its path relative to export_dir
+	"""
+	files = {}
+	for root, _dirs, names in os.walk(export_dir):
+		for name in sorted(names):
+			path = os.path.join(root, name)
+			arcname = os.path.relpath(path, export_dir).replace(os.sep, '/')
+			files[arcname] = {'size': os.path.getsize(path), 'sha256': file_sha256(path)}
+	manifest = {
+		'format': ARCHIVE_FORMAT,
+		'format_version': ARCHIVE_FORMAT_VERSION,
+		'kind': 'partial' if partial else 'full',
+		'schema_version': SCHEMA_VERSION,
+		'created_at': datetime.now(timezone.utc).isoformat(),
+		'files': files,
+	}
+	if partial:
+		manifest.update(partial)
+	return manifest
+
+
+def table_file(table: str) -> str:
+	"""Name of the Parquet file of a table in a partial export"""
+	return f'{table.lower()}.parquet'
+
+
+def export_tables(conn, export_dir: str, tables: Sequence[str], since: Optional[datetime] = None) -> Dict[str, Any]:
+	"""Write selected tables, or only their rows changed after ``since``, as Parquet
+
+	With ``since``, glider tables hold every row of the gliders changed
+	after it (GLIDER_CHANGE), AUDITLOG the entries stamped after it, and
+	USERS, which has no deletion tracking, all its rows. The queries should
+	run in one transaction so the files and the returned watermark describe
+	the same snapshot.
+
+	Args:
+		conn: DuckDB cursor
+		export_dir: Existing directory receiving one file per table
+		tables: Names from EXPORTABLE_TABLES
+		since: Naive UTC watermark, or None to export the tables whole
+
+	Returns:
+		The partial export description merged into the manifest: tables,
+		since, the ``until`` watermark for the next export, and the changed
+		and deleted glider registrations
+	"""
+	until = conn.execute("SELECT now() AT TIME ZONE 'UTC'").fetchone()[0]
+	if since is None:
+		changed_filter, params = '', []
+		changed = [row[0] for row in conn.execute('SELECT registration FROM GLIDER ORDER BY registration').fetchall()]
+		deleted = []
+	else:
+		changed_filter = 'WHERE registration IN (SELECT registration FROM GLIDER_CHANGE WHERE changed_at > ? AND NOT deleted)'
+		params = [since]
+		rows = conn.execute(
+			'SELECT registration, deleted FROM GLIDER_CHANGE WHERE changed_at > ? ORDER BY registration', [since]
+		).fetchall()
+		changed = [registration for registration, is_deleted in rows if not is_deleted]
+		deleted = [registration for registration, is_deleted in rows if is_deleted]
+
+	for table in tables:
+		path = os.path.join(export_dir, table_file(table))
+		if table in GLIDER_TABLES:
+			query, query_params = f'SELECT * FROM {table} {changed_filter}', params
+		elif table == 'AUDITLOG' and since is not None:
+			query, query_params = 'SELECT * FROM AUDITLOG WHERE timestamp > ? ORDER BY id', [since]
+		else:
+			query, query_params = f'SELECT * FROM {table}', []
+		conn.execute(f"COPY ({query}) TO '{path}' (FORMAT PARQUET)", query_params)
+
+	has_glider_tables = any(table in GLIDER_TABLES for table in tables)
+	return {
+		'tables': list(tables),
+		'since': since.isoformat() if since else None,
+		'until': until.isoformat(),
+		'gliders': {
+			'changed': changed if has_glider_tables else [],
+			'deleted': deleted if has_glider_tables else [],
+		},
+	}
+
+
+def apply_partial(conn, import_dir: str, manifest: Dict[str, Any]) -> None:
+	"""Upsert the tables of an extracted partial export into the database
+
+	Deleted gliders are removed with their rows. The rows of every changed
+	glider in the exported child tables are replaced by the exported ones,
+	GLIDER and USERS rows are inserted or replaced, and audit entries not
+	already present are appended with ids from this database. Weighing and
+	instrument rows keep their exported ids, so applying an export twice
+	leaves the same rows, and their sequences are advanced past them.
+	Everything but the glider deletions runs in one transaction.
+
+	Args:
+		conn: DuckDB cursor on the live database
+		import_dir: Directory the archive was extracted to
+		manifest: Manifest of a partial export, checked by ``read_manifest``
+
+	Raises:
+		ArchiveValidationError: If exported rows belong to gliders missing
+			from both the export and this database, or reuse the id of a
+			local row of another glider; nothing is applied then
+	"""
+	tables = [table for table in EXPORTABLE_TABLES if table in manifest['tables']]
+	changed = manifest['gliders']['changed']
+	deleted = manifest['gliders']['deleted']
+
+	def source(table: str) -> str:
+		return f"read_parquet('{os.path.join(import_dir, table_file(table))}')"
+
+	_check_glider_rows(conn, tables, source, changed, deleted)
+
+	if deleted:
+		# DuckDB rejects deleting a parent row in the transaction that
+		# deleted its children, so deleted gliders go first, statement by
+		# statement as delete_glider does; replaying them is harmless
+		for table in ('WEIGHING', 'WB_LIMIT', 'INVENTORY', 'GLIDER_SUMMARY', 'GLIDER'):
+			conn.execute(f'DELETE FROM {table} WHERE registration = ANY(?)', [deleted])
+		conn.execute(
+			"INSERT OR REPLACE INTO GLIDER_CHANGE SELECT unnest(?), now() AT TIME ZONE 'UTC', true",
+			[deleted],
+		)
+
+	conn.execute('BEGIN TRANSACTION')
+	try:
+		for table in tables:
+			if table in GLIDER_TABLES and table != 'GLIDER' and changed:
+				conn.execute(f'DELETE FROM {table} WHERE registration = ANY(?)', [changed])
+		for table in tables:
+			if table in ('GLIDER', 'USERS'):
+				conn.execute(f'INSERT OR REPLACE INTO {table} BY NAME SELECT * FROM {source(table)}')
+			elif table in CHILD_ID_SEQUENCES:
+				conn.execute(f'INSERT OR REPLACE INTO {table} BY NAME SELECT * FROM {source(table)}')
+				_advance_sequence(conn, CHILD_ID_SEQUENCES[table], table)
+			elif table == 'AUDITLOG':
+				conn.execute(f'''
+					INSERT INTO AUDITLOG BY NAME
+					SELECT * EXCLUDE (id) FROM {source(table)} AS entry
+					WHERE NOT EXISTS (
+						SELECT 1 FROM AUDITLOG
+						WHERE AUDITLOG.timestamp = entry.timestamp
+						AND AUDITLOG.username IS NOT DISTINCT FROM entry.username
+						AND AUDITLOG.event IS NOT DISTINCT FROM entry.event
+					)
+					ORDER BY timestamp
+				''')
+			else:
+				conn.execute(f'INSERT INTO {table} BY NAME SELECT * FROM {source(table)}')
+		if changed and any(table in GLIDER_TABLES for table in tables):
+			conn.execute(
+				"INSERT OR REPLACE INTO GLIDER_CHANGE "
+				"SELECT registration, now() AT TIME ZONE 'UTC', false FROM GLIDER WHERE registration = ANY(?)",
+				[changed],
+			)
+		conn.execute('COMMIT')
+	except Exception:
+		conn.execute('ROLLBACK')
+		raise
+
+
+def _check_glider_rows(conn, tables: Sequence[str], source: Callable[[str], str], changed: list, deleted: list) -> None:
+	"""Reject a partial export whose child rows cannot be applied to this database"""
+	known = 'SELECT registration FROM GLIDER WHERE registration <> ALL(?)'
+	if 'GLIDER' in tables:
+		known += f' UNION SELECT registration FROM {source("GLIDER")}'
+	for table in tables:
+		if table not in GLIDER_TABLES or table == 'GLIDER':
+			continue
+		missing = [row[0] for row in conn.execute(
+			f'SELECT DISTINCT registration FROM {source(table)} WHERE registration NOT IN ({known}) ORDER BY 1',
+			[deleted],
+		).fetchall()]
+		if missing:
+			raise ArchiveValidationError(f'{table} rows belong to gliders missing from this database: {", ".join(missing)}')
+		if table in CHILD_ID_SEQUENCES:
+			# Rows of changed or deleted gliders are removed before the insert
+			clashes = conn.execute(
+				f'''SELECT count(*) FROM {table} AS local JOIN {source(table)} AS exported USING (id)
+				   WHERE local.registration <> exported.registration
+				   AND local.registration <> ALL(?)''',
+				[changed + deleted],
+			).fetchone()[0]
+			if clashes:
+				raise ArchiveValidationError(f'{clashes} {table} ids are used by other gliders in this database')
+
+
+def _advance_sequence(conn, sequence: str, table: str) -> None:
+	"""Draw values from a sequence until it is past the largest id of a table"""
+	conn.execute(
+		f'''SELECT max(nextval('{sequence}')) FROM range((
+			SELECT coalesce(max(id), 0) FROM {table}) - (
+			SELECT coalesce(last_value, start_value - 1) FROM duckdb_sequences() WHERE sequence_name = ?))''',
+		[sequence],
+	)
+
+
+class _ChunkSink:
+	"""Write-only, non-seekable file object collecting zip output until it is drained"""
+
+	def __init__(self):
+		self._buffer = bytearray()
+		self._position = 0
+
+	def write(self, data) -> int:
+		self._buffer.extend(data)
+		self._position += len(data)
+		return len(data)
+
+	def tell(self) -> int:
+		return self._position
+
+	def seekable(self) -> bool:
+		return False
+
+	def flush(self) -> None:
+		pass
+
+	def drain(self) -> bytes:
+		data = bytes(self._buffer)
+		self._buffer.clear()
+		return data
+
+	@property
+	def pending(self) -> int:
+		"""Number of bytes written since the last drain"""
+		return len(self._buffer)
+
+
+def iter_zip(export_dir: str, manifest: Dict[str, Any], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+	"""Yield a zip archive of export_dir chunk by chunk
+
+	The manifest is the first entry, followed by the files it lists, each
+	read in chunks of ``chunk_size`` bytes, so memory use does not depend on
+	the size of the export. Parquet files are already compressed and are
+	stored as is; the SQL scripts are deflated.
+	"""
+	sink = _ChunkSink()
+	with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zipf:
+		zipf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+		for arcname in manifest['files']:
+			info = zipfile.ZipInfo(arcname, date_time=datetime.now().timetuple()[:6])
+			info.compress_type = zipfile.ZIP_STORED if arcname.endswith('.parquet') else zipfile.ZIP_DEFLATED
+			with open(os.path.join(export_dir, arcname), 'rb') as source, zipf.open(info, 'w', force_zip64=True) as target:
+				for chunk in iter(lambda: source.read(chunk_size), b''):
+					target.write(chunk)
+					if sink.pending >= chunk_size:
+						yield sink.drain()
+	data = sink.drain()
+	if data:
+		yield data
+
+
+def _check_entry_name(name: str) -> None:
+	parts = name.split('/')
+	if name.startswith('/') or '\\' in name or ':' in parts[0] or '..' in parts:
+		raise ArchiveValidationError(f'Unsafe path in archive: {name}')
+
+
+def read_manifest(archive_path: str) -> Optional[Dict[str, Any]]:
+	"""Check the structure of an export archive without reading its data
+
+	The manifest must describe a supported archive format whose schema is
+	not newer than this server, and list exactly the files of the archive
+	with their sizes: the export scripts for a full export, one Parquet
+	file per table for a partial one. Archives written before manifests
+	existed are accepted if they contain the export scripts; their files
+	cannot be verified.
+
+	Args:
+		archive_path: Path to the zip archive
+
+	Returns:
+		The manifest, or None for an archive without one
+
+	Raises:
+		zipfile.BadZipFile: If the file is not a zip archive
+		ArchiveValidationError: If the archive is not a valid database export
+	"""
+	with zipfile.ZipFile(archive_path, 'r') as archive:
+		infos = {info.filename: info for info in archive.infolist() if not info.is_dir()}
+		for name in infos:
+			_check_entry_name(name)
+
+		if MANIFEST_NAME not in infos:
+			missing = [name for name in EXPORT_SCRIPTS if name not in infos]
+			if missing:
+				raise ArchiveValidationError(f'Archive has no {MANIFEST_NAME} and is missing {", ".join(missing)}')
+			logger.warning(f'Archive {archive_path} has no {MANIFEST_NAME}, its files cannot be verified')
+			return None
+
+		try:
+			manifest = json.loads(archive.read(MANIFEST_NAME))
+		except ValueError as e:
+			raise ArchiveValidationError(f'Unreadable {MANIFEST_NAME}: {e}')
+
+	if not isinstance(manifest, dict) or manifest.get('format') != ARCHIVE_FORMAT:
+		raise ArchiveValidationError(f'Not a {ARCHIVE_FORMAT} archive')
+	if manifest.get('format_version') != ARCHIVE_FORMAT_VERSION:
+		raise ArchiveValidationError(f'Unsupported archive format version {manifest.get("format_version")}')
+	schema_version = manifest.get('schema_version')
+	if not isinstance(schema_version, int) or schema_version > SCHEMA_VERSION:
+		raise ArchiveValidationError(f'Archive schema version {schema_version} is not supported (server schema version {SCHEMA_VERSION})')
+
+	files = manifest.get('files')
+	if not isinstance(files, dict):
+		raise ArchiveValidationError(f'{MANIFEST_NAME} does not list the archive files')
+	listed = set(files)
+	present = set(infos) - {MANIFEST_NAME}
+	if listed != present:
+		raise ArchiveValidationError(
+			f'Archive files do not match {MANIFEST_NAME} '
+			f'(missing: {sorted(listed - present)}, unexpected: {sorted(present - listed)})'
+		)
+	for name, entry in files.items():
+		if infos[name].file_size != entry.get('size'):
+			raise ArchiveValidationError(f'Size of {name} does not match {MANIFEST_NAME}')
+
+	kind = manifest.setdefault('kind', 'full')
+	if kind not in ARCHIVE_KINDS:
+		raise ArchiveValidationError(f'Unsupported archive kind {kind}')
+	if kind == 'full':
+		expected = [name for name in EXPORT_SCRIPTS if name not in files]
+		if expected:
+			raise ArchiveValidationError(f'Archive is missing {", ".join(expected)}')
+		return manifest
+
+	tables = manifest.get('tables')
+	if not isinstance(tables, list) or not tables or not set(tables) <= set(EXPORTABLE_TABLES):
+		raise ArchiveValidationError(f'Partial archive tables must be among {", ".join(EXPORTABLE_TABLES)}')
+	if listed != {table_file(table) for table in tables}:
+		raise ArchiveValidationError('Partial archive files do not match its tables')
+	gliders = manifest.get('gliders')
+	if not isinstance(gliders, dict) or not all(
+		isinstance(gliders.get(key), list) and all(isinstance(value, str) for value in gliders[key])
+		for key in ('changed', 'deleted')
+	):
+		raise ArchiveValidationError(f'{MANIFEST_NAME} does not list changed and deleted gliders')
+	return manifest
+
+
+def extract_archive(
+	archive_path: str,
+	manifest: Optional[Dict[str, Any]],
+	target_dir: str,
+	progress: Optional[Callable[[int, int], None]] = None,
+	chunk_size: int = CHUNK_SIZE,
+) -> None:
+	"""Extract the files of an export archive, verifying their checksums
+
+	Each file is copied in chunks of ``chunk_size`` bytes while its SHA-256
+	is computed, so it is read once and never held in memory.
+
+	Args:
+		archive_path: Path to the zip archive, checked by ``read_manifest``
+		manifest: Its manifest (None extracts every file unverified)
+		target_dir: Directory receiving the files
+		progress: Called with (bytes extracted, total bytes) after each chunk
+
+	Raises:
+		ArchiveValidationError: If a file does not match its checksum
+	"""
+	with zipfile.ZipFile(archive_path, 'r') as archive:
+		if manifest is None:
+			names = [info.filename for info in archive.infolist() if not info.is_dir()]
+		else:
+			names = list(manifest['files'])
+		total = sum(archive.getinfo(name).file_size for name in names) or 1
+		done = 0
+		for name in names:
+			_check_entry_name(name)
+			path = os.path.join(target_dir, *name.split('/'))
+			os.makedirs(os.path.dirname(path), exist_ok=True)
+			digest = hashlib.sha256()
+			with archive.open(name) as source, open(path, 'wb') as target:
+				for chunk in iter(lambda: source.read(chunk_size), b''):
+					digest.update(chunk)
+					target.write(chunk)
+					done += len(chunk)
+					if progress is not None:
+						progress(done, total)
+			if manifest is not None and digest.hexdigest() != manifest['files'][name]['sha256']:
+				raise ArchiveValidationError(f'Checksum of {name} does not match {MANIFEST_NAME}')
+
+
+def check_tables(conn) -> None:
+	"""Raise ArchiveValidationError if an imported database lacks a required table"""
+	tables = {row[0].upper() for row in conn.execute('SELECT table_name FROM duckdb_tables()').fetchall()}
+	missing = [name for name in REQUIRED_TABLES if name not in tables]
+	if missing:
+		raise ArchiveValidationError(f'Imported database is missing tables {", ".join(missing)}')
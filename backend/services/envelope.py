@@ -0,0 +1,110 @@
+"""Weight and balance envelope checks backed by shapely
+
+shapely is imported when the first envelope is built, so that processes
+which never check a loading do not load it.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
+
+from backend.cache import VersionedLRUCache
+from backend.config import get_settings
+from backend.models.glider import Glider
+
+if TYPE_CHECKING:
+	from shapely.geometry import Polygon
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+envelope_cache = VersionedLRUCache('envelopes', max_entries=settings.GLIDER_CACHE_SIZE, ttl=0)
+
+
+class Envelope:
+	"""Prepared weight and balance envelope of a glider
+
+	The envelope lives in the (CG mm, total weight kg) plane. It is the
+	polygon of the glider's WB_LIMIT points, or when fewer than three
+	points are stored, the box between the front and rear centering limits
+	up to the maximum weight (mmwp).
+	"""
+
+	def __init__(self, polygon: 'Polygon', source: str):
+		"""Prepare a polygon for repeated queries
+
+		Args:
+			polygon: Envelope polygon with x = CG (mm) and y = total weight (kg)
+			source: 'polygon' for WB_LIMIT points, 'limits' for the centering box
+		"""
+		import shapely
+
+		if not polygon.is_valid:
+			polygon = polygon.buffer(0)
+		shapely.prepare(polygon)
+		self.polygon = polygon
+		self.boundary = polygon.boundary
+		shapely.prepare(self.boundary)
+		self.source = source
+
+	def contains(self, total_weight, cg) -> np.ndarray:
+		"""Tell which points lie inside the envelope, boundary included"""
+		import shapely
+
+		return shapely.intersects_xy(self.polygon, cg, total_weight)
+
+	def signed_distance(self, total_weight, cg) -> np.ndarray:
+		"""Distance of each point to the envelope boundary, positive inside and negative outside"""
+		return self.check(total_weight, cg)[1]
+
+	def check(self, total_weight, cg) -> Tuple[np.ndarray, np.ndarray]:
+		"""Return (inside, signed distance) for scalar or array points"""
+		import shapely
+
+		total_weight = np.asarray(total_weight, dtype=np.float64)
+		cg = np.asarray(cg, dtype=np.float64)
+		inside = self.contains(total_weight, cg)
+		distance = shapely.distance(self.boundary, shapely.points(cg, total_weight))
+		return inside, np.where(inside, distance, -distance)
+
+
+def _envelope_key(glider: Glider) -> tuple:
+	"""Data the envelope of a glider is built from"""
+	limits = glider.limits
+	return (
+		tuple((float(cg), float(weight)) for cg, weight in glider.weight_and_balances),
+		(limits.front_centering, limits.rear_centering, limits.mmwp) if limits else None,
+	)
+
+
+def _build_envelope(glider: Glider) -> Optional[Envelope]:
+	from shapely.geometry import Polygon, box
+
+	if len(glider.weight_and_balances) >= 3:
+		return Envelope(Polygon(glider.weight_and_balances), 'polygon')
+	if glider.limits is not None:
+		limits = glider.limits
+		return Envelope(box(limits.front_centering, 0.0, limits.rear_centering, limits.mmwp), 'limits')
+	return None
+
+
+def get_envelope(glider: Glider) -> Optional[Envelope]:
+	"""Return the prepared envelope of a glider, building it on first use
+
+	Envelopes are cached per registration and rebuilt when the WB_LIMIT
+	points or limits they were built from have changed.
+
+	Returns:
+		Envelope, or None if the glider has neither WB_LIMIT points nor limits
+	"""
+	key = _envelope_key(glider)
+	cached = envelope_cache.get(glider.registration)
+	if cached is not None and cached[0] == key:
+		return cached[1]
+
+	version = envelope_cache.version(glider.registration)
+	envelope = _build_envelope(glider)
+	logger.debug(f'Built {envelope.source if envelope else "no"} envelope for glider {glider.registration}')
+	envelope_cache.put(glider.registration, (key, envelope), version)
+	return envelope
@@ -0,0 +1,141 @@
+"""In-process registry of long-running background jobs and their progress"""
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed')
+
+# Finished jobs kept for status queries before the oldest are forgotten
+MAX_FINISHED_JOBS = 100
+
+
+def _now() -> str:
+	return datetime.now(timezone.utc).isoformat()
+
+
+class JobRegistry:
+	"""Track background jobs so clients can poll their progress
+
+	A job is a dict with its ``id``, ``kind``, ``status`` (one of
+	JOB_STATUSES), the current ``stage``, a ``progress`` fraction between 0
+	and 1, and the ``result`` or ``error`` once it finished. Jobs live in
+	this process only; the ``max_finished`` most recent finished jobs are
+	kept.
+	"""
+
+	def __init__(self, max_finished: int = MAX_FINISHED_JOBS):
+		"""Create an empty registry
+
+		Args:
+			max_finished: Number of finished jobs kept for status queries
+		"""
+		self.max_finished = max_finished
+		self._jobs: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def _new_job(kind: str, owner: Optional[str]) -> Dict[str, Any]:
+		return {
+			'id': uuid.uuid4().hex,
+			'kind': kind,
+			'owner': owner,
+			'status': 'queued',
+			'stage': 'queued',
+			'progress': 0.0,
+			'result': None,
+			'error': None,
+			'created_at': _now(),
+			'started_at': None,
+			'finished_at': None,
+		}
+
+	def create(self, kind: str, owner: Optional[str] = None) -> Dict[str, Any]:
+		"""Register a queued job and return a copy of it"""
+		job = self._new_job(kind, owner)
+		with self._lock:
+			self._jobs[job['id']] = job
+			self._prune()
+			return dict(job)
+
+	def reserve(self, kind: str, owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
+		"""Register a queued job unless one of this kind is queued or running
+
+		The check and the registration happen under one lock, so of two
+		concurrent callers only one gets a job.
+
+		Returns:
+			A copy of the new job, or None if one of this kind is already active
+		"""
+		job = self._new_job(kind, owner)
+		with self._lock:
+			if any(other['kind'] == kind and other['status'] in ('queued', 'running') for other in self._jobs.values()):
+				return None
+			self._jobs[job['id']] = job
+			self._prune()
+			return dict(job)
+
+	def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+		"""Return a copy of a job, or None if it is unknown or was forgotten"""
+		with self._lock:
+			job = self._jobs.get(job_id)
+			return dict(job) if job is not None else None
+
+	def is_running(self, kind: str) -> bool:
+		"""True when a job of this kind is queued or running"""
+		with self._lock:
+			return any(job['kind'] == kind and job['status'] in ('queued', 'running') for job in self._jobs.values())
+
+	def update(self, job_id: str, stage: str, progress: Optional[float] = None) -> None:
+		"""Move a job to a new stage, marking it running
+
+		Args:
+			job_id: Job to update
+			stage: Name of the step the job is in
+			progress: Fraction of the job done, between 0 and 1 (unchanged if None)
+		"""
+		with self._lock:
+			job = self._jobs.get(job_id)
+			if job is None:
+				return
+			if job['status'] == 'queued':
+				job['status'] = 'running'
+				job['started_at'] = _now()
+			job['stage'] = stage
+			if progress is not None:
+				job['progress'] = round(min(max(progress, 0.0), 1.0), 4)
+
+	def succeed(self, job_id: str, result: Any = None) -> None:
+		"""Mark a job as succeeded with an optional result"""
+		self._finish(job_id, 'succeeded', result=result)
+
+	def fail(self, job_id: str, error: str) -> None:
+		"""Mark a job as failed with an error message"""
+		self._finish(job_id, 'failed', error=error)
+
+	def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+		with self._lock:
+			job = self._jobs.get(job_id)
+			if job is None:
+				return
+			job['status'] = status
+			job['stage'] = status
+			job['result'] = result
+			job['error'] = error
+			if status == 'succeeded':
+				job['progress'] = 1.0
+			job['finished_at'] = _now()
+			self._prune()
+
+	def _prune(self) -> None:
+		finished = [job_id for job_id, job in self._jobs.items() if job['status'] in ('succeeded', 'failed')]
+		for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+			del self._jobs[job_id]
+
+
+job_registry = JobRegistry()
@@ -0,0 +1,163 @@
+"""Cache of rendered PDFs keyed by a digest of their content"""
+
+import glob
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from backend.cache import VersionedLRUCache
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class PdfCache:
+	"""LRU cache of rendered PDFs, in memory and optionally on disk
+
+	Entries are keyed by a digest of everything printed on the document, so
+	a cached PDF is never stale: changed data yields a new key. Each entry
+	is tagged with the glider it belongs to, and the glider mutation paths
+	call ``invalidate_glider`` so that superseded PDFs are dropped at once
+	instead of waiting for eviction.
+
+	With a directory, entries are also written there as
+	``<glider digest>-<key>.pdf`` files, shared by every worker process
+	and kept across restarts. The least recently used files are removed
+	beyond ``max_files``.
+	"""
+
+	def __init__(self, name: str, max_entries: int, directory: str = '', max_files: int = 1024):
+		"""Create a cache
+
+		Args:
+			name: Cache name used in metrics
+			max_entries: Maximum number of PDFs kept in memory
+			directory: Directory persisting PDFs ('' keeps them in memory only)
+			max_files: Maximum number of PDFs kept in the directory
+		"""
+		self._memory = VersionedLRUCache(name, max_entries=max_entries, ttl=0)
+		self.directory = directory
+		self.max_files = max_files
+		self._lock = threading.Lock()
+		self._disk_hits = 0
+		self._disk_writes = 0
+		self._disk_errors = 0
+
+	@staticmethod
+	def _glider_digest(registration: str) -> str:
+		return hashlib.sha256(registration.encode('utf-8')).hexdigest()[:16]
+
+	def _path(self, registration: str, key: str) -> str:
+		return os.path.join(self.directory, f'{self._glider_digest(registration)}-{key}.pdf')
+
+	def version(self, registration: str, key: str) -> int:
+		"""Return the version token to pass to ``put`` for a PDF rendered now"""
+		return self._memory.version(key, registration)
+
+	def get(self, registration: str, key: str) -> Optional[bytes]:
+		"""Return a cached PDF from memory, or from disk, or None"""
+		data = self._memory.get(key)
+		if data is not None or not self.directory:
+			return data
+
+		version = self._memory.version(key, registration)
+		path = self._path(registration, key)
+		try:
+			with open(path, 'rb') as f:
+				data = f.read()
+			os.utime(path)
+		except FileNotFoundError:
+			return None
+		except OSError as e:
+			logger.warning(f'Error reading cached PDF {path}: {e}')
+			with self._lock:
+				self._disk_errors += 1
+			return None
+		with self._lock:
+			self._disk_hits += 1
+		self._memory.put(key, data, version, tag=registration)
+		return data
+
+	def put(self, registration: str, key: str, data: bytes, version: int) -> bool:
+		"""Store a PDF rendered under ``version``
+
+		Returns:
+			False when the glider was invalidated while the PDF was rendered
+		"""
+		if not self._memory.put(key, data, version, tag=registration):
+			return False
+		if self.directory:
+			self._write(self._path(registration, key), data)
+		return True
+
+	def _write(self, path: str, data: bytes) -> None:
+		try:
+			os.makedirs(self.directory, exist_ok=True)
+			fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+			with os.fdopen(fd, 'wb') as f:
+				f.write(data)
+			os.replace(temp_path, path)
+			self._prune()
+		except OSError as e:
+			logger.warning(f'Error writing cached PDF {path}: {e}')
+			with self._lock:
+				self._disk_errors += 1
+			return
+		with self._lock:
+			self._disk_writes += 1
+
+	def _prune(self) -> None:
+		"""Remove the least recently used files beyond ``max_files``"""
+		paths = glob.glob(os.path.join(self.directory, '*.pdf'))
+		if len(paths) <= self.max_files:
+			return
+		paths.sort(key=lambda path: os.stat(path).st_mtime if os.path.exists(path) else 0)
+		for path in paths[:len(paths) - self.max_files]:
+			try:
+				os.remove(path)
+			except FileNotFoundError:
+				pass
+
+	def _remove_files(self, pattern: str) -> None:
+		if not self.directory:
+			return
+		for path in glob.glob(os.path.join(self.directory, pattern)):
+			try:
+				os.remove(path)
+			except FileNotFoundError:
+				pass
+
+	def invalidate_glider(self, registration: str) -> None:
+		"""Drop the PDFs of a glider whose data changed"""
+		self._memory.invalidate_tag(registration)
+		self._remove_files(f'{self._glider_digest(registration)}-*.pdf')
+
+	def clear(self) -> None:
+		"""Drop every cached PDF"""
+		self._memory.clear()
+		self._remove_files('*.pdf')
+
+	def stats(self) -> Dict[str, Any]:
+		"""Return the memory cache counters and disk activity"""
+		stats = self._memory.stats()
+		with self._lock:
+			stats.update({
+				'directory': self.directory or None,
+				'disk_hits': self._disk_hits,
+				'disk_writes': self._disk_writes,
+				'disk_errors': self._disk_errors,
+			})
+		return stats
+
+
+settings = get_settings()
+
+weighing_pdf_cache = PdfCache(
+	'weighing_pdfs',
+	max_entries=settings.PDF_CACHE_SIZE,
+	directory=settings.PDF_CACHE_DIR,
+	max_files=settings.PDF_CACHE_DISK_SIZE,
+)
@@ -0,0 +1,328 @@
+"""Isolated worker processes rendering PDFs with timeouts and memory caps"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from backend.config import get_settings
+from backend.executors import BoundedExecutor
+from backend.services.weighing_pdf import WeighingPdfService
+
+logger = logging.getLogger(__name__)
+
+# Render times kept for the latency percentiles
+LATENCY_SAMPLES = 1000
+
+# Seconds a new worker gets to import its modules and run the initializer
+START_TIMEOUT = 60.0
+
+# Seconds a worker gets to exit on its own before it is killed
+STOP_TIMEOUT = 5.0
+
+
+class PdfWorkerError(RuntimeError):
+	"""Rendering failed in the worker process or the worker died"""
+
+
+class PdfQueueFullError(PdfWorkerError):
+	"""Too many renders are already waiting for a worker"""
+
+
+class PdfRenderTimeout(PdfWorkerError):
+	"""A render exceeded the pool timeout; its worker was restarted"""
+
+
+def _current_rss() -> int:
+	"""Resident set size of the current process in bytes"""
+	try:
+		with open('/proc/self/statm') as f:
+			return int(f.read().split()[1]) * resource.getpagesize()
+	except OSError:
+		# No procfs: fall back to the peak, in kilobytes except on macOS
+		peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _worker_main(conn, initializer: Optional[Callable]) -> None:
+	"""Run jobs received on ``conn`` until the pipe closes or None arrives
+
+	``ready`` is sent once the initializer ran. Each reply to a job is then
+	(status, payload, RSS): ``ok`` with the result,
+	``invalid`` with the message of a ValueError or NotImplementedError,
+	or ``error`` with a description of any other exception.
+	"""
+	if initializer is not None:
+		initializer()
+	conn.send('ready')
+	while True:
+		try:
+			job = conn.recv()
+		except (EOFError, OSError):
+			return
+		if job is None:
+			return
+		fn, args = job
+		try:
+			reply = ('ok', fn(*args))
+		except (ValueError, NotImplementedError) as e:
+			reply = ('invalid', str(e))
+		except Exception as e:
+			reply = ('error', f'{type(e).__name__}: {e}')
+		conn.send((*reply, _current_rss()))
+
+
+class _Worker:
+	"""One worker process and the parent end of its pipe"""
+
+	def __init__(self, context, initializer: Optional[Callable], name: str):
+		self.conn, child_conn = context.Pipe()
+		self.process = context.Process(target=_worker_main, args=(child_conn, initializer), name=name, daemon=True)
+		self.process.start()
+		child_conn.close()
+		self.ready = False
+
+	def wait_ready(self) -> None:
+		"""Wait for the worker to be initialized, so that job timeouts exclude its start"""
+		if self.ready:
+			return
+		try:
+			if not self.conn.poll(START_TIMEOUT):
+				raise PdfWorkerError(f'PDF worker did not start within {START_TIMEOUT:g} seconds')
+			self.conn.recv()
+		except (EOFError, OSError) as e:
+			raise PdfWorkerError(f'PDF worker died while starting: {e}') from e
+		self.ready = True
+
+	def stop(self, kill: bool = False) -> None:
+		if not kill and self.process.is_alive():
+			try:
+				self.conn.send(None)
+			except OSError:
+				pass
+			self.process.join(STOP_TIMEOUT)
+		if self.process.is_alive():
+			self.process.kill()
+			self.process.join()
+		self.conn.close()
+
+
+class PdfWorkerPool:
+	"""Fixed set of worker processes awaited from async route handlers
+
+	Work runs in spawned processes, so a slow or memory hungry render never
+	holds the GIL or grows the memory of the API process. A render running
+	longer than ``timeout`` raises PdfRenderTimeout and its worker is
+	killed; a worker whose RSS exceeds ``max_rss_mb`` after a job is
+	replaced, as is one that died. Calls made while ``max_queue`` others
+	already wait for a worker raise PdfQueueFullError. Workers start on
+	first use, or with ``start``.
+	"""
+
+	def __init__(
+		self,
+		name: str,
+		workers: int,
+		timeout: float,
+		max_rss_mb: int = 0,
+		max_queue: Optional[int] = None,
+		initializer: Optional[Callable] = None,
+	):
+		"""Create a pool
+
+		Args:
+			name: Pool name used in process names and metrics
+			workers: Number of worker processes
+			timeout: Seconds a job may run before its worker is killed
+			max_rss_mb: RSS in MB above which a worker is replaced (0 disables)
+			max_queue: Calls allowed to wait for a worker (None for no limit)
+			initializer: Picklable callable run once in every new worker
+		"""
+		self.name = name
+		self.workers = workers
+		self.timeout = timeout
+		self.max_rss_mb = max_rss_mb
+		self.max_queue = max_queue
+		self.initializer = initializer
+		self._context = multiprocessing.get_context('spawn')
+		self._dispatcher = BoundedExecutor(f'{name}-dispatch', workers)
+		self._idle: 'queue.Queue[_Worker]' = queue.Queue()
+		self._started = False
+		self._lock = threading.Lock()
+		self._pending = 0
+		self._completed = 0
+		self._failed = 0
+		self._timeouts = 0
+		self._rejected = 0
+		self._restarts = {'timeout': 0, 'memory': 0, 'crash': 0}
+		self._latencies: 'deque[float]' = deque(maxlen=LATENCY_SAMPLES)
+		self._spawned = 0
+
+	def _spawn(self) -> _Worker:
+		with self._lock:
+			self._spawned += 1
+			number = self._spawned
+		return _Worker(self._context, self.initializer, f'{self.name}-worker-{number}')
+
+	def start(self) -> None:
+		"""Start the worker processes if they are not running yet"""
+		with self._lock:
+			if self._started:
+				return
+			self._started = True
+		for _ in range(self.workers):
+			self._idle.put(self._spawn())
+
+	def _restart(self, worker: _Worker, reason: str) -> _Worker:
+		logger.warning(f'Restarting {self.name} worker {worker.process.name} ({reason})')
+		worker.stop(kill=True)
+		with self._lock:
+			self._restarts[reason] += 1
+		return self._spawn()
+
+	def _call(self, fn: Callable, args: tuple) -> Any:
+		self.start()
+		worker = self._idle.get()
+		try:
+			if not worker.process.is_alive():
+				worker = self._restart(worker, 'crash')
+			try:
+				worker.wait_ready()
+			except PdfWorkerError:
+				worker = self._restart(worker, 'crash')
+				raise
+			started_at = time.perf_counter()
+			try:
+				worker.conn.send((fn, args))
+				timed_out = not worker.conn.poll(self.timeout)
+				if not timed_out:
+					status, payload, rss = worker.conn.recv()
+			except (EOFError, OSError) as e:
+				worker = self._restart(worker, 'crash')
+				raise PdfWorkerError(f'PDF worker died: {e}') from e
+			if timed_out:
+				worker = self._restart(worker, 'timeout')
+				with self._lock:
+					self._timeouts += 1
+				raise PdfRenderTimeout(f'Rendering took longer than {self.timeout:g} seconds')
+
+			if self.max_rss_mb and rss > self.max_rss_mb * 1024 * 1024:
+				worker = self._restart(worker, 'memory')
+			if status == 'invalid':
+				raise ValueError(payload)
+			if status == 'error':
+				raise PdfWorkerError(payload)
+			with self._lock:
+				self._latencies.append(time.perf_counter() - started_at)
+			return payload
+		finally:
+			self._idle.put(worker)
+
+	async def run(self, fn: Callable, *args) -> Any:
+		"""Run ``fn(*args)`` in a worker process and return its result
+
+		``fn``, its arguments and its result must be picklable. A
+		ValueError or NotImplementedError raised by ``fn`` is raised again
+		with its message; any other failure raises PdfWorkerError.
+		"""
+		with self._lock:
+			if self.max_queue is not None and self._pending >= self.workers + self.max_queue:
+				self._rejected += 1
+				raise PdfQueueFullError(f'{self.name} queue is full')
+			self._pending += 1
+		failed = True
+		try:
+			result = await self._dispatcher.run(self._call, fn, args)
+			failed = False
+			return result
+		finally:
+			with self._lock:
+				self._pending -= 1
+				self._completed += 1
+				self._failed += failed
+
+	def shutdown(self) -> None:
+		"""Stop the idle workers and the dispatcher; running jobs are waited for"""
+		self._dispatcher.shutdown()
+		with self._lock:
+			self._started = False
+		while True:
+			try:
+				worker = self._idle.get_nowait()
+			except queue.Empty:
+				return
+			worker.stop()
+
+	@staticmethod
+	def _percentile(samples: list, fraction: float) -> float:
+		index = min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))
+		return round(samples[index] * 1000, 3)
+
+	def stats(self) -> Dict[str, Any]:
+		"""Return queue depth, failures, worker restarts and render latency percentiles"""
+		with self._lock:
+			latencies = sorted(self._latencies)
+			stats = {
+				'name': self.name,
+				'workers': self.workers,
+				'started': self._started,
+				'timeout_seconds': self.timeout,
+				'max_rss_mb': self.max_rss_mb,
+				'max_queue': self.max_queue,
+				'pending': self._pending,
+				'completed': self._completed,
+				'failed': self._failed,
+				'timeouts': self._timeouts,
+				'rejected': self._rejected,
+				'restarts': dict(self._restarts),
+				'latency_samples': len(latencies),
+			}
+		if latencies:
+			stats.update({
+				'latency_p50_ms': self._percentile(latencies, 0.50),
+				'latency_p95_ms': self._percentile(latencies, 0.95),
+				'latency_p99_ms': self._percentile(latencies, 0.99),
+				'latency_max_ms': round(latencies[-1] * 1000, 3),
+			})
+		stats['dispatch'] = self._dispatcher.stats()
+		return stats
+
+
+settings = get_settings()
+
+# Weighing sheets printed one at a time
+pdf_workers = PdfWorkerPool(
+	'pdf',
+	workers=settings.PDF_WORKERS,
+	timeout=settings.PDF_TIMEOUT,
+	max_rss_mb=settings.PDF_WORKER_MAX_RSS_MB,
+	max_queue=settings.PDF_QUEUE_SIZE,
+	initializer=WeighingPdfService.preload,
+)
+# Weighing sheet packs, kept apart so a fleet pack does not delay single prints
+pack_workers = PdfWorkerPool(
+	'pdf_pack',
+	workers=settings.PDF_PACK_WORKERS or os.cpu_count() or 1,
+	timeout=settings.PDF_TIMEOUT,
+	max_rss_mb=settings.PDF_WORKER_MAX_RSS_MB,
+	initializer=WeighingPdfService.preload,
+)
+
+PDF_WORKER_POOLS = (pdf_workers, pack_workers)
+
+
+def pdf_worker_stats() -> Dict[str, Dict[str, Any]]:
+	"""Return the stats of every PDF worker pool keyed by name"""
+	return {pool.name: pool.stats() for pool in PDF_WORKER_POOLS}
+
+
+def shutdown_pdf_workers() -> None:
+	"""Stop every PDF worker pool"""
+	for pool in PDF_WORKER_POOLS:
+		pool.shutdown()
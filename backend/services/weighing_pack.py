@@ -0,0 +1,170 @@
+"""Weighing sheet packs: the latest sheet of many gliders rendered in worker processes"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import zipfile
+from io import BytesIO
+from typing import Dict, List, Optional
+
+from backend.db.glider_queries import get_fleet
+from backend.executors import db_executor, pdf_executor
+from backend.models.glider import Glider, Weighing
+from backend.services.jobs import job_registry
+from backend.services.pdf_cache import weighing_pdf_cache
+from backend.services.pdf_workers import PdfWorkerError, pack_workers
+from backend.services.weighing_pdf import WeighingPdfService
+
+logger = logging.getLogger(__name__)
+
+PACK_JOB = 'weighing_pack'
+PACK_FORMATS = ('zip', 'pdf')
+PACK_MEDIA_TYPES = {'zip': 'application/zip', 'pdf': 'application/pdf'}
+
+# Finished packs are kept this long for download, then removed
+PACK_RETENTION_SECONDS = 3600
+PACK_DIR = os.path.join(tempfile.gettempdir(), 'pyglider-weighing-packs')
+
+
+def sheet_filename(registration: str, weighing_id: Optional[int]) -> str:
+	"""File name of a weighing sheet PDF"""
+	return f'weighing-{registration.replace("/", "-")}-{weighing_id}.pdf'
+
+
+def pack_path(job_id: str, pack_format: str) -> str:
+	"""Path of the file built by a pack job"""
+	return os.path.join(PACK_DIR, f'{job_id}.{pack_format}')
+
+
+def write_pack(path: str, pack_format: str, sheets: List[tuple]) -> int:
+	"""Write rendered sheets to a zip of PDFs or a single merged PDF
+
+	Args:
+		path: File to write
+		pack_format: 'zip' or 'pdf'
+		sheets: (file name, PDF bytes) pairs in output order
+
+	Returns:
+		Size of the written file in bytes
+	"""
+	temp_path = f'{path}.tmp'
+	if pack_format == 'zip':
+		# PDF streams are already compressed
+		with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_STORED) as zipf:
+			for filename, data in sheets:
+				zipf.writestr(filename, data)
+	elif pack_format == 'pdf':
+		from pypdf import PdfWriter
+
+		writer = PdfWriter()
+		for _, data in sheets:
+			writer.append(BytesIO(data))
+		with open(temp_path, 'wb') as f:
+			writer.write(f)
+	else:
+		raise ValueError(f'Unknown pack format: {pack_format}')
+	os.replace(temp_path, path)
+	return os.path.getsize(path)
+
+
+def prune_packs(max_age: float = PACK_RETENTION_SECONDS) -> None:
+	"""Remove pack files older than ``max_age`` seconds"""
+	if not os.path.isdir(PACK_DIR):
+		return
+	cutoff = time.time() - max_age
+	for entry in os.scandir(PACK_DIR):
+		try:
+			if entry.stat().st_mtime < cutoff:
+				os.remove(entry.path)
+		except FileNotFoundError:
+			pass
+
+
+def _select_sheets(gliders: List[Glider], registrations: Optional[List[str]]) -> tuple:
+	"""Pick the latest weighing of each glider, listing the gliders left out"""
+	selected = []
+	skipped = []
+	found = {glider.registration for glider in gliders}
+	for registration in registrations or []:
+		if registration not in found:
+			skipped.append({'registration': registration, 'reason': 'Glider not found'})
+	for glider in gliders:
+		weighing = glider.last_weighing()
+		if weighing is None:
+			skipped.append({'registration': glider.registration, 'reason': 'No weighing recorded'})
+		elif glider.limits is None or glider.arms is None:
+			skipped.append({'registration': glider.registration, 'reason': 'Limits or arms not configured'})
+		else:
+			selected.append((glider, weighing))
+	return selected, skipped
+
+
+async def _render_cached(glider: Glider, weighing: Weighing) -> tuple:
+	"""Return a sheet from the PDF cache, rendering and caching it on a miss
+
+	Returns:
+		(glider, weighing, PDF bytes or None, error message or None)
+	"""
+	key = WeighingPdfService.cache_key(glider, weighing)
+	data = await pdf_executor.run(weighing_pdf_cache.get, glider.registration, key)
+	if data is not None:
+		return glider, weighing, data, None
+	version = weighing_pdf_cache.version(glider.registration, key)
+	try:
+		data = await pack_workers.run(WeighingPdfService.render_pdf, glider, weighing)
+	except (ValueError, PdfWorkerError) as e:
+		return glider, weighing, None, str(e)
+	await pdf_executor.run(weighing_pdf_cache.put, glider.registration, key, data, version)
+	return glider, weighing, data, None
+
+
+async def run_pack_job(job_id: str, registrations: Optional[List[str]], pack_format: str) -> None:
+	"""Render the latest weighing sheet of the selected gliders into one file
+
+	Sheets render concurrently in ``pack_workers`` and the job progress
+	follows the finished sheets. Gliders without a weighing, limits or
+	arms, and sheets that failed or timed out, are listed in the job result
+	instead of failing the pack.
+	"""
+	path = pack_path(job_id, pack_format)
+	try:
+		job_registry.update(job_id, 'loading', 0.0)
+		os.makedirs(PACK_DIR, exist_ok=True)
+		await pdf_executor.run(prune_packs)
+		gliders = await db_executor.run(get_fleet, registrations=registrations)
+		selected, skipped = _select_sheets(gliders, registrations)
+
+		job_registry.update(job_id, 'rendering', 0.0)
+		rendered: Dict[str, tuple] = {}
+		pending = [_render_cached(glider, weighing) for glider, weighing in selected]
+		for done, result in enumerate(asyncio.as_completed(pending), start=1):
+			glider, weighing, data, error = await result
+			if error is not None:
+				skipped.append({'registration': glider.registration, 'reason': error})
+			else:
+				rendered[glider.registration] = (sheet_filename(glider.registration, weighing.id), data)
+			job_registry.update(job_id, 'rendering', 0.95 * done / len(pending))
+
+		if not rendered:
+			job_registry.fail(job_id, 'No weighing sheet to print')
+			return
+
+		job_registry.update(job_id, 'assembling', 0.95)
+		sheets = [rendered[registration] for registration in sorted(rendered)]
+		size = await pdf_executor.run(write_pack, path, pack_format, sheets)
+		job_registry.succeed(job_id, {
+			'format': pack_format,
+			'sheets': len(sheets),
+			'size': size,
+			'skipped': sorted(skipped, key=lambda item: item['registration']),
+			'download_url': f'/api/gliders/weighing-sheets/jobs/{job_id}/download',
+		})
+		logger.info(f'Weighing sheet pack {job_id} built: {len(sheets)} sheets, {len(skipped)} skipped, {size} bytes')
+	except Exception as e:
+		logger.error(f'Error building weighing sheet pack {job_id}: {e}', exc_info=True)
+		job_registry.fail(job_id, 'Failed to build weighing sheet pack')
+		for leftover in (path, f'{path}.tmp'):
+			if os.path.exists(leftover):
+				os.remove(leftover)
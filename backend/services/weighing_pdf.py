@@ -3,16 +3,18 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import html
+import json
 import logging
-import mimetypes
+import string
+import threading
+from dataclasses import asdict
 from datetime import date, datetime
 from io import BytesIO
 from pathlib import Path
 from typing import Any, cast
 
-from xhtml2pdf import pisa
-
 from backend.models.glider import Glider, Weighing
 from backend.schemas.weighing import (
     GliderArmsSchema,
@@ -31,6 +33,10 @@ DATUM_IMAGE_PATHS = {
 	3: PROJECT_ROOT / 'web' / 'public' / 'img' / 'datum-hd-4.png',
 	4: PROJECT_ROOT / 'web' / 'public' / 'img' / 'datum-hd-snc34c.png',
 }
+LOGO_WIDTH = 62
+DATUM_IMAGE_WIDTH = 240
+# Images are resampled once to this resolution at their printed width
+IMAGE_DPI = 300
 
 HTML_TEMPLATE = """
 <html>
@@ -320,9 +326,138 @@ HTML_TEMPLATE = """
 
 PilotLimitValue = tuple[float | None, str | None]
 
+
+class CompiledTemplate:
+    """A ``str.format`` template split once into literal text and fields.
+
+    Fields given as constants are folded into the literal text, so
+    rendering only joins the literals with the per-sheet values.
+    """
+
+    def __init__(self, template: str, **constants: str):
+        parts: list[tuple[str, str | None]] = []
+        literal = ''
+        for text, field, _spec, _conversion in string.Formatter().parse(template):
+            literal += text
+            if field is None:
+                continue
+            if field in constants:
+                literal += constants[field]
+            else:
+                parts.append((literal, field))
+                literal = ''
+        parts.append((literal, None))
+        self._parts = parts
+        self.fields = frozenset(field for _, field in parts if field is not None)
+
+    def render(self, **values: str) -> str:
+        """Return the template filled with ``values``, one per remaining field."""
+        return ''.join(
+            literal + values[field] if field is not None else literal
+            for literal, field in self._parts
+        )
+
+
+def _encode_image(path: Path, width: int) -> bytes:
+    """Resample an image for its printed width and return it as PNG bytes.
+
+    Transparency is flattened onto white, which is what the sheet prints
+    on, so reportlab embeds a plain RGB image without a soft mask.
+    """
+    from PIL import Image
+
+    with Image.open(path) as source:
+        image = source.convert('RGBA')
+    max_pixels = round(width * IMAGE_DPI / 72)
+    if image.width > max_pixels:
+        height = round(image.height * max_pixels / image.width)
+        image = image.resize((max_pixels, height), Image.LANCZOS)
+    flattened = Image.new('RGB', image.size, 'white')
+    flattened.paste(image, mask=image.getchannel('A'))
+    output = BytesIO()
+    flattened.save(output, 'PNG', optimize=True)
+    return output.getvalue()
+
+
 class WeighingPdfService:  # pylint: disable=too-few-public-methods
     """Generate the official weighing sheet as PDF bytes."""
 
+    _lock = threading.Lock()
+    _template: CompiledTemplate | None = None
+    _datum_image_tags: dict[int, str] = {}
+    _missing_datum_tag = ''
+    _sheet_digest: str | None = None
+
+    @classmethod
+    def preload(cls) -> None:
+        """Load xhtml2pdf, encode the image assets and compile the template, once per process.
+
+        xhtml2pdf and Pillow are only imported here and on first render, so
+        processes that never print do not load them. The logo is folded into
+        the template; the datum images are kept as ready-made tags.
+        Rendering a sheet then only formats its values.
+        """
+        if cls._template is not None:
+            return
+        with cls._lock:
+            if cls._template is not None:
+                return
+            import xhtml2pdf.pisa  # noqa: F401
+            datum_image_tags = {
+                datum: cls._build_image_tag(path, 'Schéma du plan de référence', width=DATUM_IMAGE_WIDTH)
+                for datum, path in DATUM_IMAGE_PATHS.items()
+            }
+            cls._missing_datum_tag = cls._build_image_tag(None, 'Schéma du plan de référence', width=DATUM_IMAGE_WIDTH)
+            cls._datum_image_tags = datum_image_tags
+            cls._template = CompiledTemplate(
+                HTML_TEMPLATE,
+                logo_html=cls._build_image_tag(LOGO_PATH, 'Logo ACPH', width=LOGO_WIDTH),
+            )
+            logger.info('Weighing sheet template and %d image assets preloaded', len(datum_image_tags) + 1)
+
+    @classmethod
+    def _get_sheet_digest(cls) -> str:
+        """Digest of the template and assets, so layout changes yield new keys."""
+        if cls._sheet_digest is None:
+            digest = hashlib.sha256(HTML_TEMPLATE.encode('utf-8'))
+            digest.update(f'{LOGO_WIDTH}:{DATUM_IMAGE_WIDTH}:{IMAGE_DPI}'.encode('ascii'))
+            for path in (LOGO_PATH, *DATUM_IMAGE_PATHS.values()):
+                digest.update(path.read_bytes() if path.exists() else b'')
+            cls._sheet_digest = digest.hexdigest()
+        return cls._sheet_digest
+
+    @classmethod
+    def cache_key(cls, glider: Glider, weighing: Weighing) -> str:
+        """Return a digest of everything printed on a weighing sheet.
+
+        It covers the glider identity, datum, limits and arms, the weighing
+        row and the on-board inventory, plus the template itself. The
+        ``generated_on`` date is left out: a cached sheet keeps the date it
+        was first rendered on.
+        """
+        content = {
+            'sheet': cls._get_sheet_digest(),
+            'glider': [
+                glider.registration,
+                glider.brand,
+                glider.model,
+                glider.serial_number,
+                glider.datum,
+                glider.pilot_position,
+                glider.datum_label,
+                glider.wedge,
+                glider.wedge_position,
+            ],
+            'limits': asdict(glider.limits) if glider.limits is not None else None,
+            'arms': asdict(glider.arms) if glider.arms is not None else None,
+            'weighing': asdict(weighing),
+            'inventory': [
+                asdict(instrument) for instrument in glider.instruments if instrument.on_board
+            ],
+        }
+        canonical = json.dumps(content, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
     @classmethod
     def render_pdf(cls, glider: Glider, weighing: Weighing) -> bytes:
         """Render a single weighing sheet PDF."""
@@ -390,19 +525,15 @@ class WeighingPdfService:  # pylint: disable=too-few-public-methods
             glider.limits.mm_harnais,
         )
 
-        html_content = HTML_TEMPLATE.format(
-            logo_html=cls._build_image_tag(LOGO_PATH, 'Logo ACPH', width=62),
+        cls.preload()
+        html_content = cast(CompiledTemplate, cls._template).render(
             generated_on=cls._escape(datetime.now().strftime('%d/%m/%Y')),
             registration=cls._escape(glider.registration),
             brand=cls._escape(glider.brand),
             model=cls._escape(glider.model),
             serial_number=cls._escape(glider.serial_number),
             weighing_date=cls._escape(weighing.date.strftime('%d/%m/%Y')),
-            datum_image_html=cls._build_image_tag(
-                DATUM_IMAGE_PATHS.get(glider.datum),
-                'Schéma du plan de référence',
-                width=240,
-            ),
+            datum_image_html=cls._datum_image_tags.get(glider.datum, cls._missing_datum_tag),
             datum_label=cls._escape(glider.datum_label),
             wedge=cls._escape(glider.wedge),
             wedge_position=cls._escape(glider.wedge_position),
@@ -469,6 +600,8 @@ class WeighingPdfService:  # pylint: disable=too-few-public-methods
             inventory_html=cls._build_inventory_html(glider),
         )
 
+        from xhtml2pdf import pisa
+
         output = BytesIO()
         pdf_status = cast(Any, pisa.CreatePDF(html_content, dest=output))
         if pdf_status.err:
@@ -491,18 +624,13 @@ class WeighingPdfService:  # pylint: disable=too-few-public-methods
     @classmethod
     def _build_image_tag(cls, path: Path | None, alt: str, width: int) -> str:
         if path is None or not path.exists():
-            logger.warning('PDF image asset missing: %s', path)
+            if path is not None:
+                logger.warning('PDF image asset missing: %s', path)
             return f'<p>{cls._escape(alt)} indisponible</p>'
 
-        mime_type, _ = mimetypes.guess_type(path.name)
-        if mime_type is None:
-            mime_type = 'image/png'
-
-        with path.open('rb') as image_file:
-            encoded = base64.b64encode(image_file.read()).decode('ascii')
-
+        encoded = base64.b64encode(_encode_image(path, width)).decode('ascii')
         return (
-            f'<img src="data:{mime_type};base64,{encoded}" '
+            f'<img src="data:image/png;base64,{encoded}" '
             f'width="{width}" alt="{cls._escape(alt)}" />'
         )
 
@@ -0,0 +1,250 @@
+"""Batch weight and balance calculation service"""
+
+import logging
+import math
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from backend.models.glider import Glider
+from backend.schemas.glider import (
+	BallastOptimizationResponse,
+	BallastRange,
+	FleetCalculationResult,
+	LoadRange,
+	LoadValues,
+	WeightBalanceBatchRequest,
+	WeightBalanceCalculationRequest,
+)
+from backend.services.envelope import Envelope, get_envelope
+
+logger = logging.getLogger(__name__)
+
+LOAD_FIELDS = (
+	'front_pilot_weight',
+	'rear_pilot_weight',
+	'front_ballast_weight',
+	'rear_ballast_weight',
+	'wing_water_ballast_weight',
+)
+
+# Ballast load fields and the arm that tells whether the glider can carry them
+BALLAST_SLOTS = {
+	'front_ballast_weight': 'arm_front_ballast',
+	'rear_ballast_weight': 'arm_rear_watterballast_or_ballast',
+	'wing_water_ballast_weight': 'arm_waterballast',
+}
+
+# Default resolution of the ballast search in kg
+BALLAST_STEP_KG = 0.5
+# Most ballast amounts evaluated for one slot
+BALLAST_MAX_CANDIDATES = 100_000
+
+
+def _load_count(values: LoadValues) -> float:
+	"""Number of loads in a list or a range, computed without building it
+
+	A float, since a range with a tiny step can count more loads than an
+	int64 holds (or infinitely many).
+	"""
+	if isinstance(values, LoadRange):
+		return float(np.floor((values.stop - values.start) / values.step + 1e-9)) + 1
+	return len(values)
+
+
+def _format_count(count: float) -> str:
+	return str(int(count)) if count < 1e15 else f'{count:.3g}'
+
+
+def _load_values(values: LoadValues, count: int) -> np.ndarray:
+	"""Turn a list of loads or a load range of ``count`` loads into a float array"""
+	if isinstance(values, LoadRange):
+		return values.start + values.step * np.arange(count, dtype=np.float64)
+	return np.asarray(values, dtype=np.float64)
+
+
+def expand_loads(request: WeightBalanceBatchRequest, max_combinations: int) -> Dict[str, np.ndarray]:
+	"""Expand a batch request into one flat array per load field
+
+	Raises:
+		ValueError: If loads are empty, have mismatched lengths in zip mode,
+			or exceed ``max_combinations``; sizes are checked before any
+			array is allocated
+	"""
+	loads = {name: getattr(request, name) for name in LOAD_FIELDS}
+	counts = {name: _load_count(values) for name, values in loads.items()}
+	empty = [name for name, count in counts.items() if count == 0]
+	if empty:
+		raise ValueError(f'No load given for {", ".join(empty)}')
+
+	if request.mode == 'grid':
+		count = math.prod(counts.values())
+		if count > max_combinations:
+			raise ValueError(f'Grid has {_format_count(count)} combinations, maximum is {max_combinations}')
+		axes = [_load_values(loads[name], int(counts[name])) for name in LOAD_FIELDS]
+		grids = np.meshgrid(*axes, indexing='ij')
+		return {name: grid.ravel() for name, grid in zip(LOAD_FIELDS, grids)}
+
+	lengths = set(counts.values()) - {1}
+	if len(lengths) > 1:
+		raise ValueError('Load lists must have the same length or a single value')
+	count = lengths.pop() if lengths else 1
+	if count > max_combinations:
+		raise ValueError(f'Batch has {_format_count(count)} loadings, maximum is {max_combinations}')
+	count = int(count)
+	return {name: np.broadcast_to(_load_values(loads[name], int(counts[name])), (count,)) for name in LOAD_FIELDS}
+
+
+def calculate_batch(glider: Glider, loads: Dict[str, np.ndarray]) -> Dict[str, Optional[np.ndarray]]:
+	"""Compute total weight, CG and envelope verdict for every loading
+
+	The envelope entries are None when the glider has no envelope.
+
+	Raises:
+		ValueError: If the glider misses a weighing or arms
+		NotImplementedError: If the glider datum is not supported
+	"""
+	total_weight, cg = glider.weight_and_balance_batch(*(loads[name] for name in LOAD_FIELDS))
+	inside, margin = None, None
+	envelope = get_envelope(glider)
+	if envelope is not None:
+		inside, margin = envelope.check(total_weight, cg)
+	return {
+		**loads,
+		'total_weight': total_weight,
+		'center_of_gravity': cg,
+		'in_envelope': inside,
+		'envelope_margin': margin,
+	}
+
+
+def _feasible(glider: Glider, envelope: Envelope, total_weight: np.ndarray, cg: np.ndarray) -> np.ndarray:
+	"""Loadings inside the envelope and, when set, the front/rear centering limits"""
+	feasible = envelope.contains(total_weight, cg)
+	if glider.limits is not None:
+		feasible &= (glider.limits.front_centering <= cg) & (cg <= glider.limits.rear_centering)
+	return feasible
+
+
+def ballast_range(
+	glider: Glider,
+	envelope: Envelope,
+	loads: Dict[str, float],
+	slot: str,
+	step: float = BALLAST_STEP_KG,
+) -> Optional[Tuple[float, float]]:
+	"""Range of ballast that can be added to one load so the loading stays feasible
+
+	Every amount from 0 up to the envelope's maximum weight is evaluated in
+	``step`` kg increments with one vectorized calculation. The envelope may
+	not be convex and the CG is a ratio of the ballast mass, so the bounds
+	are searched rather than solved.
+
+	Returns:
+		(smallest, largest) feasible amount in kg, or None if none is feasible
+
+	Raises:
+		ValueError: If the glider misses a weighing or arms, or the search
+			needs more than BALLAST_MAX_CANDIDATES amounts
+		NotImplementedError: If the glider datum is not supported
+	"""
+	base_weight, _ = glider.weight_and_balance_calculator(*(loads[name] for name in LOAD_FIELDS))
+	headroom = envelope.polygon.bounds[3] - base_weight
+	if headroom < 0:
+		return None
+
+	count = float(np.floor(headroom / step + 1e-9)) + 1
+	if count > BALLAST_MAX_CANDIDATES:
+		raise ValueError(f'Ballast search needs {count:.0f} steps of {step:g} kg, maximum is {BALLAST_MAX_CANDIDATES}; use a larger step')
+	candidates = step * np.arange(int(count))
+	varied = dict(loads)
+	varied[slot] = loads[slot] + candidates
+	total_weight, cg = glider.weight_and_balance_batch(*(varied[name] for name in LOAD_FIELDS))
+	feasible = np.flatnonzero(_feasible(glider, envelope, total_weight, cg))
+	if not feasible.size:
+		return None
+	return float(candidates[feasible[0]]), float(candidates[feasible[-1]])
+
+
+def minimum_ballast(glider: Glider, loading: WeightBalanceCalculationRequest) -> Optional[float]:
+	"""Smallest front ballast to add so that the loading becomes feasible
+
+	The ballast goes to the front ballast location, or to the front seat when
+	the glider has no front ballast arm.
+
+	Returns:
+		Ballast in kg (0.0 when already feasible), or None if the glider has no
+		envelope or no amount makes the loading feasible
+
+	Raises:
+		ValueError: If the glider misses a weighing or arms
+		NotImplementedError: If the glider datum is not supported
+	"""
+	envelope = get_envelope(glider)
+	if envelope is None:
+		return None
+
+	loads = {name: getattr(loading, name) for name in LOAD_FIELDS}
+	slot = 'front_ballast_weight' if glider.arms and glider.arms.arm_front_ballast else 'front_pilot_weight'
+	feasible = ballast_range(glider, envelope, loads, slot)
+	return feasible[0] if feasible else None
+
+
+def optimize_ballast(
+	glider: Glider,
+	front_pilot_weight: float,
+	rear_pilot_weight: float,
+	step: float = BALLAST_STEP_KG,
+) -> BallastOptimizationResponse:
+	"""Feasible range of each ballast for a crew, the other ballasts being empty
+
+	Raises:
+		ValueError: If the glider misses a weighing, arms or envelope
+		NotImplementedError: If the glider datum is not supported
+	"""
+	if not glider.arms:
+		raise ValueError('Glider arms data is not configured')
+	envelope = get_envelope(glider)
+	if envelope is None:
+		raise ValueError('No weight and balance envelope or limits for this glider')
+
+	loads = dict.fromkeys(LOAD_FIELDS, 0.0)
+	loads['front_pilot_weight'] = front_pilot_weight
+	loads['rear_pilot_weight'] = rear_pilot_weight
+
+	ranges = {}
+	for slot, arm in BALLAST_SLOTS.items():
+		ballast = BallastRange(available=bool(getattr(glider.arms, arm)))
+		if ballast.available:
+			feasible = ballast_range(glider, envelope, loads, slot, step)
+			if feasible:
+				ballast.min, ballast.max = feasible
+		ranges[slot.removesuffix('_weight')] = ballast
+	return BallastOptimizationResponse(registration=glider.registration, step=step, **ranges)
+
+
+def calculate_fleet(gliders: Iterable[Glider], loading: WeightBalanceCalculationRequest) -> Iterator[FleetCalculationResult]:
+	"""Evaluate one loading against every glider, yielding one result per glider
+
+	Gliders that cannot be computed (missing weighing or arms, unsupported
+	datum) yield a result carrying the error instead of failing the fleet.
+	"""
+	for glider in gliders:
+		result = FleetCalculationResult(registration=glider.registration, model=glider.model)
+		try:
+			if not glider.arms:
+				raise ValueError('Glider arms data is not configured')
+			total_weight, cg = glider.weight_and_balance_calculator(*(getattr(loading, name) for name in LOAD_FIELDS))
+			result.total_weight = round(total_weight, 2)
+			result.center_of_gravity = round(cg, 2)
+			envelope = get_envelope(glider)
+			if envelope is not None:
+				inside, margin = envelope.check(total_weight, cg)
+				result.in_envelope = bool(inside)
+				result.envelope_margin = round(float(margin), 2)
+			result.min_ballast = minimum_ballast(glider, loading)
+		except NotImplementedError:
+			result.error = 'This glider datum type is not supported for calculations'
+		except ValueError as e:
+			result.error = str(e)
+		yield result
@@ -0,0 +1,184 @@
+import datetime
+import os
+
+import pytest
+
+from backend.db import audit_queries as audit_queries_module
+from backend.db.audit_archive import AuditArchive
+from backend.db.audit_queries import AuditQueries, decode_audit_cursor, encode_audit_cursor
+from backend.db.connection import ConnectionPool
+from backend.init_db import initialize_database
+
+
+@pytest.fixture
+def audit_queries(tmp_path, monkeypatch):
+	db_path = str(tmp_path / 'audit.duckdb')
+	initialize_database(db_path)
+	pool = ConnectionPool(db_path)
+	monkeypatch.setattr(audit_queries_module, 'get_connection_pool', lambda db_path=None: pool)
+	yield AuditQueries(db_path)
+	pool.close()
+
+
+def test_resource_history_uses_structured_columns(audit_queries):
+	audit_queries.create_audit_entry('admin', 'Glider F-CGUP created', resource_type='glider', resource_id='F-CGUP', action='create')
+	audit_queries.create_audit_entry('admin', 'Glider F-CGUPX created', resource_type='glider', resource_id='F-CGUPX', action='create')
+	audit_queries.create_audit_entry('admin', 'Weighing 1 deleted for glider F-CGUP', resource_type='glider', resource_id='F-CGUP', action='delete_weighing')
+	audit_queries.create_audit_entry('admin', 'User F-CGUP created', resource_type='user', resource_id='F-CGUP', action='create')
+
+	history = audit_queries.get_audit_logs_by_resource('Glider', 'F-CGUP')
+	assert [entry['event'] for entry in history] == ['Weighing 1 deleted for glider F-CGUP', 'Glider F-CGUP created']
+
+	users = audit_queries.get_audit_logs(resource_type='user')
+	assert [entry['event'] for entry in users['items']] == ['User F-CGUP created']
+
+
+def _insert_entries(audit_queries, count, timestamp=datetime.datetime(2024, 5, 1, 12, 0)):
+	audit_queries.create_audit_entries([
+		{'timestamp': timestamp, 'user_id': 'pilot' if index % 2 else 'admin', 'event': f'event {index}'}
+		for index in range(count)
+	])
+
+
+def test_keyset_pages_cover_entries_sharing_a_timestamp(audit_queries):
+	_insert_entries(audit_queries, 7)
+
+	events = []
+	after = None
+	while True:
+		page = audit_queries.get_audit_logs(limit=3, after=after, total_mode='none')
+		events.extend(entry['event'] for entry in page['items'])
+		if page['next_cursor'] is None:
+			break
+		after = decode_audit_cursor(page['next_cursor'])
+
+	assert events == [f'event {index}' for index in reversed(range(7))]
+	assert page['total'] is None
+
+	user_page = audit_queries.get_user_actions('pilot', limit=2, total_mode='exact')
+	assert [entry['event'] for entry in user_page['items']] == ['event 5', 'event 3']
+	assert user_page['total'] == 3
+	next_page = audit_queries.get_user_actions('pilot', limit=2, after=decode_audit_cursor(user_page['next_cursor']))
+	assert [entry['event'] for entry in next_page['items']] == ['event 1']
+	assert next_page['next_cursor'] is None
+
+
+def test_estimated_total_is_capped_for_filtered_queries(audit_queries, monkeypatch):
+	_insert_entries(audit_queries, 6)
+	monkeypatch.setattr(audit_queries_module.settings, 'AUDIT_COUNT_CAP', 2)
+
+	capped = audit_queries.get_audit_logs(user_id='admin', total_mode='estimated')
+	assert (capped['total'], capped['total_exact']) == (2, False)
+
+	exact = audit_queries.get_audit_logs(user_id='admin', total_mode='exact')
+	assert (exact['total'], exact['total_exact']) == (3, True)
+
+	unfiltered = audit_queries.get_audit_logs(total_mode='estimated')
+	assert unfiltered['total'] >= 6
+	assert not unfiltered['total_exact']
+
+
+def test_cursor_round_trip_and_malformed_cursor():
+	timestamp = datetime.datetime(2024, 5, 1, 12, 0, 0, 123456)
+	assert decode_audit_cursor(encode_audit_cursor(timestamp, 42)) == (timestamp, 42)
+	with pytest.raises(ValueError):
+		decode_audit_cursor('not a cursor')
+
+
+def test_archived_entries_are_read_back_for_date_ranges(audit_queries, tmp_path):
+	now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+	audit_queries.create_audit_entries([
+		{'timestamp': now - datetime.timedelta(days=40), 'user_id': 'admin', 'event': 'old 1'},
+		{'timestamp': now - datetime.timedelta(days=40, hours=1), 'user_id': 'admin', 'event': 'old 2'},
+		{'timestamp': now - datetime.timedelta(days=35), 'user_id': 'admin', 'event': 'older than a month'},
+		{'timestamp': now, 'user_id': 'admin', 'event': 'recent'},
+	])
+
+	assert audit_queries.archive_audit_logs_older_than(30) == 3
+	assert audit_queries.archive_audit_logs_older_than(30) == 0
+	assert audit_queries.archive.directory == str(tmp_path / 'audit_audit_archive')
+	assert len(audit_queries.archive.days()) == 2
+
+	hot = audit_queries.get_audit_logs(total_mode='exact')
+	assert [entry['event'] for entry in hot['items']] == ['recent']
+
+	everything = audit_queries.get_audit_logs(start_date=now - datetime.timedelta(days=60), total_mode='exact')
+	assert [entry['event'] for entry in everything['items']] == ['recent', 'older than a month', 'old 1', 'old 2']
+	assert everything['total'] == 4
+
+	pruned = audit_queries.get_audit_logs(
+		start_date=now - datetime.timedelta(days=38),
+		end_date=now - datetime.timedelta(days=30),
+	)
+	assert [entry['event'] for entry in pruned['items']] == ['older than a month']
+
+
+def test_archived_entries_are_read_back_for_end_date_resource_and_user(audit_queries):
+	now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+	audit_queries.create_audit_entries([
+		{'timestamp': now - datetime.timedelta(days=40), 'user_id': 'pilot', 'event': 'old', 'resource_type': 'glider', 'resource_id': 'F-CGUP'},
+		{'timestamp': now, 'user_id': 'pilot', 'event': 'recent', 'resource_type': 'glider', 'resource_id': 'F-CGUP'},
+	])
+	assert audit_queries.archive_audit_logs_older_than(30) == 1
+
+	before = audit_queries.get_audit_logs(end_date=now - datetime.timedelta(days=30), total_mode='exact')
+	assert [entry['event'] for entry in before['items']] == ['old']
+	assert before['total'] == 1
+
+	history = audit_queries.get_audit_logs_by_resource('glider', 'F-CGUP')
+	assert [entry['event'] for entry in history] == ['recent', 'old']
+
+	actions = audit_queries.get_user_actions('pilot', total_mode='exact')
+	assert [entry['event'] for entry in actions['items']] == ['recent', 'old']
+	assert actions['total'] == 2
+
+
+def test_resource_and_user_lookups_only_read_their_archived_days(audit_queries, monkeypatch):
+	now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+	audit_queries.create_audit_entries([
+		{'timestamp': now - datetime.timedelta(days=50), 'user_id': 'pilot', 'event': 'F-CGUP created', 'resource_type': 'glider', 'resource_id': 'F-CGUP'},
+		{'timestamp': now - datetime.timedelta(days=40), 'user_id': 'admin', 'event': 'F-AAAA created', 'resource_type': 'glider', 'resource_id': 'F-AAAA'},
+	])
+	audit_queries.archive_audit_logs_older_than(30)
+	pilot_day = (now - datetime.timedelta(days=50)).date()
+	read_days = []
+	source = audit_queries.archive.source
+	monkeypatch.setattr(audit_queries.archive, 'source', lambda start=None, end=None, days=None: read_days.append(days) or source(start, end, days))
+
+	assert [entry['event'] for entry in audit_queries.get_audit_logs_by_resource('glider', 'F-CGUP')] == ['F-CGUP created']
+	assert [entry['event'] for entry in audit_queries.get_user_actions('pilot')['items']] == ['F-CGUP created']
+	assert read_days == [{pilot_day}, {pilot_day}]
+
+	assert audit_queries.get_audit_logs_by_resource('glider', 'F-ZZZZ') == []
+	assert audit_queries.get_user_actions('pilot', after=(now - datetime.timedelta(days=60), 0))['items'] == []
+	assert len(read_days) == 2
+
+
+def test_archive_is_copied_and_replaced_as_a_whole(audit_queries, tmp_path):
+	now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+	audit_queries.create_audit_entries([{'timestamp': now - datetime.timedelta(days=40), 'user_id': 'admin', 'event': 'old'}])
+	audit_queries.archive_audit_logs_older_than(30)
+	assert audit_queries.archive.copy_to(str(tmp_path / 'export')) == 1
+
+	target = AuditArchive(str(tmp_path / 'other_audit_archive'))
+	target.replace(target.stage_replacement(None))
+	assert target.days() == []
+	retired = target.replace(target.stage_replacement(str(tmp_path / 'export')))
+	assert target.days() == audit_queries.archive.days()
+	assert os.path.isdir(retired)
+
+	target.replace(target.stage_replacement(None))
+	assert target.days() == []
+
+
+def test_interrupted_archive_run_is_discarded_while_rows_are_hot(audit_queries):
+	now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+	audit_queries.create_audit_entries([{'timestamp': now - datetime.timedelta(days=10), 'user_id': 'admin', 'event': 'old'}])
+	staging_dir = audit_queries.archive.new_staging_dir()
+	with audit_queries._get_connection() as conn:
+		conn.execute(audit_queries.archive.copy_sql(
+			f'SELECT {audit_queries_module.ARCHIVE_COLUMNS}, CAST(timestamp AS DATE) AS day FROM AUDITLOG', staging_dir
+		))
+
+	assert audit_queries.archive_audit_logs_older_than(5) == 1
+	assert len(audit_queries.archive.files()) == 1
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+
+import duckdb
+import pytest
+
+from backend.db.audit_queries import AuditQueries
+from backend.db.audit_writer import AuditWriter
+from backend.db.connection import ConnectionPool
+from backend.db import audit_queries as audit_queries_module
+from backend.init_db import initialize_database
+
+
+class _RecordingWriter:
+	def __init__(self):
+		self.batches = []
+
+	def __call__(self, batch):
+		self.batches.append(list(batch))
+		return len(batch)
+
+
+def test_entries_are_written_in_batches_on_flush():
+	sink = _RecordingWriter()
+	writer = AuditWriter(max_queue=100, batch_size=3, flush_interval=60, writer=sink)
+
+	entries = [writer.submit('admin', f'event {index}') for index in range(7)]
+	assert writer.flush(timeout=5)
+	writer.shutdown(timeout=5)
+
+	assert [len(batch) for batch in sink.batches] == [3, 3, 1]
+	timestamps = [entry['timestamp'] for entry in entries]
+	assert timestamps == sorted(set(timestamps))
+	stats = writer.stats()
+	assert stats['written'] == 7
+	assert stats['batches'] == 3
+	assert stats['queued'] == 0
+
+
+def test_shutdown_writes_queued_entries():
+	sink = _RecordingWriter()
+	writer = AuditWriter(max_queue=100, batch_size=100, flush_interval=60, writer=sink)
+	writer.submit('admin', 'event')
+
+	writer.shutdown(timeout=5)
+
+	assert sum(len(batch) for batch in sink.batches) == 1
+
+
+def test_full_queue_drops_entries_with_drop_policy():
+	release = threading.Event()
+
+	def blocked_writer(batch):
+		release.wait(5)
+		return len(batch)
+
+	writer = AuditWriter(max_queue=1, batch_size=1, flush_interval=0.01, queue_full_policy='drop', writer=blocked_writer)
+	assert writer.submit('admin', 'first') is not None
+	dropped = 0
+	for index in range(5):
+		dropped += writer.submit('admin', f'event {index}') is None
+	release.set()
+	writer.shutdown(timeout=5)
+
+	assert dropped >= 4
+	assert writer.stats()['dropped'] == dropped
+
+
+def test_record_waits_off_the_loop_when_queue_is_full():
+	release = threading.Event()
+
+	def blocked_writer(batch):
+		release.wait(5)
+		return len(batch)
+
+	writer = AuditWriter(max_queue=1, batch_size=1, flush_interval=0.01, block_timeout=5, writer=blocked_writer)
+
+	async def scenario():
+		entries = [await writer.record('admin', 'first')]
+		while not writer._queue.empty():
+			await asyncio.sleep(0.01)
+		entries.append(await writer.record('admin', 'second'))
+		waiting = asyncio.ensure_future(writer.record('admin', 'third'))
+		await asyncio.sleep(0.05)
+		assert not waiting.done()
+		release.set()
+		entries.append(await waiting)
+		return entries
+
+	entries = asyncio.run(scenario())
+	writer.shutdown(timeout=5)
+
+	assert all(entry is not None for entry in entries)
+	assert writer.stats()['written'] == 3
+	assert writer.stats()['dropped'] == 0
+
+
+def test_failed_batch_is_counted():
+	def failing_writer(batch):
+		raise duckdb.ConstraintException('duplicate key')
+
+	writer = AuditWriter(max_queue=10, batch_size=10, flush_interval=60, writer=failing_writer)
+	writer.submit('admin', 'event')
+	assert writer.flush(timeout=5)
+	writer.shutdown(timeout=5)
+
+	assert writer.stats()['failed'] == 1
+
+
+def test_unknown_policy_is_rejected():
+	with pytest.raises(ValueError):
+		AuditWriter(max_queue=1, batch_size=1, flush_interval=1, queue_full_policy='spill')
+
+
+def test_create_audit_entries_inserts_batch(tmp_path, monkeypatch):
+	db_path = str(tmp_path / 'audit.duckdb')
+	initialize_database(db_path)
+	pool = ConnectionPool(db_path)
+	monkeypatch.setattr(audit_queries_module, 'get_connection_pool', lambda db_path=None: pool)
+	writer = AuditWriter(max_queue=10, batch_size=10, flush_interval=60, writer=AuditQueries(db_path).create_audit_entries)
+
+	for index in range(3):
+		writer.submit('admin', f'event {index}', resource_type='glider', resource_id='F-CGUP', action='update')
+	writer.shutdown(timeout=5)
+
+	with pool.cursor(read_only=True) as conn:
+		rows = conn.execute("SELECT event, resource_type, resource_id, action FROM AUDITLOG WHERE username = 'admin' ORDER BY id").fetchall()
+	pool.close()
+	assert rows == [(f'event {index}', 'glider', 'F-CGUP', 'update') for index in range(3)]
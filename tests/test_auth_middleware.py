@@ -0,0 +1,68 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from backend.middleware import auth
+from backend.middleware.auth import get_current_user, principal_cache
+from backend.models.user import TokenManager
+
+
+class _CountingUserQueries:
+	def __init__(self, users):
+		self.users = users
+		self.lookups = 0
+
+	def get_user_by_username(self, username):
+		self.lookups += 1
+		return self.users.get(username)
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+	principal_cache.clear()
+	yield
+	principal_cache.clear()
+
+
+def _credentials(username):
+	return HTTPAuthorizationCredentials(scheme='Bearer', credentials=TokenManager().encode_token(username))
+
+
+def test_repeated_token_skips_decode_and_lookup(monkeypatch):
+	user_queries = _CountingUserQueries({'pilot': SimpleNamespace(username='pilot', role='viewer')})
+	credentials = _credentials('pilot')
+
+	user = asyncio.run(get_current_user(credentials, user_queries))
+	monkeypatch.setattr(auth, '_decode_credentials', lambda credentials: pytest.fail('token decoded again'))
+	assert asyncio.run(get_current_user(credentials, user_queries)) is user
+
+	assert user_queries.lookups == 1
+	stats = principal_cache.stats()
+	assert stats['hits'] == 1
+	assert stats['misses'] == 1
+
+
+def test_invalidated_user_is_resolved_again():
+	user_queries = _CountingUserQueries({'pilot': SimpleNamespace(username='pilot', role='viewer')})
+	credentials = _credentials('pilot')
+	asyncio.run(get_current_user(credentials, user_queries))
+
+	principal_cache.invalidate_user('pilot')
+	del user_queries.users['pilot']
+
+	with pytest.raises(HTTPException) as exc_info:
+		asyncio.run(get_current_user(credentials, user_queries))
+	assert exc_info.value.status_code == 401
+	assert user_queries.lookups == 2
+
+
+def test_invalid_token_is_rejected_and_not_cached():
+	user_queries = _CountingUserQueries({})
+	credentials = HTTPAuthorizationCredentials(scheme='Bearer', credentials='not-a-token')
+
+	with pytest.raises(HTTPException):
+		asyncio.run(get_current_user(credentials, user_queries))
+	assert principal_cache.stats()['size'] == 0
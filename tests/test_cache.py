@@ -0,0 +1,97 @@
+from backend.cache import VersionedLRUCache
+
+
+def test_get_counts_hits_and_misses():
+	cache = VersionedLRUCache('test', max_entries=2)
+
+	assert cache.get('F-CGUP') is None
+	assert cache.put('F-CGUP', 'glider', cache.version('F-CGUP'))
+	assert cache.get('F-CGUP') == 'glider'
+
+	stats = cache.stats()
+	assert stats['hits'] == 1
+	assert stats['misses'] == 1
+	assert stats['hit_ratio'] == 0.5
+
+
+def test_least_recently_used_entry_is_evicted():
+	cache = VersionedLRUCache('test', max_entries=2)
+	for key in ('a', 'b'):
+		cache.put(key, key, cache.version(key))
+	cache.get('a')
+	cache.put('c', 'c', cache.version('c'))
+
+	assert cache.get('b') is None
+	assert cache.get('a') == 'a'
+	assert cache.get('c') == 'c'
+	assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+	now = [1000.0]
+	monkeypatch.setattr('backend.cache.time.monotonic', lambda: now[0])
+	cache = VersionedLRUCache('test', ttl=10)
+	cache.put('a', 'a', cache.version('a'))
+
+	now[0] += 5
+	assert cache.get('a') == 'a'
+	now[0] += 6
+	assert cache.get('a') is None
+	assert cache.stats()['expirations'] == 1
+
+
+def test_value_loaded_before_invalidation_is_not_stored():
+	cache = VersionedLRUCache('test')
+	cache.put('a', 'old', cache.version('a'))
+
+	version = cache.version('a')
+	cache.invalidate('a')
+	assert cache.get('a') is None
+	assert not cache.put('a', 'stale', version)
+	assert cache.get('a') is None
+
+	assert cache.put('a', 'new', cache.version('a'))
+	assert cache.get('a') == 'new'
+
+
+def test_clear_rejects_values_loaded_before_it():
+	cache = VersionedLRUCache('test')
+	version = cache.version('a')
+	cache.put('b', 'b', cache.version('b'))
+
+	cache.clear()
+
+	assert cache.get('b') is None
+	assert not cache.put('a', 'stale', version)
+	assert cache.stats()['stale_puts'] == 1
+
+
+def test_invalidate_tag_drops_tagged_entries_and_rejects_stale_loads():
+	cache = VersionedLRUCache('test')
+	cache.put('token-1', 'admin', cache.version('token-1', 'admin'), tag='admin')
+	cache.put('token-2', 'admin', cache.version('token-2', 'admin'), tag='admin')
+	cache.put('token-3', 'pilot', cache.version('token-3', 'pilot'), tag='pilot')
+	version = cache.version('token-4', 'admin')
+
+	cache.invalidate_tag('admin')
+
+	assert cache.get('token-1') is None
+	assert cache.get('token-2') is None
+	assert cache.get('token-3') == 'pilot'
+	assert not cache.put('token-4', 'admin', version, tag='admin')
+	assert cache.put('token-4', 'admin', cache.version('token-4', 'admin'), tag='admin')
+
+
+def test_invalidation_versions_are_bounded():
+	cache = VersionedLRUCache('test', max_entries=2)
+	version = cache.version('a')
+
+	for index in range(10):
+		cache.invalidate(f'key-{index}')
+		cache.invalidate_tag(f'tag-{index}')
+
+	assert len(cache._versions) == 2
+	assert len(cache._tag_versions) == 2
+	assert not cache.put('a', 'stale', version)
+	assert not cache.put('key-0', 'stale', version)
+	assert cache.put('key-0', 'fresh', cache.version('key-0'))
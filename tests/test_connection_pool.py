@@ -0,0 +1,118 @@
+import threading
+
+import duckdb
+import pytest
+
+from backend.db.connection import ConnectionPool, PoolTimeoutError
+
+
+@pytest.fixture
+def pool(tmp_path):
+	pool = ConnectionPool(str(tmp_path / 'pool_test.duckdb'), max_cursors=2, timeout=0.2)
+	with pool.cursor() as conn:
+		conn.execute('CREATE TABLE T (a INTEGER)')
+	yield pool
+	pool.close()
+
+
+def test_cursors_share_one_database_instance(pool):
+	with pool.cursor() as conn:
+		conn.execute('INSERT INTO T VALUES (1)')
+
+	with pool.cursor(read_only=True) as conn:
+		assert conn.execute('SELECT count(*) FROM T').fetchone()[0] == 1
+
+	stats = pool.stats()
+	assert stats['open'] is True
+	assert stats['checkouts'] == 3
+	assert stats['read_only_checkouts'] == 1
+	assert stats['read_write_checkouts'] == 2
+	assert stats['open_cursors'] == 0
+
+
+def test_read_only_cursor_rejects_writes(pool):
+	with pool.cursor(read_only=True) as conn:
+		with pytest.raises(duckdb.TransactionException):
+			conn.execute('INSERT INTO T VALUES (1)')
+
+	with pool.cursor(read_only=True) as conn:
+		assert conn.execute('SELECT count(*) FROM T').fetchone()[0] == 0
+
+
+def test_checkout_times_out_when_pool_is_exhausted(pool):
+	release = threading.Event()
+	checked_out = threading.Barrier(3)
+
+	def hold_cursor():
+		with pool.cursor(read_only=True):
+			checked_out.wait()
+			release.wait()
+
+	holders = [threading.Thread(target=hold_cursor) for _ in range(2)]
+	for holder in holders:
+		holder.start()
+	checked_out.wait()
+
+	try:
+		assert pool.stats()['open_cursors'] == 2
+		with pytest.raises(PoolTimeoutError):
+			with pool.cursor():
+				pass
+	finally:
+		release.set()
+		for holder in holders:
+			holder.join()
+
+	stats = pool.stats()
+	assert stats['timeouts'] == 1
+	assert stats['peak_open_cursors'] == 2
+	assert stats['open_cursors'] == 0
+
+
+def test_quiesce_waits_for_cursors_and_holds_back_checkouts(pool):
+	checked_out = threading.Event()
+	release = threading.Event()
+	quiesced = threading.Event()
+	rows = []
+
+	def hold_cursor():
+		with pool.cursor():
+			checked_out.set()
+			release.wait()
+
+	def swap():
+		with pool.quiesce(timeout=2):
+			quiesced.set()
+			assert pool.is_open is False
+			release.wait(0.1)
+
+	def read_after_swap():
+		quiesced.wait()
+		with pool.cursor(read_only=True) as conn:
+			rows.append(conn.execute('SELECT count(*) FROM T').fetchone()[0])
+
+	holder = threading.Thread(target=hold_cursor)
+	holder.start()
+	checked_out.wait()
+	swapper = threading.Thread(target=swap)
+	reader = threading.Thread(target=read_after_swap)
+	swapper.start()
+	reader.start()
+
+	assert not quiesced.wait(0.1)
+	release.set()
+	for thread in (holder, swapper, reader):
+		thread.join()
+
+	assert rows == [0]
+	assert pool.is_open is True
+
+
+def test_quiesce_times_out_while_cursors_are_checked_out(pool):
+	with pool.cursor():
+		with pytest.raises(PoolTimeoutError):
+			with pool.quiesce(timeout=0.1):
+				pass
+
+	with pool.cursor(read_only=True) as conn:
+		assert conn.execute('SELECT count(*) FROM T').fetchone()[0] == 0
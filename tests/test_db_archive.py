@@ -0,0 +1,184 @@
+import hashlib
+import io
+import json
+import os
+import zipfile
+from datetime import datetime
+
+import duckdb
+import pytest
+
+from backend.init_db import SCHEMA_VERSION, initialize_database
+from backend.services.db_archive import (
+	MANIFEST_NAME,
+	ArchiveValidationError,
+	apply_partial,
+	build_manifest,
+	export_tables,
+	extract_archive,
+	iter_zip,
+	read_manifest,
+)
+
+
+def _export_dir(tmp_path):
+	export_dir = tmp_path / 'export'
+	export_dir.mkdir()
+	(export_dir / 'schema.sql').write_text('CREATE TABLE GLIDER (registration VARCHAR);\n')
+	(export_dir / 'glider.parquet').write_bytes(os.urandom(300_000))
+	return str(export_dir)
+
+
+def test_manifest_lists_sizes_and_checksums(tmp_path):
+	export_dir = _export_dir(tmp_path)
+
+	manifest = build_manifest(export_dir)
+
+	data = open(os.path.join(export_dir, 'glider.parquet'), 'rb').read()
+	assert manifest['files']['glider.parquet'] == {'size': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+	assert set(manifest['files']) == {'schema.sql', 'glider.parquet'}
+
+
+def test_zip_is_streamed_in_bounded_chunks(tmp_path):
+	export_dir = _export_dir(tmp_path)
+	manifest = build_manifest(export_dir)
+
+	chunks = list(iter_zip(export_dir, manifest, chunk_size=64 * 1024))
+
+	assert len(chunks) > 3
+	assert max(len(chunk) for chunk in chunks) < 3 * 64 * 1024
+	with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as archive:
+		assert archive.namelist()[0] == MANIFEST_NAME
+		assert json.loads(archive.read(MANIFEST_NAME)) == manifest
+		assert archive.testzip() is None
+		for name, entry in manifest['files'].items():
+			assert hashlib.sha256(archive.read(name)).hexdigest() == entry['sha256']
+
+
+def _archive(tmp_path, manifest_update=None, extra=None):
+	export_dir = _export_dir(tmp_path)
+	(tmp_path / 'export' / 'load.sql').write_text("COPY GLIDER FROM 'glider.parquet' (FORMAT 'parquet');\n")
+	manifest = build_manifest(export_dir)
+	manifest.update(manifest_update or {})
+	path = tmp_path / 'archive.zip'
+	path.write_bytes(b''.join(iter_zip(export_dir, manifest)))
+	if extra:
+		with zipfile.ZipFile(path, 'a') as archive:
+			archive.writestr(*extra)
+	return str(path)
+
+
+def test_archive_is_verified_while_extracted(tmp_path):
+	path = _archive(tmp_path)
+	manifest = read_manifest(path)
+	progress = []
+
+	extract_archive(path, manifest, str(tmp_path / 'out'), progress=lambda done, total: progress.append((done, total)))
+
+	assert set(os.listdir(tmp_path / 'out')) == {'schema.sql', 'load.sql', 'glider.parquet'}
+	assert progress[-1][0] == progress[-1][1]
+
+	manifest['files']['glider.parquet']['sha256'] = '0' * 64
+	with pytest.raises(ArchiveValidationError, match='Checksum'):
+		extract_archive(path, manifest, str(tmp_path / 'out2'))
+
+
+@pytest.mark.parametrize('manifest_update, extra, message', [
+	({'schema_version': SCHEMA_VERSION + 1}, None, 'schema version'),
+	({'format': 'other'}, None, 'Not a'),
+	(None, ('extra.parquet', b'x'), 'do not match'),
+	(None, ('../escape.sql', b'x'), 'Unsafe path'),
+])
+def test_invalid_archives_are_rejected(tmp_path, manifest_update, extra, message):
+	path = _archive(tmp_path, manifest_update, extra)
+
+	with pytest.raises(ArchiveValidationError, match=message):
+		read_manifest(path)
+
+
+def _glider_db(path, gliders):
+	initialize_database(str(path))
+	conn = duckdb.connect(str(path))
+	for registration, weighing_dates in gliders.items():
+		conn.execute('INSERT INTO GLIDER (registration, model) VALUES (?, ?)', [registration, 'LS4'])
+		conn.execute("INSERT INTO GLIDER_CHANGE VALUES (?, TIMESTAMP '2020-01-01', false)", [registration])
+		for weighing_date in weighing_dates:
+			conn.execute(
+				"INSERT INTO WEIGHING (registration, date, p1, p2) VALUES (?, ?, 1, 2)",
+				[registration, weighing_date],
+			)
+	return conn
+
+
+def test_partial_export_is_applied_as_an_upsert(tmp_path):
+	source = _glider_db(tmp_path / 'source.duckdb', {'F-AAAA': ['2024-01-01', '2024-06-01'], 'F-BBBB': ['2024-01-01']})
+	target = _glider_db(tmp_path / 'target.duckdb', {'F-AAAA': ['2019-01-01'], 'F-BBBB': [], 'F-CCCC': ['2019-01-01']})
+	since = datetime(2023, 1, 1)
+	source.execute("UPDATE GLIDER_CHANGE SET changed_at = TIMESTAMP '2024-06-01' WHERE registration = 'F-AAAA'")
+	source.execute("INSERT INTO GLIDER_CHANGE VALUES ('F-CCCC', TIMESTAMP '2024-06-02', true)")
+	source.execute("INSERT INTO AUDITLOG (timestamp, username, event) VALUES (TIMESTAMP '2022-01-01', 'admin', 'old'), (TIMESTAMP '2024-06-01', 'admin', 'new')")
+
+	export_dir = tmp_path / 'partial'
+	export_dir.mkdir()
+	partial = export_tables(source, str(export_dir), ['GLIDER', 'WEIGHING', 'AUDITLOG'], since)
+	assert partial['gliders'] == {'changed': ['F-AAAA'], 'deleted': ['F-CCCC']}
+	path = tmp_path / 'partial.zip'
+	path.write_bytes(b''.join(iter_zip(str(export_dir), build_manifest(str(export_dir), partial))))
+	manifest = read_manifest(str(path))
+	assert manifest['kind'] == 'partial'
+
+	for _ in range(2):
+		import_dir = tmp_path / f'import-{_}'
+		extract_archive(str(path), manifest, str(import_dir))
+		apply_partial(target, str(import_dir), manifest)
+
+	weighings = target.execute('SELECT id, registration, date FROM WEIGHING ORDER BY registration, date').fetchall()
+	assert [(entry_id, registration, str(day)) for entry_id, registration, day in weighings] == [
+		(1, 'F-AAAA', '2024-01-01'), (2, 'F-AAAA', '2024-06-01'),
+	]
+	new_id = target.execute("INSERT INTO WEIGHING (registration, date, p1, p2) VALUES ('F-BBBB', DATE '2024-07-01', 1, 2) RETURNING id").fetchone()[0]
+	assert new_id == 3
+	assert [row[0] for row in target.execute('SELECT registration FROM GLIDER ORDER BY 1').fetchall()] == ['F-AAAA', 'F-BBBB']
+	assert target.execute('SELECT event FROM AUDITLOG').fetchall() == [('new',)]
+	assert target.execute("SELECT deleted FROM GLIDER_CHANGE WHERE registration = 'F-CCCC'").fetchone() == (True,)
+
+
+def _weighing_delta(tmp_path, source):
+	export_dir = tmp_path / 'weighings'
+	export_dir.mkdir()
+	partial = export_tables(source, str(export_dir), ['WEIGHING'], datetime(2023, 1, 1))
+	path = tmp_path / 'weighings.zip'
+	path.write_bytes(b''.join(iter_zip(str(export_dir), build_manifest(str(export_dir), partial))))
+	manifest = read_manifest(str(path))
+	extract_archive(str(path), manifest, str(tmp_path / 'import'))
+	return str(tmp_path / 'import'), manifest
+
+
+def test_weighing_delta_is_applied_with_its_ids_and_advances_the_sequence(tmp_path):
+	source = _glider_db(tmp_path / 'source.duckdb', {'F-AAAA': ['2024-01-01', '2024-02-01', '2024-03-01']})
+	source.execute("UPDATE GLIDER_CHANGE SET changed_at = TIMESTAMP '2024-06-01'")
+	source.execute('DELETE FROM WEIGHING WHERE id = 1')
+	target = _glider_db(tmp_path / 'target.duckdb', {'F-AAAA': ['2019-01-01']})
+	import_dir, manifest = _weighing_delta(tmp_path, source)
+
+	apply_partial(target, import_dir, manifest)
+	apply_partial(target, import_dir, manifest)
+
+	assert target.execute('SELECT id FROM WEIGHING ORDER BY id').fetchall() == [(2,), (3,)]
+	new_id = target.execute("INSERT INTO WEIGHING (registration, date, p1, p2) VALUES ('F-AAAA', DATE '2024-07-01', 1, 2) RETURNING id").fetchone()[0]
+	assert new_id == 4
+
+
+@pytest.mark.parametrize('target_gliders, message', [
+	({'F-BBBB': []}, 'gliders missing from this database: F-AAAA'),
+	({'F-BBBB': ['2019-01-01'], 'F-AAAA': []}, 'WEIGHING ids are used by other gliders'),
+])
+def test_weighing_delta_that_cannot_apply_is_rejected(tmp_path, target_gliders, message):
+	source = _glider_db(tmp_path / 'source.duckdb', {'F-AAAA': ['2024-01-01']})
+	source.execute("UPDATE GLIDER_CHANGE SET changed_at = TIMESTAMP '2024-06-01'")
+	target = _glider_db(tmp_path / 'target.duckdb', target_gliders)
+	import_dir, manifest = _weighing_delta(tmp_path, source)
+
+	with pytest.raises(ArchiveValidationError, match=message):
+		apply_partial(target, import_dir, manifest)
+	assert target.execute('SELECT registration FROM WEIGHING').fetchall() == [('F-BBBB',)] * len(target_gliders['F-BBBB'])
@@ -0,0 +1,66 @@
+import pytest
+
+from backend.models.glider import Arms, Glider, Limits
+from backend.services.envelope import envelope_cache, get_envelope
+
+
+@pytest.fixture
+def glider():
+	envelope_cache.clear()
+	return Glider(
+		model='LS6c 18M',
+		registration='F-CGUP',
+		brand='Rolladen-Schneider',
+		serial_number=6244,
+		single_seat=True,
+		datum=1,
+		pilot_position=1,
+		datum_label='',
+		wedge='',
+		wedge_position='',
+		limits=Limits(mmwp=525.0, mmwv=525.0, mmenp=235.0, mm_harnais=110.0, weight_min_pilot=70.0, front_centering=250.0, rear_centering=400.0),
+		arms=Arms(arm_front_pilot=513.0, arm_rear_pilot=0.0, arm_waterballast=0.0, arm_front_ballast=0.0, arm_rear_watterballast_or_ballast=0.0, arm_gas_tank=0.0, arm_instruments_panel=0.0),
+		weight_and_balances=[(250, 200.0), (250, 525.0), (400, 525.0), (400, 200.0), (250, 200.0)],
+	)
+
+
+def test_polygon_containment_includes_boundary(glider):
+	envelope = get_envelope(glider)
+	inside, margin = envelope.check([364.8, 364.8, 525.0, 530.0], [356.0, 410.0, 250.0, 300.0])
+
+	assert envelope.source == 'polygon'
+	assert inside.tolist() == [True, False, True, False]
+	assert margin.tolist() == pytest.approx([44.0, -10.0, 0.0, -5.0])
+
+
+def test_single_point_check(glider):
+	inside, margin = get_envelope(glider).check(364.8, 356.0)
+
+	assert bool(inside) is True
+	assert float(margin) == pytest.approx(44.0)
+
+
+def test_limits_box_without_polygon(glider):
+	glider.weight_and_balances = []
+	envelope = get_envelope(glider)
+
+	assert envelope.source == 'limits'
+	assert envelope.contains([364.8, 364.8, 530.0], [356.0, 410.0, 300.0]).tolist() == [True, False, False]
+
+
+def test_no_envelope_without_points_or_limits(glider):
+	glider.weight_and_balances = []
+	glider.limits = None
+
+	assert get_envelope(glider) is None
+
+
+def test_envelope_is_cached_until_points_change(glider):
+	envelope = get_envelope(glider)
+	assert get_envelope(glider) is envelope
+
+	glider.weight_and_balances = [(250, 200.0), (250, 525.0), (450, 525.0), (450, 200.0)]
+	rebuilt = get_envelope(glider)
+
+	assert rebuilt is not envelope
+	assert bool(rebuilt.contains(364.8, 410.0))
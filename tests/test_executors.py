@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.executors import BoundedExecutor
+
+
+def test_run_returns_result_and_counts_failures():
+	executor = BoundedExecutor('test', max_workers=1)
+
+	async def scenario():
+		assert await executor.run(pow, 2, 10) == 1024
+		with pytest.raises(ZeroDivisionError):
+			await executor.run(lambda: 1 / 0)
+
+	asyncio.run(scenario())
+	executor.shutdown()
+
+	stats = executor.stats()
+	assert stats['completed'] == 2
+	assert stats['failed'] == 1
+	assert stats['queued'] == 0
+
+
+def test_work_waits_in_queue_when_workers_are_busy():
+	executor = BoundedExecutor('test', max_workers=1)
+	release = threading.Event()
+
+	async def scenario():
+		blocked = asyncio.ensure_future(executor.run(release.wait))
+		waiting = asyncio.ensure_future(executor.run(lambda: 'done'))
+		await asyncio.sleep(0.05)
+		stats = executor.stats()
+		release.set()
+		assert await waiting == 'done'
+		await blocked
+		return stats
+
+	stats = asyncio.run(scenario())
+	executor.shutdown()
+
+	assert stats['active'] == 1
+	assert stats['queued'] == 1
+	assert executor.stats()['peak_queued'] >= 1
+	assert executor.stats()['wait_time_max_ms'] >= 40
@@ -122,6 +122,26 @@ class Test_Glider_FCGUP:
 		assert glider.pilot_av_maxi() == 130.6
 		assert glider.empty_arm() == 600.0
 
+	def test_summary(self, glider_FCGUP: Glider):
+		summary = glider_FCGUP.summary()
+
+		assert summary.registration == "F-CGUP"
+		assert summary.mve == summary.empty_weight == 284.8
+		assert summary.mvenp == 132.0
+		assert summary.cu == 103.0
+		assert summary.pilot_av_mini == 62.4
+		assert summary.pilot_av_mini_duo == 62.4
+		assert summary.pilot_av_maxi == 130.6
+		assert summary.empty_arm == 600.0
+
+	def test_summary_without_weighing(self, glider_FCGUP: Glider):
+		glider_FCGUP.weighings = []
+		summary = glider_FCGUP.summary()
+
+		assert summary.empty_weight is None
+		assert summary.cu is None
+		assert summary.pilot_av_maxi is None
+
 	def test_center_gravity_calculation(self, glider_FCGUP: Glider):
 		glider = glider_FCGUP
 
@@ -245,3 +265,19 @@ class Test_Glider_FCJBH:
 
 		assert weight == 501.4
 		assert gc == pytest.approx(2330, abs=0.5)
+
+
+@pytest.mark.parametrize('glider_fixture', ['glider_FCGUP', 'glider_D2080', 'glider_FCGDT', 'glider_FCJBH'])
+def test_batch_calculation_matches_scalar(glider_fixture, request):
+	glider = request.getfixturevalue(glider_fixture)
+	loads = [
+		(80.0, 0.0, 0.0, 0.0, 0.0),
+		(65.0, 80.0, 0.0, 0.0, 0.0),
+		(80.0, 0.0, 0.0, 2.0, 0.0),
+		(80.0, 0.0, 5.5, 0.0, 50.0),
+		(102.3, 71.7, 1.1, 0.3, 99.9),
+	]
+
+	weights, cgs = glider.weight_and_balance_batch(*zip(*loads))
+
+	assert [glider.weight_and_balance_calculator(*load) for load in loads] == list(zip(weights.tolist(), cgs.tolist()))
@@ -0,0 +1,161 @@
+import datetime
+
+import duckdb
+import pytest
+
+from backend.db import glider_queries
+from backend.db.connection import ConnectionPool
+from backend.db.glider_queries import (
+	_load_gliders,
+	delete_weighing,
+	get_fleet,
+	get_glider_by_id,
+	get_glider_summary,
+	list_glider_summaries,
+	list_gliders_page,
+	refresh_glider_summaries,
+	save_weighings,
+)
+from backend.models.glider import Weighing
+from backend.init_db import initialize_database
+
+
+class _CountingConnection:
+	def __init__(self, conn):
+		self.conn = conn
+		self.queries = 0
+
+	def execute(self, *args, **kwargs):
+		self.queries += 1
+		return self.conn.execute(*args, **kwargs)
+
+
+@pytest.fixture
+def fleet_conn(tmp_path):
+	db_path = str(tmp_path / 'fleet.duckdb')
+	initialize_database(db_path)
+	conn = duckdb.connect(db_path)
+	for registration, model in (('F-CGUP', 'LS6c 18M'), ('D-2080', 'Ventus 2c'), ('F-CJDT', 'Janus C')):
+		conn.execute(
+			'INSERT INTO GLIDER VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+			[model, registration, 'brand', '62', True, 1, 1, 'label', 'wedge', 'position',
+			 525.0, 525.0, 235.0, 110.0, 70.0, 250.0, 400.0,
+			 513.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+		)
+	for point_index, point in enumerate([(250, 200.0), (250, 525.0), (400, 525.0)]):
+		conn.execute('INSERT INTO WB_LIMIT VALUES (?, ?, ?, ?)', ['F-CGUP', point_index, point[0], point[1]])
+	conn.execute('INSERT INTO WB_LIMIT VALUES (?, ?, ?, ?)', ['D-2080', 0, 250, 525.0])
+	conn.execute(
+		'''INSERT INTO WEIGHING (date, registration, p1, p2, right_wing_weight, left_wing_weight, tail_weight, fuselage_weight, A, D)
+		VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+		[datetime.date(2019, 4, 23), 'F-CGUP', 256.0, 28.8, 75.8, 77.0, 6.8, 125.2, 178, 4178],
+	)
+	conn.execute(
+		'INSERT INTO INVENTORY (registration, on_board, instrument, brand, type, number, seat) VALUES (?, ?, ?, ?, ?, ?, ?)',
+		['D-2080', True, 'Vario', 'LX', 'S80', '1', None],
+	)
+	yield conn
+	conn.close()
+
+
+@pytest.fixture
+def fleet_pool(fleet_conn, tmp_path, monkeypatch):
+	pool = ConnectionPool(str(tmp_path / 'fleet.duckdb'))
+	monkeypatch.setattr(glider_queries, '_get_database_connection', lambda read_only=False: pool.cursor(read_only=read_only))
+	glider_queries.glider_cache.clear()
+	yield pool
+	pool.close()
+	glider_queries.glider_cache.clear()
+
+
+def test_load_gliders_uses_one_query_per_child_table(fleet_conn):
+	rows = fleet_conn.execute('SELECT * FROM GLIDER').fetchall()
+	counting_conn = _CountingConnection(fleet_conn)
+
+	gliders = _load_gliders(counting_conn, rows)
+
+	assert counting_conn.queries == 3
+	assert list(gliders) == ['F-CGUP', 'D-2080', 'F-CJDT']
+
+
+def test_load_gliders_groups_child_rows_by_registration(fleet_conn):
+	rows = fleet_conn.execute('SELECT * FROM GLIDER').fetchall()
+
+	gliders = _load_gliders(fleet_conn, rows)
+
+	glider = gliders['F-CGUP']
+	assert glider.serial_number == 62
+	assert glider.weight_and_balances == [(250, 200.0), (250, 525.0), (400, 525.0)]
+	assert len(glider.weighings) == 1
+	assert glider.empty_weight() == 284.8
+	assert glider.instruments == []
+
+	assert gliders['D-2080'].weight_and_balances == [(250, 525.0)]
+	assert gliders['D-2080'].weighings == []
+	assert [instrument.instrument for instrument in gliders['D-2080'].instruments] == ['Vario']
+	assert gliders['D-2080'].instruments[0].seat == ''
+
+	assert gliders['F-CJDT'].weight_and_balances == []
+
+
+def test_load_gliders_without_rows_skips_child_queries(fleet_conn):
+	counting_conn = _CountingConnection(fleet_conn)
+
+	assert _load_gliders(counting_conn, []) == {}
+	assert counting_conn.queries == 0
+
+
+def test_list_gliders_page_filters_and_pages_in_sql(fleet_pool):
+	gliders, total = list_gliders_page(limit=2)
+	assert [glider.registration for glider in gliders] == ['D-2080', 'F-CGUP']
+	assert total == 3
+
+	gliders, total = list_gliders_page(limit=2, after='F-CGUP')
+	assert [glider.registration for glider in gliders] == ['F-CJDT']
+	assert total == 3
+
+	gliders, total = list_gliders_page(skip=1, limit=1)
+	assert [glider.registration for glider in gliders] == ['F-CGUP']
+
+	gliders, total = list_gliders_page(has_weighing=True)
+	assert [glider.registration for glider in gliders] == ['F-CGUP']
+	assert gliders[0].weight_and_balances == [(250, 200.0), (250, 525.0), (400, 525.0)]
+	assert total == 1
+
+	gliders, total = list_gliders_page(has_weighing=False, model='Janus C')
+	assert [glider.registration for glider in gliders] == ['F-CJDT']
+	assert total == 1
+
+	gliders, total = list_gliders_page(single_seat=False)
+	assert gliders == []
+	assert total == 0
+
+
+def test_glider_summaries_follow_weighing_changes(fleet_pool):
+	assert refresh_glider_summaries() == 3
+	summaries, total = list_glider_summaries()
+	assert [summary.registration for summary in summaries] == ['D-2080', 'F-CGUP', 'F-CJDT']
+	assert total == 3
+	assert get_glider_summary('F-CGUP').empty_weight == 284.8
+	assert get_glider_summary('D-2080').empty_weight is None
+
+	weighing = Weighing(id=None, date=datetime.date(2024, 10, 31), p1=250.2, p2=34.0, right_wing_weight=75.0, left_wing_weight=75.0, tail_weight=7.0, fuselage_weight=127.2, A=100, D=4145)
+	save_weighings('D-2080', [weighing])
+	summary = get_glider_summary('D-2080')
+	assert summary.empty_weight == 284.2
+	assert summary.empty_arm == 596.0
+
+	delete_weighing('D-2080', weighing.id)
+	assert get_glider_summary('D-2080').empty_weight is None
+
+
+def test_get_fleet_reuses_cached_gliders(fleet_pool):
+	cached = get_glider_by_id('F-CGUP')
+
+	fleet = get_fleet()
+	assert [glider.registration for glider in fleet] == ['D-2080', 'F-CGUP', 'F-CJDT']
+	assert fleet[1] is cached
+	assert get_glider_by_id('D-2080') is fleet[0]
+
+	assert [glider.registration for glider in get_fleet(model='Janus C')] == ['F-CJDT']
+	assert [glider.registration for glider in get_fleet(registrations=['F-CJDT', 'D-2080', 'X-NONE'])] == ['D-2080', 'F-CJDT']
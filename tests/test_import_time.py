@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Loaded on first use only: PDF rendering in the worker processes, envelopes on the first calculation
+LAZY_MODULES = ('xhtml2pdf', 'reportlab', 'PIL', 'pypdf', 'pyhanko', 'shapely', 'pandas')
+
+# Cold import of backend.main, about twice what it takes on a development machine
+IMPORT_TIME_BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', '3000'))
+
+
+def _import_times(module: str) -> dict:
+	"""Cumulative import time in microseconds of every module loaded by ``module``"""
+	result = subprocess.run(
+		[sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+		cwd=PROJECT_ROOT,
+		capture_output=True,
+		text=True,
+		check=True,
+	)
+	times = {}
+	for line in result.stderr.splitlines():
+		if not line.startswith('import time:') or 'cumulative' in line:
+			continue
+		_, cumulative_us, name = line.split('|')
+		times[name.strip()] = int(cumulative_us)
+	return times
+
+
+def test_backend_cold_import_stays_within_budget():
+	times = _import_times('backend.main')
+
+	loaded = sorted({name.split('.')[0] for name in times} & set(LAZY_MODULES))
+	assert not loaded, f'Heavy modules imported at startup: {loaded}'
+	assert times['backend.main'] / 1000 < IMPORT_TIME_BUDGET_MS
@@ -1,6 +1,6 @@
 import duckdb
 
-from backend.init_db import initialize_database
+from backend.init_db import SCHEMA_VERSION, initialize_database
 
 
 def _column_type(conn, table_name: str, column_name: str) -> str:
@@ -21,3 +21,64 @@ def test_glider_limits_columns_are_double(tmp_path):
 		assert _column_type(conn, 'WB_LIMIT', 'weight') == 'DOUBLE'
 	finally:
 		conn.close()
+
+
+def test_migrations_are_recorded_and_applied_once(tmp_path):
+	db_path = str(tmp_path / 'migrations_test.duckdb')
+	initialize_database(db_path)
+	initialize_database(db_path)
+
+	conn = duckdb.connect(db_path)
+	try:
+		versions = [row[0] for row in conn.execute('SELECT version FROM SCHEMA_VERSION ORDER BY version').fetchall()]
+		assert versions == list(range(1, SCHEMA_VERSION + 1))
+		assert _column_type(conn, 'USERS', 'updated_at') == 'TIMESTAMP'
+		assert conn.execute('SELECT count(*) FROM USERS').fetchone()[0] == 1
+	finally:
+		conn.close()
+
+
+def test_unversioned_database_is_migrated(tmp_path):
+	db_path = str(tmp_path / 'legacy_test.duckdb')
+	conn = duckdb.connect(db_path)
+	conn.execute('CREATE TABLE USERS (username VARCHAR PRIMARY KEY, email VARCHAR, password VARCHAR, role VARCHAR)')
+	conn.execute("INSERT INTO USERS VALUES ('pilot', 'pilot@example.com', 'x', 'viewer')")
+	conn.close()
+
+	initialize_database(db_path)
+
+	conn = duckdb.connect(db_path)
+	try:
+		assert conn.execute('SELECT max(version) FROM SCHEMA_VERSION').fetchone()[0] == SCHEMA_VERSION
+		assert _column_type(conn, 'USERS', 'created_at') == 'TIMESTAMP'
+		assert conn.execute('SELECT username FROM USERS').fetchall() == [('pilot',)]
+	finally:
+		conn.close()
+
+
+def test_audit_log_migration_keeps_rows_and_parses_resources(tmp_path):
+	db_path = str(tmp_path / 'audit_migration_test.duckdb')
+	conn = duckdb.connect(db_path)
+	conn.execute('CREATE TABLE AUDITLOG (timestamp TIMESTAMP PRIMARY KEY, username VARCHAR, event VARCHAR)')
+	conn.execute('''INSERT INTO AUDITLOG VALUES
+		('2024-01-02 10:00:00', 'admin', 'Weighing 3 printed for glider F-CGUP'),
+		('2024-01-01 10:00:00', 'admin', 'Glider F-CGUP created'),
+		('2024-01-03 10:00:00', 'admin', 'Free text note')''')
+	conn.close()
+
+	initialize_database(db_path)
+
+	conn = duckdb.connect(db_path)
+	try:
+		rows = conn.execute('SELECT id, event, resource_type, resource_id, action FROM AUDITLOG ORDER BY id').fetchall()
+		assert rows == [
+			(1, 'Glider F-CGUP created', 'glider', 'F-CGUP', 'create'),
+			(2, 'Weighing 3 printed for glider F-CGUP', 'glider', 'F-CGUP', 'print_weighing'),
+			(3, 'Free text note', None, None, None),
+		]
+		conn.execute("INSERT INTO AUDITLOG (timestamp, username, event) VALUES ('2024-01-03 10:00:00', 'admin', 'Same timestamp')")
+		assert conn.execute('SELECT max(id) FROM AUDITLOG').fetchone()[0] == 4
+		indexes = {row[0] for row in conn.execute("SELECT index_name FROM duckdb_indexes() WHERE table_name = 'AUDITLOG'").fetchall()}
+		assert {'auditlog_timestamp_idx', 'auditlog_username_idx', 'auditlog_resource_id_idx', 'auditlog_resource_type_idx'} <= indexes
+	finally:
+		conn.close()
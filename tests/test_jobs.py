@@ -0,0 +1,40 @@
+from backend.services.jobs import JobRegistry
+
+
+def test_job_moves_through_stages_to_its_result():
+	registry = JobRegistry()
+	job = registry.create('database_import', owner='admin')
+	assert job['status'] == 'queued'
+	assert registry.is_running('database_import')
+
+	registry.update(job['id'], 'extracting', 0.25)
+	running = registry.get(job['id'])
+	assert (running['status'], running['stage'], running['progress']) == ('running', 'extracting', 0.25)
+	assert running['started_at'] is not None
+
+	registry.succeed(job['id'], {'message': 'done'})
+	finished = registry.get(job['id'])
+	assert (finished['status'], finished['progress'], finished['result']) == ('succeeded', 1.0, {'message': 'done'})
+	assert not registry.is_running('database_import')
+
+
+def test_oldest_finished_jobs_are_forgotten():
+	registry = JobRegistry(max_finished=2)
+	jobs = [registry.create('pdf_pack') for _ in range(3)]
+	for job in jobs:
+		registry.fail(job['id'], 'boom')
+
+	assert registry.get(jobs[0]['id']) is None
+	assert registry.get(jobs[2]['id'])['error'] == 'boom'
+	assert registry.get('unknown') is None
+
+
+def test_only_one_job_of_a_kind_is_reserved_until_it_finishes():
+	registry = JobRegistry()
+	job = registry.reserve('database_import', owner='admin')
+	assert job is not None
+	assert registry.reserve('database_import', owner='admin') is None
+	assert registry.reserve('weighing_pack') is not None
+
+	registry.fail(job['id'], 'Invalid zip file')
+	assert registry.reserve('database_import') is not None
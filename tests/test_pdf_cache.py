@@ -0,0 +1,53 @@
+import os
+
+from backend.services.pdf_cache import PdfCache
+
+
+def test_least_recently_used_pdf_is_evicted():
+	cache = PdfCache('test', max_entries=2)
+	for key in ('a', 'b'):
+		cache.put('F-CGUP', key, key.encode(), cache.version('F-CGUP', key))
+	cache.get('F-CGUP', 'a')
+	cache.put('F-CGUP', 'c', b'c', cache.version('F-CGUP', 'c'))
+
+	assert cache.get('F-CGUP', 'b') is None
+	assert cache.get('F-CGUP', 'a') == b'a'
+	assert cache.stats()['evictions'] == 1
+
+
+def test_invalidating_a_glider_drops_only_its_pdfs(tmp_path):
+	cache = PdfCache('test', max_entries=8, directory=str(tmp_path))
+	cache.put('F-CGUP', 'a', b'a', cache.version('F-CGUP', 'a'))
+	cache.put('F-CLAB', 'b', b'b', cache.version('F-CLAB', 'b'))
+
+	version = cache.version('F-CGUP', 'c')
+	cache.invalidate_glider('F-CGUP')
+
+	assert cache.get('F-CGUP', 'a') is None
+	assert cache.get('F-CLAB', 'b') == b'b'
+	assert not cache.put('F-CGUP', 'c', b'stale', version)
+	assert len(os.listdir(tmp_path)) == 1
+
+
+def test_pdfs_are_read_back_from_disk(tmp_path):
+	cache = PdfCache('test', max_entries=8, directory=str(tmp_path))
+	cache.put('F-CGUP', 'a', b'%PDF', cache.version('F-CGUP', 'a'))
+
+	restarted = PdfCache('test', max_entries=8, directory=str(tmp_path))
+	assert restarted.get('F-CGUP', 'a') == b'%PDF'
+	assert restarted.get('F-CGUP', 'a') == b'%PDF'
+	assert restarted.stats()['disk_hits'] == 1
+
+
+def test_oldest_files_are_pruned(tmp_path):
+	cache = PdfCache('test', max_entries=8, directory=str(tmp_path), max_files=2)
+	for index, key in enumerate(('a', 'b', 'c')):
+		cache.put('F-CGUP', key, key.encode(), cache.version('F-CGUP', key))
+		path = cache._path('F-CGUP', key)
+		os.utime(path, (1000 + index, 1000 + index))
+
+	cache.put('F-CGUP', 'd', b'd', cache.version('F-CGUP', 'd'))
+
+	assert sorted(os.listdir(tmp_path)) == sorted(
+		os.path.basename(cache._path('F-CGUP', key)) for key in ('c', 'd')
+	)
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from backend.services.pdf_workers import PdfQueueFullError, PdfRenderTimeout, PdfWorkerError, PdfWorkerPool
+
+
+def _pid():
+	return os.getpid()
+
+
+def _sleep(seconds):
+	time.sleep(seconds)
+	return seconds
+
+
+_hoard = []
+
+
+def _hoard_memory(megabytes):
+	_hoard.append(b'x' * (megabytes * 1024 * 1024))
+	return megabytes
+
+
+def _invalid():
+	raise ValueError('Glider limits data is not configured')
+
+
+def _crash():
+	os._exit(1)
+
+
+@pytest.fixture
+def pool():
+	pool = PdfWorkerPool('test', workers=1, timeout=2.0, max_rss_mb=200, max_queue=0)
+	yield pool
+	pool.shutdown()
+
+
+def test_work_runs_in_a_reused_worker_process(pool):
+	pids = [asyncio.run(pool.run(_pid)) for _ in range(2)]
+
+	assert pids[0] == pids[1] != os.getpid()
+	stats = pool.stats()
+	assert stats['completed'] == 2
+	assert stats['latency_samples'] == 2
+	assert stats['latency_p50_ms'] <= stats['latency_p99_ms']
+
+
+def test_validation_errors_are_raised_again(pool):
+	with pytest.raises(ValueError, match='limits'):
+		asyncio.run(pool.run(_invalid))
+	assert pool.stats()['restarts'] == {'timeout': 0, 'memory': 0, 'crash': 0}
+
+
+def test_slow_render_times_out_and_restarts_the_worker(pool):
+	pid = asyncio.run(pool.run(_pid))
+	with pytest.raises(PdfRenderTimeout):
+		asyncio.run(pool.run(_sleep, 10))
+
+	assert asyncio.run(pool.run(_pid)) != pid
+	stats = pool.stats()
+	assert stats['timeouts'] == 1
+	assert stats['restarts'] == {'timeout': 1, 'memory': 0, 'crash': 0}
+
+
+def test_worker_over_memory_cap_is_replaced(pool):
+	pid = asyncio.run(pool.run(_pid))
+	assert asyncio.run(pool.run(_hoard_memory, 300)) == 300
+
+	assert asyncio.run(pool.run(_pid)) != pid
+	assert pool.stats()['restarts']['memory'] == 1
+
+
+def test_dead_worker_is_replaced(pool):
+	with pytest.raises(PdfWorkerError):
+		asyncio.run(pool.run(_crash))
+
+	assert asyncio.run(pool.run(_sleep, 0)) == 0
+	assert pool.stats()['restarts']['crash'] == 1
+
+
+def test_calls_beyond_the_queue_are_rejected(pool):
+	async def run_two():
+		return await asyncio.gather(pool.run(_sleep, 0.5), pool.run(_sleep, 0), return_exceptions=True)
+
+	first, second = asyncio.run(run_two())
+
+	assert first == 0.5
+	assert isinstance(second, PdfQueueFullError)
+	assert pool.stats()['rejected'] == 1
@@ -0,0 +1,76 @@
+import os
+import zipfile
+from datetime import date
+from io import BytesIO
+
+from pypdf import PdfReader
+from reportlab.pdfgen import canvas
+
+from backend.models.glider import Arms, Glider, Limits, Weighing
+from backend.services import weighing_pack
+from backend.services.weighing_pack import _select_sheets, prune_packs, write_pack
+
+
+def _glider(registration, weighings=True):
+	return Glider(
+		model='LS6c 18M',
+		registration=registration,
+		brand='Rolladen-Schneider',
+		serial_number=6244,
+		single_seat=True,
+		datum=1,
+		pilot_position=1,
+		datum_label='',
+		wedge='',
+		wedge_position='',
+		limits=Limits(mmwp=525.0, mmwv=525.0, mmenp=235.0, mm_harnais=110.0, weight_min_pilot=70.0, front_centering=250.0, rear_centering=400.0),
+		arms=Arms(arm_front_pilot=513.0, arm_rear_pilot=0.0, arm_waterballast=0.0, arm_front_ballast=0.0, arm_rear_watterballast_or_ballast=0.0, arm_gas_tank=0.0, arm_instruments_panel=0.0),
+		weighings=[
+			Weighing(id=1, date=date(2019, 4, 23), p1=256.0, p2=28.8, right_wing_weight=75.8, left_wing_weight=77.0, tail_weight=6.8, fuselage_weight=125.2, A=178, D=4178),
+			Weighing(id=2, date=date(2023, 4, 2), p1=257.0, p2=28.8, right_wing_weight=75.8, left_wing_weight=77.0, tail_weight=6.8, fuselage_weight=126.2, A=178, D=4178),
+		] if weighings else [],
+	)
+
+
+def _pdf(text):
+	output = BytesIO()
+	page = canvas.Canvas(output)
+	page.drawString(100, 700, text)
+	page.save()
+	return output.getvalue()
+
+
+def test_latest_weighing_of_each_glider_is_selected():
+	no_arms = _glider('F-CLAB')
+	no_arms.arms = None
+	selected, skipped = _select_sheets([_glider('F-CGUP'), _glider('D-2080', weighings=False), no_arms], ['F-CGUP', 'D-2080', 'F-CLAB', 'F-NONE'])
+
+	assert [(glider.registration, weighing.id) for glider, weighing in selected] == [('F-CGUP', 2)]
+	assert {item['registration'] for item in skipped} == {'D-2080', 'F-CLAB', 'F-NONE'}
+
+
+def test_pack_is_a_zip_or_a_merged_pdf(tmp_path):
+	sheets = [('a.pdf', _pdf('a')), ('b.pdf', _pdf('b'))]
+
+	zip_path = str(tmp_path / 'pack.zip')
+	assert write_pack(zip_path, 'zip', sheets) == os.path.getsize(zip_path)
+	with zipfile.ZipFile(zip_path) as zipf:
+		assert zipf.namelist() == ['a.pdf', 'b.pdf']
+		assert zipf.read('b.pdf') == sheets[1][1]
+
+	pdf_path = str(tmp_path / 'pack.pdf')
+	write_pack(pdf_path, 'pdf', sheets)
+	assert len(PdfReader(pdf_path).pages) == 2
+
+
+def test_old_packs_are_pruned(tmp_path, monkeypatch):
+	monkeypatch.setattr(weighing_pack, 'PACK_DIR', str(tmp_path))
+	old, recent = tmp_path / 'old.zip', tmp_path / 'recent.zip'
+	old.write_bytes(b'old')
+	recent.write_bytes(b'recent')
+	os.utime(old, (0, 0))
+
+	prune_packs(max_age=60)
+
+	assert sorted(os.listdir(tmp_path)) == ['recent.zip']
+
@@ -1,6 +1,19 @@
+from dataclasses import replace
+from datetime import date
+from io import BytesIO
+
 import pytest
+from PIL import Image
 
-from backend.services.weighing_pdf import WeighingPdfService
+from backend.models.glider import Arms, Glider, Instrument, Limits, Weighing
+from backend.services.weighing_pdf import (
+	IMAGE_DPI,
+	LOGO_PATH,
+	LOGO_WIDTH,
+	CompiledTemplate,
+	WeighingPdfService,
+	_encode_image,
+)
 
 
 @pytest.mark.parametrize(
@@ -14,3 +27,47 @@ from backend.services.weighing_pdf import WeighingPdfService
 )
 def test_get_retained_pilot_max(calculated_max, cu_max, cv_max, seat_limit, expected):
 	assert WeighingPdfService._get_retained_pilot_max(calculated_max, cu_max, cv_max, seat_limit) == expected
+
+
+def test_compiled_template_matches_str_format():
+	template = '<style>{{ a: b }}</style><p>{logo}</p><h1>{title}</h1>{body}'
+	compiled = CompiledTemplate(template, logo='<img/>')
+
+	assert compiled.fields == {'title', 'body'}
+	assert compiled.render(title='T', body='B') == template.format(logo='<img/>', title='T', body='B')
+
+
+def test_images_are_resampled_for_their_printed_width():
+	data = _encode_image(LOGO_PATH, LOGO_WIDTH)
+
+	with Image.open(BytesIO(data)) as image:
+		assert image.mode == 'RGB'
+		assert image.width == round(LOGO_WIDTH * IMAGE_DPI / 72)
+	assert len(data) < LOGO_PATH.stat().st_size
+
+
+def test_cache_key_follows_printed_content():
+	glider = Glider(
+		model='LS6c 18M',
+		registration='F-CGUP',
+		brand='Rolladen-Schneider',
+		serial_number=6244,
+		single_seat=True,
+		datum=1,
+		pilot_position=1,
+		datum_label='',
+		wedge='',
+		wedge_position='',
+		limits=Limits(mmwp=525.0, mmwv=525.0, mmenp=235.0, mm_harnais=110.0, weight_min_pilot=70.0, front_centering=250.0, rear_centering=400.0),
+		arms=Arms(arm_front_pilot=513.0, arm_rear_pilot=0.0, arm_waterballast=0.0, arm_front_ballast=0.0, arm_rear_watterballast_or_ballast=0.0, arm_gas_tank=0.0, arm_instruments_panel=0.0),
+		instruments=[Instrument(id=1, on_board=False, instrument='Radio', brand='Dittel', type='KRT2', number='1', seat='front')],
+	)
+	weighing = Weighing(id=1, date=date(2024, 3, 1), p1=50.0, p2=20.0, right_wing_weight=80.0, left_wing_weight=80.0, tail_weight=20.0, fuselage_weight=100.0)
+	key = WeighingPdfService.cache_key(glider, weighing)
+
+	assert WeighingPdfService.cache_key(glider, replace(weighing)) == key
+	glider.instruments[0].seat = 'rear'
+	assert WeighingPdfService.cache_key(glider, weighing) == key
+	glider.instruments[0].on_board = True
+	assert WeighingPdfService.cache_key(glider, weighing) != key
+	assert WeighingPdfService.cache_key(glider, replace(weighing, p1=51.0)) != WeighingPdfService.cache_key(glider, weighing)
@@ -0,0 +1,142 @@
+import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from backend.models.glider import Arms, Glider, Limits, Weighing
+from backend.schemas.glider import BallastOptimizationRequest, WeightBalanceBatchRequest, WeightBalanceCalculationRequest
+from backend.services.envelope import envelope_cache
+from backend.services import weight_balance
+from backend.services.weight_balance import calculate_fleet, expand_loads, minimum_ballast, optimize_ballast
+
+
+@pytest.fixture
+def glider():
+	envelope_cache.clear()
+	return Glider(
+		model='LS6c 18M',
+		registration='F-CGUP',
+		brand='Rolladen-Schneider',
+		serial_number=6244,
+		single_seat=True,
+		datum=1,
+		pilot_position=1,
+		datum_label='',
+		wedge='',
+		wedge_position='',
+		limits=Limits(mmwp=525.0, mmwv=525.0, mmenp=235.0, mm_harnais=110.0, weight_min_pilot=70.0, front_centering=250.0, rear_centering=400.0),
+		arms=Arms(arm_front_pilot=513.0, arm_rear_pilot=0.0, arm_waterballast=0.0, arm_front_ballast=0.0, arm_rear_watterballast_or_ballast=0.0, arm_gas_tank=0.0, arm_instruments_panel=0.0),
+		weighings=[Weighing(id=1, date=datetime.date(2019, 4, 23), p1=256.0, p2=28.8, right_wing_weight=75.8, left_wing_weight=77.0, tail_weight=6.8, fuselage_weight=125.2, A=178, D=4178)],
+		weight_and_balances=[(250, 200.0), (250, 525.0), (400, 525.0), (400, 200.0)],
+	)
+
+
+def _loading(front_pilot_weight):
+	return WeightBalanceCalculationRequest(
+		front_pilot_weight=front_pilot_weight,
+		rear_pilot_weight=0,
+		front_ballast_weight=0,
+		rear_ballast_weight=0,
+		wing_water_ballast_weight=0,
+	)
+
+
+def test_zip_mode_repeats_single_values():
+	loads = expand_loads(WeightBalanceBatchRequest(front_pilot_weight=[70, 80, 90], rear_pilot_weight=[10]), 100)
+
+	assert loads['front_pilot_weight'].tolist() == [70.0, 80.0, 90.0]
+	assert loads['rear_pilot_weight'].tolist() == [10.0, 10.0, 10.0]
+	assert loads['wing_water_ballast_weight'].tolist() == [0.0, 0.0, 0.0]
+
+
+def test_zip_mode_rejects_mismatched_lengths():
+	with pytest.raises(ValueError):
+		expand_loads(WeightBalanceBatchRequest(front_pilot_weight=[70, 80], rear_pilot_weight=[0, 10, 20]), 100)
+
+
+def test_grid_mode_combines_lists_and_ranges():
+	request = WeightBalanceBatchRequest(
+		mode='grid',
+		front_pilot_weight={'start': 60, 'stop': 70, 'step': 5},
+		wing_water_ballast_weight=[0, 50],
+	)
+
+	loads = expand_loads(request, 100)
+
+	assert loads['front_pilot_weight'].tolist() == [60.0, 60.0, 65.0, 65.0, 70.0, 70.0]
+	assert loads['wing_water_ballast_weight'].tolist() == [0.0, 50.0, 0.0, 50.0, 0.0, 50.0]
+
+
+def test_grid_mode_enforces_maximum_combinations():
+	request = WeightBalanceBatchRequest(mode='grid', front_pilot_weight=[60, 70], rear_pilot_weight=[0, 80])
+
+	with pytest.raises(ValueError, match='4 combinations'):
+		expand_loads(request, 3)
+
+
+def test_minimum_ballast_matches_minimum_pilot_weight(glider):
+	assert glider.pilot_av_mini() == 62.4
+	assert minimum_ballast(glider, _loading(55)) == 7.5
+	assert minimum_ballast(glider, _loading(80)) == 0.0
+
+
+def test_minimum_ballast_uses_front_ballast_arm(glider):
+	glider.arms.arm_front_ballast = 1500.0
+
+	assert minimum_ballast(glider, _loading(55)) == 4.0
+
+
+def test_fleet_calculation_reports_errors_per_glider(glider):
+	unweighed = Glider(
+		model='Janus C', registration='F-CJDT', brand='Schempp-Hirth', serial_number=None, single_seat=False,
+		datum=1, pilot_position=1, datum_label='', wedge='', wedge_position='', limits=glider.limits, arms=glider.arms,
+	)
+
+	results = list(calculate_fleet([glider, unweighed], _loading(55)))
+
+	assert results[0].total_weight == 339.8
+	assert results[0].in_envelope is False
+	assert results[0].min_ballast == 7.5
+	assert results[1].error == 'No weighing for this glider'
+	assert results[1].total_weight is None
+
+
+def test_optimize_ballast_returns_feasible_ranges(glider):
+	glider.arms.arm_front_ballast = 1500.0
+	glider.arms.arm_rear_watterballast_or_ballast = 4000.0
+
+	light = optimize_ballast(glider, front_pilot_weight=55, rear_pilot_weight=0)
+	assert light.front_ballast.min == 4.0
+	assert light.front_ballast.max > light.front_ballast.min
+	assert light.rear_ballast.available and light.rear_ballast.min is None
+	assert not light.wing_water_ballast.available
+
+	heavy = optimize_ballast(glider, front_pilot_weight=100, rear_pilot_weight=0)
+	assert heavy.front_ballast.min == 0.0
+	assert heavy.rear_ballast.min == 0.0
+
+	for ballast, feasible in ((light.front_ballast.max, True), (light.front_ballast.max + 0.5, False)):
+		weight, cg = glider.weight_and_balance_calculator(55, 0, ballast, 0, 0)
+		assert (250 <= cg <= 400 and weight <= 525) is feasible
+
+
+def test_ballast_search_resolution_is_bounded(glider, monkeypatch):
+	with pytest.raises(ValidationError):
+		BallastOptimizationRequest(front_pilot_weight=55, step=1e-9)
+
+	glider.arms.arm_front_ballast = 1500.0
+	monkeypatch.setattr(weight_balance, 'BALLAST_MAX_CANDIDATES', 100)
+	with pytest.raises(ValueError, match='maximum is 100'):
+		optimize_ballast(glider, front_pilot_weight=55, rear_pilot_weight=0, step=0.01)
+
+
+@pytest.mark.parametrize('mode, loads, message', [
+	('zip', {'front_pilot_weight': {'start': 0, 'stop': 1e6, 'step': 1e-6}}, 'Batch has 1000000000001 loadings'),
+	('grid', {'front_pilot_weight': {'start': 0, 'stop': 1e3, 'step': 1e-300}}, r'Grid has 1e\+303 combinations'),
+	('grid', {'front_pilot_weight': [60.0] * 200, 'rear_pilot_weight': {'start': 0, 'stop': 100, 'step': 1}}, 'Grid has 20200 combinations'),
+])
+def test_oversized_loads_are_rejected_before_allocation(mode, loads, message):
+	request = WeightBalanceBatchRequest(mode=mode, **loads)
+
+	with pytest.raises(ValueError, match=message):
+		expand_loads(request, 10000)
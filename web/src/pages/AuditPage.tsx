@@ -60,6 +60,9 @@ export function AuditPage() {
 
   const items = useMemo(() => logsQuery.data?.items ?? [], [logsQuery.data])
   const total = logsQuery.data?.total ?? items.length
+  // An estimated total only bounds the count: show it as approximate and never treat it as empty
+  const totalExact = logsQuery.data?.total_exact ?? true
+  const isEmpty = totalExact ? total === 0 : items.length === 0
   const sortedItems = useMemo(
     () => sortAuditItems(items, sortKey, sortDirection),
     [items, sortKey, sortDirection],
@@ -94,14 +97,14 @@ export function AuditPage() {
         <div className="flex items-center gap-3">
           <ClipboardList size={22} className="text-primary" strokeWidth={1.8} />
           <h1 className="text-3xl font-bold text-foreground">Audit Log</h1>
-          {total > 0 && <Badge variant="secondary">{total}</Badge>}
+          {total > 0 && <Badge variant="secondary">{totalExact ? total : `~${total}`}</Badge>}
         </div>
         <Button
           variant="destructive"
           size="sm"
           className="gap-1.5"
           onClick={() => clearMutation.mutate()}
-          disabled={clearMutation.isPending || total === 0}
+          disabled={clearMutation.isPending || isEmpty}
         >
           <Trash2 data-icon="inline-start" />
           {clearMutation.isPending ? 'Suppression…' : 'Effacer'}
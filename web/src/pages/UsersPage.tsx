@@ -57,6 +57,22 @@ const ROLE_CLASSNAME: Record<User['role'],string> = {
 
 const ROLE_OPTIONS: User['role'][] = ['viewer', 'editor', 'administrator']
 
+const DATABASE_JOB_POLL_INTERVAL_MS = 1000
+
+// The import only queues a job: poll it so that success is reported once the data is in place
+async function waitForDatabaseJob(jobId: string) {
+  for (;;) {
+    const job = await backend.getDatabaseJob(jobId)
+    if (job.status === 'succeeded') {
+      return job
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error ?? "L'import de la base de donnée a échoué.")
+    }
+    await new Promise((resolve) => setTimeout(resolve, DATABASE_JOB_POLL_INTERVAL_MS))
+  }
+}
+
 function isChecked(value: boolean | 'indeterminate') {
   return value === true
 }
@@ -185,7 +201,10 @@ export function UsersPage() {
   })
 
   const importMutation = useMutation({
-    mutationFn: (file: File) => backend.importDatabase(file),
+    mutationFn: async (file: File) => {
+      const { job_id: jobId } = await backend.importDatabase(file)
+      return waitForDatabaseJob(jobId)
+    },
     onSuccess: async () => {
       await invalidateUsersQuery(queryClient)
       toast.success('Base de donnée importée avec succès.')